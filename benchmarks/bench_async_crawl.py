@@ -0,0 +1,71 @@
+# Benchmark: sequential vs concurrent (thread pool) A* crawling against a local test server
+#
+# The server serves a synthetic site of SITE_PAGES pages, each linking to
+# LINKS_PER_PAGE others, and sleeps PAGE_LATENCY_SECONDS per request to stand in
+# for network latency. The target phrase never appears, so every run visits
+# exactly PAGES_TO_VISIT pages and pages/sec is directly comparable. Pages are
+# cached in a temporary response cache, not the repo's .http_cache/.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_async_crawl.py
+
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+sys.path.append(str(REPO_ROOT / "phase1"))
+
+from AStar.AStarCrawler import a_star_web_crawl
+from benchmarks.local_site import PageHandler, local_site, page_number, temporary_cache
+from common.http_client import HttpClient
+
+SITE_PAGES = 500
+LINKS_PER_PAGE = 8
+PAGE_LATENCY_SECONDS = 0.05
+PAGES_TO_VISIT = 60
+CONCURRENCY_LEVELS = (1, 4, 8, 16)
+
+
+def page_html(page_number):
+    links = "\n".join(
+        f'<p>faculty research page {child} <a href="/page/{child}">people {child}</a></p>'
+        for child in ((page_number * LINKS_PER_PAGE + k + 1) % SITE_PAGES for k in range(LINKS_PER_PAGE))
+    )
+    return f"<html><body><h1>Page {page_number}</h1>{links}</body></html>"
+
+
+class SiteHandler(PageHandler):
+    latency_seconds = PAGE_LATENCY_SECONDS
+
+    def page(self, path):
+        return page_html(page_number(path) % SITE_PAGES)
+
+
+def run():
+    print(f"=== A* crawl throughput ({PAGES_TO_VISIT} pages, {PAGE_LATENCY_SECONDS * 1000:.0f} ms/page server latency) ===")
+    print(f"{'max_concurrency':>16} {'seconds':>9} {'pages/sec':>10}")
+    with local_site(SiteHandler, "/page/0") as seed_url, temporary_cache() as cache:
+        for max_concurrency in CONCURRENCY_LEVELS:
+            http_client = HttpClient(pool_maxsize=max_concurrency, cache=cache)
+            stime = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                a_star_web_crawl(
+                    seed_url,
+                    "phrase that is not on the site",
+                    "faculty research people",
+                    maximum_pages_to_visit=PAGES_TO_VISIT,
+                    max_concurrency=max_concurrency,
+                    per_host_concurrency=max_concurrency,
+                    http_client=http_client,
+                )
+            elapsed = time.perf_counter() - stime
+            http_client.close()
+            print(f"{max_concurrency:>16} {elapsed:>9.2f} {PAGES_TO_VISIT / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    run()
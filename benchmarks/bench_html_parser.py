@@ -0,0 +1,121 @@
+# Benchmark: HTML parser backends (common/html_parser.py) on saved pages
+#
+# Times parse + full text + link extraction (href, anchor text, <p>/block
+# context) per backend and checks that every backend returns the same text
+# and links as the BeautifulSoup reference.
+#
+# Pages come from a directory of saved *.html files when one is given,
+# otherwise a synthetic university-site corpus (nav, sections, paragraphs
+# with links, scripts, comments, Arabic text) is generated. Its paragraphs
+# and anchors also carry comments, inline <script> and <style> between words,
+# whose surrounding text must stay separate strings in every backend.
+#
+# A second table runs the malformed fixtures below (unclosed <p>, blocks and
+# lists inside <p>), where lxml repairs the tree differently from bs4 and some
+# links get another paragraph / context: the divergence documented next to
+# default_backend() in common/html_parser.py.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_html_parser.py [DIRECTORY_OF_SAVED_HTML]
+
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from common.html_parser import available_backends, parse_html
+
+SYNTHETIC_PAGES = 40
+WORDS = ("faculty research students computer science department course admission "
+         "artificial intelligence machine learning office hours seminar لقسم علوم الحاسوب كلية").split()
+
+
+# Malformed markup on which the backends are known to disagree
+MALFORMED_PAGES = (
+    ("unclosed <p>", '<p>one <a href="/a">A</a><p>two <a href="/b">B</a></p>'),
+    ("<div> inside <p>", '<p>intro <div>block <a href="/a">A</a></div> after</p>'),
+    ("<ul> inside <p>", '<p>list <ul><li><a href="/a">A</a></li></ul></p>'),
+    ("<p> before <div>", '<div><p>text <a href="/a">A</a><div>next block</div></div>'),
+)
+
+
+def synthetic_page(rng, page_number):
+    def words(k):
+        return " ".join(rng.choices(WORDS, k=k))
+
+    def inline(k):
+        # words, with a comment / inline script / inline style between two of them (no space around it)
+        head, tail = words(k), words(k)
+        return rng.choice((
+            f"{head} {tail}",
+            f"{head}<!-- {words(2)} -->{tail}",
+            f'{head}<script>track("{words(1)}")</script>{tail}',
+            f"{head}<style>.{words(1)} {{ display: none }}</style>{tail}",
+        ))
+
+    nav = "".join(f'<li><a href="/nav/{i}">{words(2)}</a></li>' for i in range(25))
+    sections = []
+    for s in range(rng.randint(5, 15)):
+        paragraphs = "".join(
+            f'<p>{inline(7)} <a href="/p/{page_number}/{s}/{p}">{inline(1)}</a> {inline(5)} &amp; more</p>'
+            for p in range(rng.randint(3, 10))
+        )
+        cards = "".join(f'<div class="card"><a href="/card/{s}/{c}"><span>{words(2)}</span></a> {words(6)}</div>'
+                        for c in range(rng.randint(0, 6)))
+        sections.append(f"<section><h2>{words(3)}</h2>{paragraphs}{cards}<!-- {words(4)} --></section>")
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{words(4)}</title>'
+            f'<script>var tracking = "{words(5)}";</script><style>.card {{ color: red }}</style></head>'
+            f'<body><nav><ul>{nav}</ul></nav><main><article>{"".join(sections)}</article></main>'
+            f'<footer><div>{words(20)} <a href="mailto:info@example.org">contact</a></div></footer></body></html>')
+
+
+def load_pages(directory=None):
+    if directory:
+        return [path.read_text(encoding="utf-8", errors="replace") for path in sorted(Path(directory).glob("*.html"))]
+    rng = random.Random(0)
+    return [synthetic_page(rng, i) for i in range(SYNTHETIC_PAGES)]
+
+
+def extract(html, backend):
+    page = parse_html(html, backend)
+    text = page.get_text(separator=" ", strip=True)
+    raw_text = page.get_text()
+    links = [(link.href, link.anchor_text, link.paragraph_text, link.context_text) for link in page.links()]
+    return text, raw_text, links
+
+
+def run(directory=None):
+    pages = load_pages(directory)
+    total_kb = sum(len(html.encode("utf-8")) for html in pages) / 1024
+    reference = [extract(html, "bs4") for html in pages]
+
+    print(f"=== HTML parser backends ({len(pages)} pages, {total_kb:.0f} KiB) ===")
+    print(f"{'backend':>8} {'ms/page':>9} {'speedup':>8} {'text diffs':>11} {'link diffs':>11}")
+    bs4_seconds = None
+    for backend in available_backends()[::-1]:  # bs4 first, as the baseline
+        stime = time.perf_counter()
+        results = [extract(html, backend) for html in pages]
+        seconds = time.perf_counter() - stime
+        bs4_seconds = bs4_seconds or seconds
+        text_diffs = sum(r[0] != ref[0] or r[1] != ref[1] for r, ref in zip(results, reference))
+        link_diffs = sum(r[2] != ref[2] for r, ref in zip(results, reference))
+        print(f"{backend:>8} {1000 * seconds / len(pages):>9.2f} {bs4_seconds / seconds:>7.1f}x "
+              f"{text_diffs:>11} {link_diffs:>11}")
+
+    print("\n=== Malformed fixtures: link paragraph / context per backend ===")
+    for name, html in MALFORMED_PAGES:
+        reference_links = extract(html, "bs4")[2]
+        print(name)
+        for backend in available_backends()[::-1]:
+            links = extract(html, backend)[2]
+            same = "reference" if backend == "bs4" else "same" if links == reference_links else "DIFFERS"
+            described = "; ".join(f"{href}: paragraph={paragraph!r} context={context!r}"
+                                  for href, _, paragraph, context in links)
+            print(f"  {backend:>6} {same:>9}  {described}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else None)
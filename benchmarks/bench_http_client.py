@@ -0,0 +1,101 @@
+# Benchmark: module-level requests.get per page vs the shared pooled HttpClient
+#
+# Serves a local keep-alive site over HTTPS (throwaway self-signed certificate
+# made with the `openssl` command line tool; falls back to plain HTTP if it is
+# not installed) and fetches NUMBER_OF_PAGES pages both ways. Reports wall-clock
+# time, connections accepted by the server, and the client's TLS/TTFB stats.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_http_client.py
+
+import contextlib
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+import urllib3
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from benchmarks.local_site import PageHandler, serve
+from common.http_client import HttpClient
+
+NUMBER_OF_PAGES = 200
+PAGE_BYTES = 20_000
+
+
+class SiteHandler(PageHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    wbufsize = 1 << 16             # send headers + body in one write (no Nagle/delayed-ACK stall)
+    disable_nagle_algorithm = True
+    body = b"<html><body>" + b"x" * PAGE_BYTES + b"</body></html>"
+
+    def page(self, path):
+        return self.body
+
+
+class CountingServer(ThreadingHTTPServer):
+    connections_accepted = 0
+
+    def get_request(self):
+        request = super().get_request()
+        self.connections_accepted += 1
+        return request
+
+
+def self_signed_context(directory):
+    if shutil.which("openssl") is None:
+        return None
+    cert, key = Path(directory) / "cert.pem", Path(directory) / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", str(key),
+         "-out", str(cert), "-days", "1", "-subj", "/CN=127.0.0.1"],
+        check=True, capture_output=True,
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+@contextlib.contextmanager
+def local_site():
+    with tempfile.TemporaryDirectory() as directory:
+        with serve(SiteHandler, CountingServer, self_signed_context(directory)) as site:
+            yield site
+
+
+def run():
+    warnings.simplefilter("ignore", urllib3.exceptions.InsecureRequestWarning)
+    print(f"=== HTTP fetch layer ({NUMBER_OF_PAGES} pages of {PAGE_BYTES // 1000} KB) ===")
+    print(f"{'mode':>18} {'seconds':>9} {'connections':>12} {'tls handshakes':>15} {'mean ttfb ms':>13}")
+
+    with local_site() as (server, base_url):
+        stime = time.perf_counter()
+        for i in range(NUMBER_OF_PAGES):
+            requests.get(f"{base_url}/page/{i}", timeout=5, verify=False)
+        elapsed = time.perf_counter() - stime
+        handshakes = server.connections_accepted if base_url.startswith("https") else 0
+        print(f"{'requests.get':>18} {elapsed:>9.2f} {server.connections_accepted:>12} {handshakes:>15} {'-':>13}")
+
+    with local_site() as (server, base_url):
+        ttfb = []
+        client = HttpClient(scheduler=None, on_stats=lambda stats: ttfb.append(stats.ttfb_seconds))
+        stime = time.perf_counter()
+        for i in range(NUMBER_OF_PAGES):
+            client.get(f"{base_url}/page/{i}", timeout=5, verify=False)
+        elapsed = time.perf_counter() - stime
+        print(f"{'HttpClient':>18} {elapsed:>9.2f} {server.connections_accepted:>12} "
+              f"{client.totals['tls_handshakes']:>15} {1000 * sum(ttfb) / len(ttfb):>13.2f}")
+        client.close()
+
+
+if __name__ == "__main__":
+    run()
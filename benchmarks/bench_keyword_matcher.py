@@ -0,0 +1,64 @@
+# Benchmark: per-keyword str.count vs KeywordMatcher (common/keyword_matcher.py)
+#
+# Counts K keywords (topic words, Arabic and Latin, padded with generated
+# words) in texts the size of an anchor, a paragraph and a page body, with:
+#   - sum(text.count(word) for word in keywords)   -- one scan per keyword
+#   - KeywordMatcher token scan                    -- one split per text
+#   - KeywordMatcher default                       -- str.count below
+#                                   TOKEN_SCAN_MIN_KEYWORDS / TOKEN_SCAN_MIN_CHARS
+# The matcher is built once and reused across texts, as in a crawl. Checks the
+# totals are identical.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_keyword_matcher.py
+
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from common.keyword_matcher import KeywordMatcher
+
+TEXT_SIZES = (30, 300, 3_000, 100_000)  # characters
+KEYWORD_COUNTS = (4, 16, 64, 256)
+TEXTS_PER_SIZE = 20
+WORDS = ("faculty research students computer science department course admission staff office "
+         "artificial intelligence machine learning seminar alumni كلية علوم الحاسوب قسم").split()
+
+
+def make_texts(rng, vocabulary, size):
+    return [" ".join(rng.choices(vocabulary, k=size // 7 + 1))[:size].lower() for _ in range(TEXTS_PER_SIZE)]
+
+
+def timed(function, texts):
+    function(texts[0])  # warm-up (builds the token memo, as earlier pages would)
+    stime = time.perf_counter()
+    totals = [function(text) for text in texts]
+    return (time.perf_counter() - stime) / len(texts), totals
+
+
+def run():
+    rng = random.Random(0)
+    generated = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(4, 9))) for _ in range(300)]
+    vocabulary = WORDS + generated[:200]
+    print("=== Keyword counting (microseconds per text) ===")
+    print(f"{'chars':>7} {'keywords':>9} {'str.count':>10} {'token scan':>11} {'default':>8} {'same':>5}")
+    for size in TEXT_SIZES:
+        texts = make_texts(rng, vocabulary, size)
+        for keyword_count in KEYWORD_COUNTS:
+            keywords = (WORDS + generated)[:keyword_count]
+            token_matcher = KeywordMatcher(keywords, token_scan=True)
+            default_matcher = KeywordMatcher(keywords)
+            count_seconds, expected = timed(lambda text: sum(text.count(word) for word in keywords), texts)
+            token_seconds, token_totals = timed(token_matcher.total, texts)
+            default_seconds, default_totals = timed(default_matcher.total, texts)
+            same = token_totals == expected and default_totals == expected
+            print(f"{size:>7} {keyword_count:>9} {count_seconds * 1e6:>10.1f} {token_seconds * 1e6:>11.1f} "
+                  f"{default_seconds * 1e6:>8.1f} {str(same):>5}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,71 @@
+# Benchmark: per-page extraction cost, soup traversals vs the single-pass PageRecord
+#
+# Replays what the A* crawlers do with each fetched page:
+#   - page_contains_phrase / calculate_relevance_value: get_text(" ", strip=True)
+#   - find_tgt: get_text()
+#   - per link: anchor text + enclosing <p> (else section/article/div) text
+# The soup path walks the tree once per get_text call and once more per link
+# (find_parent + get_text on the block); parse_html walks it once into a
+# PageRecord and every read after that is a lookup. Also checks both give the
+# same texts and link contexts.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_page_record.py [DIRECTORY_OF_SAVED_HTML]
+
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+sys.path.append(str(REPO_ROOT / "benchmarks"))
+
+from bench_html_parser import load_pages
+from common.html_parser import CONTEXT_BLOCK_TAGS, WHOLE_BLOCK, available_backends, parse_html
+
+
+def soup_path(html):
+    soup = BeautifulSoup(html, "html.parser")
+    goal_text = soup.get_text(separator=" ", strip=True)
+    raw_text = soup.get_text()
+    relevance_text = soup.get_text(separator=" ", strip=True).lower()
+    links = []
+    for tag in soup.find_all("a", href=True):
+        block = tag.find_parent("p") or tag.find_parent(list(CONTEXT_BLOCK_TAGS))
+        context = block.get_text(separator=" ", strip=True) if block else ""
+        links.append((tag["href"], tag.get_text(separator=" ", strip=True), context))
+    return goal_text, raw_text, relevance_text, links
+
+
+def record_path(html, backend):
+    page = parse_html(html, backend, WHOLE_BLOCK)
+    goal_text = page.get_text(separator=" ", strip=True)
+    raw_text = page.get_text()
+    relevance_text = page.get_text(separator=" ", strip=True).lower()
+    links = [(link.href, link.anchor_text, link.context_text) for link in page.links()]
+    return goal_text, raw_text, relevance_text, links
+
+
+def timed(function, pages):
+    stime = time.perf_counter()
+    results = [function(html) for html in pages]
+    return time.perf_counter() - stime, results
+
+
+def run(directory=None):
+    pages = load_pages(directory)
+    print(f"=== Per-page extraction ({len(pages)} pages) ===")
+    print(f"{'path':>18} {'ms/page':>9} {'speedup':>8} {'diffs':>6}")
+    soup_seconds, reference = timed(soup_path, pages)
+    print(f"{'soup traversals':>18} {1000 * soup_seconds / len(pages):>9.2f} {1.0:>7.1f}x {0:>6}")
+    for backend in available_backends()[::-1]:
+        seconds, results = timed(lambda html: record_path(html, backend), pages)
+        diffs = sum(r != ref for r, ref in zip(results, reference))
+        print(f"{'record (' + backend + ')':>18} {1000 * seconds / len(pages):>9.2f} "
+              f"{soup_seconds / seconds:>7.1f}x {diffs:>6}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,86 @@
+# Benchmark: fixed sleep-before-every-fetch vs the per-host politeness scheduler
+#
+# Starts NUMBER_OF_HOSTS local servers (one "host" per port) and fetches
+# PAGES_PER_HOST pages from each, interleaved: first the old way (one fetch at
+# a time, fixed sleep before each), then concurrently through the scheduler.
+# Reports wall-clock time and the smallest gap any server saw between two of
+# its requests; with the scheduler it should stay at DELAY_SECONDS, give or
+# take a few ms of arrival jitter.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_politeness.py
+
+import contextlib
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from benchmarks.local_site import PageHandler, serve
+from common.async_fetch import ConcurrentFetcher
+from common.http_client import HttpClient
+from common.politeness import PolitenessScheduler
+
+NUMBER_OF_HOSTS = 4
+PAGES_PER_HOST = 8
+DELAY_SECONDS = 0.25
+
+
+def make_handler(request_times):
+    class Handler(PageHandler):
+        def page(self, path):
+            request_times.append(time.monotonic())
+            return b"<html><body>ok</body></html>"
+
+    return Handler
+
+
+@contextlib.contextmanager
+def local_hosts(request_log):
+    with contextlib.ExitStack() as stack:
+        hosts = []
+        for _ in range(NUMBER_OF_HOSTS):
+            request_times = []
+            _, base_url = stack.enter_context(serve(make_handler(request_times)))
+            hosts.append(base_url)
+            request_log.append(request_times)
+        yield hosts
+
+
+def min_gap(request_log):
+    return min(min(b - a for a, b in zip(times, times[1:])) for times in map(sorted, request_log))
+
+
+def run():
+    unscheduled = HttpClient(scheduler=None)
+    scheduled = HttpClient(pool_maxsize=2, scheduler=PolitenessScheduler(), min_delay=DELAY_SECONDS)
+
+    print(f"=== Politeness ({NUMBER_OF_HOSTS} hosts x {PAGES_PER_HOST} pages, {DELAY_SECONDS} s per-host delay) ===")
+    print(f"{'mode':>20} {'seconds':>9} {'min gap/host (s)':>17}")
+
+    # Old crawler loop: one fetch at a time, fixed sleep before each
+    request_log = []
+    with local_hosts(request_log) as hosts:
+        urls = [f"{host}/page/{i}" for i in range(PAGES_PER_HOST) for host in hosts]
+        stime = time.perf_counter()
+        for url in urls:
+            time.sleep(DELAY_SECONDS)
+            unscheduled.get(url, timeout=5)
+        elapsed = time.perf_counter() - stime
+    print(f"{'fixed sleep':>20} {elapsed:>9.2f} {min_gap(request_log):>17.3f}")
+
+    # Scheduler: hosts are fetched concurrently, each one still rate limited
+    request_log = []
+    with local_hosts(request_log) as hosts:
+        urls = [f"{host}/page/{i}" for i in range(PAGES_PER_HOST) for host in hosts]
+        stime = time.perf_counter()
+        with ConcurrentFetcher(scheduled.get, max_concurrency=NUMBER_OF_HOSTS * 2, per_host_concurrency=2) as fetcher:
+            fetcher.fetch_batch(urls)
+        elapsed = time.perf_counter() - stime
+    print(f"{'per-host scheduler':>20} {elapsed:>9.2f} {min_gap(request_log):>17.3f}")
+
+
+if __name__ == "__main__":
+    run()
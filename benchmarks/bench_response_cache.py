@@ -0,0 +1,91 @@
+# Benchmark: repeated crawls of an unchanged site with the on-disk response cache
+#
+# Serves NUMBER_OF_PAGES pages with ETag / Last-Modified (answering 304 to
+# conditional requests) and fetches them all four times through HttpClient:
+# a cold run, a revalidating run (max_age=None), a run inside max_age and an
+# offline run. Reports wall-clock time, body bytes received and requests that
+# reached the server.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_response_cache.py
+
+import hashlib
+import sys
+import tempfile
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from benchmarks.local_site import local_site
+from common.http_client import HttpClient
+from common.response_cache import ResponseCache
+
+NUMBER_OF_PAGES = 200
+PAGE_BYTES = 30_000
+LAST_MODIFIED = formatdate(time.time() - 3600, usegmt=True)
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = 1 << 16
+    disable_nagle_algorithm = True
+    requests_served = 0
+
+    def do_GET(self):
+        SiteHandler.requests_served += 1
+        body = f"<html><body><p>{self.path}</p>{'lorem ipsum ' * (PAGE_BYTES // 12)}</body></html>".encode()
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def crawl(base_url, cache, offline=False):
+    client = HttpClient(scheduler=None, cache=cache, offline=offline)
+    SiteHandler.requests_served = 0
+    stime = time.perf_counter()
+    pages = [client.get(f"{base_url}/page/{i}").text for i in range(NUMBER_OF_PAGES)]
+    elapsed = time.perf_counter() - stime
+    client.close()
+    return pages, elapsed, client.totals["bytes"], SiteHandler.requests_served
+
+
+def run():
+    print(f"=== Response cache ({NUMBER_OF_PAGES} pages of {PAGE_BYTES // 1000} KB, unchanged site) ===")
+    print(f"{'run':>22} {'seconds':>9} {'body bytes':>11} {'server hits':>12}")
+    with tempfile.TemporaryDirectory() as directory, local_site(SiteHandler) as base_url:
+        cache_path = Path(directory) / "responses.sqlite"
+        runs = (
+            ("cold", ResponseCache(cache_path), False),
+            ("revalidate (304)", ResponseCache(cache_path), False),
+            ("within max_age", ResponseCache(cache_path, max_age=3600), False),
+            ("offline", ResponseCache(cache_path), True),
+        )
+        reference = None
+        for name, cache, offline in runs:
+            pages, elapsed, body_bytes, served = crawl(base_url, cache, offline)
+            reference = reference or pages
+            assert pages == reference, f"{name}: cached pages differ from the cold run"
+            print(f"{name:>22} {elapsed:>9.2f} {body_bytes:>11} {served:>12}")
+            cache.close()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,84 @@
+# Benchmark: full downloads vs streaming fetch with content-type gating and a byte cap
+#
+# The local site mixes small HTML pages with extension-less URLs that serve a
+# large PDF, a video and one huge generated HTML page (the goal phrase is near
+# its top). Every URL is fetched once without limits and once with
+# html_only=True, max_bytes=MAX_PAGE_BYTES. Reports bytes received, time,
+# aborted/truncated counts and whether the goal phrase was still found.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_streaming_fetch.py
+
+import sys
+import time
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from benchmarks.local_site import local_site
+from common.http_client import HttpClient, NotHtmlResponse
+
+MAX_PAGE_BYTES = 1_000_000
+GOAL_PHRASE = "Abeer Alsafran"
+SMALL_PAGES = 30
+
+BODIES = {
+    "/download/report": ("application/pdf", b"%PDF-1.7\n" + b"\0" * 8_000_000),
+    "/media/lecture": ("video/mp4", b"\0" * 20_000_000),
+    "/people/all": ("text/html; charset=utf-8",
+                    f"<html><body><p>{GOAL_PHRASE}</p>".encode() + b"<p>row</p>" * 1_500_000 + b"</body></html>"),
+}
+for i in range(SMALL_PAGES):
+    BODIES[f"/page/{i}"] = ("text/html; charset=utf-8", f"<html><body>page {i}</body></html>".encode())
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = 1 << 16
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        content_type, body = BODIES[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client stopped reading
+
+    def log_message(self, *args):
+        pass
+
+
+def crawl(base_url, **limits):
+    client = HttpClient(scheduler=None)
+    goal_found = False
+    stime = time.perf_counter()
+    for path in BODIES:
+        try:
+            response = client.get(base_url + path, **limits)
+        except NotHtmlResponse:
+            continue
+        goal_found |= GOAL_PHRASE in response.text
+    elapsed = time.perf_counter() - stime
+    client.close()
+    return elapsed, client.totals, goal_found
+
+
+def run():
+    print(f"=== Streaming fetch ({len(BODIES)} URLs: {SMALL_PAGES} small pages, PDF, video, huge HTML) ===")
+    print(f"{'mode':>24} {'seconds':>9} {'MB received':>12} {'aborted':>8} {'truncated':>10} {'goal found':>11}")
+    with local_site(SiteHandler) as base_url:
+        for name, limits in (("full download", {}),
+                             ("html_only + 1 MB cap", {"html_only": True, "max_bytes": MAX_PAGE_BYTES})):
+            elapsed, totals, goal_found = crawl(base_url, **limits)
+            print(f"{name:>24} {elapsed:>9.2f} {totals['bytes'] / 1e6:>12.1f} {totals['aborted']:>8} "
+                  f"{totals['truncated']:>10} {str(goal_found):>11}")
+
+
+if __name__ == "__main__":
+    run()
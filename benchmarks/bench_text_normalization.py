@@ -0,0 +1,101 @@
+# Benchmark: goal-phrase normalization on large Arabic and English pages
+#
+# Times page_contains_phrase's folding of the page text and target with:
+#   - the old code: character-by-character Arabic scan, NFKC, diacritics regex,
+#     seven chained str.replace calls and a whitespace regex, target folded on
+#     every check
+#   - common/text_normalization.py: precompiled Arabic and diacritics patterns,
+#     letter unification only for letters present, ASCII fast path; target
+#     folded once (TargetPhrase) and the page's folded text cached on the
+#     PageRecord, so repeated checks are lookups
+# and checks both give the same answer.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_text_normalization.py
+
+import random
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+from common.html_parser import parse_html
+from common.text_normalization import TargetPhrase, contains_arabic, fold_arabic, fold_plain
+
+PAGE_SIZES_KB = (100, 1000)
+REPEATS = 5
+ENGLISH_WORDS = "faculty research students computer science department course admission office hours".split()
+ARABIC_WORDS = "كلية العلوم قسم علوم الحاسوب أعضاء هيئة التدريس إعلان الطلبة مُحاضرة آخر".split()
+PAGES = {
+    "English": (ENGLISH_WORDS, "Abeer Alsafran"),
+    "Arabic": (ARABIC_WORDS, "عبير الصفران"),
+}
+
+
+def make_page(rng, words, size_kb):
+    paragraph_count = size_kb * 1024 // 120
+    paragraphs = "".join(f"<p>{' '.join(rng.choices(words, k=12))}\n</p>" for _ in range(paragraph_count))
+    return f"<html><body>{paragraphs}</body></html>"
+
+
+def old_normalize_arabic_text(text):
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text)
+    text = re.sub(r"[\u0617-\u061A\u064B-\u0652]", "", text)
+    text = (text
+            .replace("أ", "ا").replace("إ", "ا").replace("آ", "ا")
+            .replace("ى", "ي").replace("ؤ", "و").replace("ئ", "ي").replace("ة", "ه"))
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def old_contains_arabic(text):
+    return any('\u0600' <= ch <= '\u06FF' for ch in text or "")
+
+
+def old_check(page, target_phrase):
+    page_text_raw = page.get_text(separator=" ", strip=True)
+    if old_contains_arabic(target_phrase) or old_contains_arabic(page_text_raw):
+        return old_normalize_arabic_text(target_phrase.lower()) in old_normalize_arabic_text(page_text_raw.lower())
+    return re.sub(r"\s+", " ", target_phrase).strip().lower() in re.sub(r"\s+", " ", page_text_raw).strip().lower()
+
+
+def new_check(page, goal_phrase):
+    if goal_phrase.has_arabic or page.derived(contains_arabic):
+        return goal_phrase.arabic_form in page.derived(fold_arabic)
+    return goal_phrase.plain_form in page.derived(fold_plain)
+
+
+def best_time(function):
+    best = float("inf")
+    for _ in range(REPEATS):
+        stime = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - stime)
+    return best, result
+
+
+def run():
+    rng = random.Random(0)
+    print("=== Goal-phrase normalization (ms per check) ===")
+    print(f"{'page':>8} {'KB':>5} {'old':>8} {'new first':>10} {'new repeat':>11} {'same':>5}")
+    for name, (words, target_phrase) in PAGES.items():
+        for size_kb in PAGE_SIZES_KB:
+            page = parse_html(make_page(rng, words, size_kb))
+            page.get_text(separator=" ", strip=True)  # both paths start from the page text
+            old_seconds, old_result = best_time(lambda: old_check(page, target_phrase))
+            first_seconds, new_result = best_time(
+                lambda: (page._derived.clear(), new_check(page, TargetPhrase(target_phrase)))[1]
+            )
+            goal_phrase = TargetPhrase(target_phrase)
+            repeat_seconds, _ = best_time(lambda: new_check(page, goal_phrase))
+            print(f"{name:>8} {size_kb:>5} {old_seconds * 1000:>8.2f} {first_seconds * 1000:>10.2f} "
+                  f"{repeat_seconds * 1000:>11.4f} {str(old_result == new_result):>5}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,109 @@
+# Local test sites for the benchmarks
+#
+# The crawl benchmarks fetch synthetic sites served from 127.0.0.1 by a
+# ThreadingHTTPServer on a free port, in a daemon thread. Pages fetched from
+# them are cached in a temporary_cache(), never in the repo's .http_cache/.
+#
+# Usage (from a benchmark, with the repo root on sys.path):
+#   from benchmarks.local_site import PageHandler, local_site, temporary_cache
+
+import contextlib
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from common.response_cache import ResponseCache
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """
+    Serves page(path) as HTML: bytes or str, None for a 404. /robots.txt is a
+    404 and every page is answered after `latency_seconds`, the stand-in for
+    network latency. Subclasses override page().
+    """
+
+    latency_seconds = 0.0
+    content_type = "text/html; charset=utf-8"
+
+    def page(self, path):
+        raise NotImplementedError
+
+    def do_GET(self):
+        if self.path == "/robots.txt":
+            self.send_error_page()
+            return
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        body = self.page(self.path)
+        if body is None:
+            self.send_error_page()
+            return
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", self.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_page(self):
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def page_number(path):
+    """The number a page path ends in (/page/12, /page/12/), 0 if none."""
+    try:
+        return int(path.rstrip("/").rsplit("/", 1)[-1] or 0)
+    except ValueError:
+        return 0
+
+
+@contextlib.contextmanager
+def serve(handler, server_class=ThreadingHTTPServer, ssl_context=None):
+    """Serve `handler` on a free 127.0.0.1 port; yields (server, base URL without a trailing slash)."""
+    server = server_class(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    if ssl_context is not None:
+        server.socket = ssl_context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    scheme = "http" if ssl_context is None else "https"
+    try:
+        yield server, f"{scheme}://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextlib.contextmanager
+def local_site(handler, path=""):
+    """Serve `handler`; yields the URL of `path` on it (e.g. the seed page)."""
+    with serve(handler) as (_, base_url):
+        yield base_url + path
+
+
+@contextlib.contextmanager
+def temporary_cache(**options):
+    """A ResponseCache in a temporary directory, removed afterwards."""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResponseCache(Path(directory) / "responses.sqlite", **options)
+        try:
+            yield cache
+        finally:
+            cache.close()
+
+
+@contextlib.contextmanager
+def client_cache(client, cache):
+    """Point an HttpClient made elsewhere (e.g. a crawler module's own) at `cache` for the duration."""
+    previous, client.cache = client.cache, cache
+    try:
+        yield client
+    finally:
+        client.cache = previous
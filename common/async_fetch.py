@@ -0,0 +1,64 @@
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+
+# -----------------------------
+# Concurrent fetch engine
+# -----------------------------
+class ConcurrentFetcher:
+    """
+    Fetches a batch of URLs concurrently on a thread pool kept for the
+    fetcher's lifetime.
+
+    `fetch` is a blocking callable (url -> result), so it can keep using the
+    pooled HttpClient (common/http_client.py); the I/O itself is still
+    thread-blocking, one pool thread per fetch in flight. At most
+    `max_concurrency` fetches run at once and at most `per_host_concurrency`
+    of them go to the same host. A URL whose host is at its limit waits in the
+    batch without holding a thread, so other hosts' URLs start ahead of it.
+    """
+
+    def __init__(self, fetch, max_concurrency=8, per_host_concurrency=2):
+        if max_concurrency < 1 or per_host_concurrency < 1:
+            raise ValueError("max_concurrency and per_host_concurrency must be >= 1")
+        self.fetch = fetch
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def fetch_batch(self, urls):
+        """Return [(result, error), ...] aligned with `urls`; exactly one of the pair is None."""
+        results = [None] * len(urls)
+        waiting = deque(enumerate(urls))
+        running = {}  # future -> (index in urls, host)
+        in_flight = Counter()  # host -> fetches running
+        while waiting or running:
+            held_back = deque()
+            while waiting and len(running) < self.max_concurrency:
+                index, url = waiting.popleft()
+                host = urlsplit(url).netloc
+                if in_flight[host] >= self.per_host_concurrency:
+                    held_back.append((index, url))
+                    continue
+                in_flight[host] += 1
+                running[self._executor.submit(self.fetch, url)] = index, host
+            held_back.extend(waiting)
+            waiting = held_back
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, host = running.pop(future)
+                in_flight[host] -= 1
+                error = future.exception()
+                results[index] = (future.result(), None) if error is None else (None, error)
+        return results
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
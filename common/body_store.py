@@ -0,0 +1,117 @@
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+
+# -----------------------------
+# Content-addressed page body store
+# -----------------------------
+# save_crawling keeps every page body once, zlib-compressed and keyed by the
+# hash of its content, in a BodyStore attached to the graph
+# (graph.graph["body_store"]). Edges and nodes carry only the body_id, so a
+# page with 300 links adds 300 short ids to the graph instead of 300 body
+# attributes, and a pickled graph holds each body once, compressed.
+#
+# Consumers read bodies through edge_body(), which also understands graphs
+# pickled before the store existed (the full HTML in a `body` attribute).
+# The lower-cased body, what every heuristic searches, is kept for the most
+# recently used pages only.
+
+BODY_ID_BYTES = 16
+LOWER_CACHE_ENTRIES = 64
+COMPRESSION_LEVEL = 6
+
+
+def body_id_of(text):
+    return hashlib.blake2b(text.encode("utf-8", errors="surrogatepass"), digest_size=BODY_ID_BYTES).hexdigest()
+
+
+class BodyStore:
+    """Page bodies stored once each, compressed, by content hash."""
+
+    def __init__(self):
+        self._bodies = {}  # body_id -> zlib-compressed UTF-8
+        self._lower = OrderedDict()  # body_id -> lower-cased body, LRU
+        self._lock = threading.Lock()  # save_crawling adds from fetch threads
+
+    def add(self, text):
+        """Store `text` (once per distinct content) and return its body_id."""
+        body_id = body_id_of(text)
+        if body_id not in self._bodies:
+            compressed = zlib.compress(text.encode("utf-8", errors="surrogatepass"), COMPRESSION_LEVEL)
+            with self._lock:
+                self._bodies.setdefault(body_id, compressed)
+        return body_id
+
+    def get(self, body_id):
+        compressed = self._bodies.get(body_id)
+        if compressed is None:
+            return None
+        return zlib.decompress(compressed).decode("utf-8", errors="surrogatepass")
+
+    def lower(self, body_id):
+        """get(body_id).lower(), memoized for the most recently used bodies."""
+        text = self._lower.get(body_id)
+        if text is not None:
+            self._lower.move_to_end(body_id)
+            return text
+        text = self.get(body_id)
+        if text is None:
+            return None
+        text = text.lower()
+        with self._lock:
+            self._lower[body_id] = text
+            while len(self._lower) > LOWER_CACHE_ENTRIES:
+                self._lower.popitem(last=False)
+        return text
+
+    def compressed_bytes(self):
+        return sum(len(compressed) for compressed in self._bodies.values())
+
+    def __contains__(self, body_id):
+        return body_id in self._bodies
+
+    def __len__(self):
+        return len(self._bodies)
+
+    # Pickled with the graph: the compressed bodies only
+    def __getstate__(self):
+        return {"bodies": self._bodies}
+
+    def __setstate__(self, state):
+        self._bodies = state["bodies"]
+        self._lower = OrderedDict()
+        self._lock = threading.Lock()
+
+
+# -----------------------------
+# Graph access
+# -----------------------------
+def body_store_of(graph):
+    return graph.graph.get("body_store")
+
+
+def edge_body_key(graph, data, *nodes):
+    """
+    What identifies an edge's body: its body_id, else (legacy graphs) the body
+    text of the edge, then of `nodes` in order. Equal keys mean equal bodies.
+    """
+    body_id = data.get("body_id")
+    if body_id is not None:
+        return body_id
+    body = data.get("body")
+    for node in nodes:
+        if body:
+            break
+        body = graph.nodes.get(node, {}).get("body")
+    return body or ""
+
+
+def edge_body(graph, data, *nodes, lower=False):
+    """The body text of an edge (see edge_body_key), lower-cased if asked; "" if none."""
+    key = edge_body_key(graph, data, *nodes)
+    if key and "body_id" in data:
+        store = body_store_of(graph)
+        text = None if store is None else (store.lower(key) if lower else store.get(key))
+        return text or ""
+    return key.lower() if lower else key
@@ -0,0 +1,53 @@
+import codecs
+import re
+
+# -----------------------------
+# Cheap charset sniffing
+# -----------------------------
+# Order follows the HTML spec: byte order mark, then the HTTP Content-Type
+# charset, then a <meta charset> / http-equiv declaration in the first bytes,
+# then a fixed default. Unlike requests' fallback (charset_normalizer over the
+# whole body) every step is O(1) or a bounded prescan.
+
+DEFAULT_ENCODING = "utf-8"
+META_PRESCAN_BYTES = 4096
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_CONTENT_TYPE_CHARSET = re.compile(r"""charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+_META_CHARSET = re.compile(rb"""<meta[^>]+?charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+
+
+def _known_codec(name):
+    try:
+        return codecs.lookup(name).name
+    except (LookupError, TypeError):
+        return None
+
+
+def charset_from_content_type(content_type):
+    """'text/html; charset=ISO-8859-1' -> 'iso8859-1' (None if absent or unknown)."""
+    if not content_type:
+        return None
+    match = _CONTENT_TYPE_CHARSET.search(content_type)
+    return _known_codec(match.group(1)) if match else None
+
+
+def sniff_encoding(body, content_type=None, default=DEFAULT_ENCODING):
+    """Return (encoding, source) for an HTML body; source is 'bom', 'header', 'meta' or 'default'."""
+    for bom, encoding in _BOMS:
+        if body.startswith(bom):
+            return encoding, "bom"
+    encoding = charset_from_content_type(content_type)
+    if encoding:
+        return encoding, "header"
+    match = _META_CHARSET.search(body[:META_PRESCAN_BYTES])
+    if match:
+        encoding = _known_codec(match.group(1).decode("ascii", "replace"))
+        if encoding:
+            return encoding, "meta"
+    return default, "default"
+
@@ -0,0 +1,354 @@
+import os
+
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # optional: BeautifulSoup is always available
+    lxml = None
+
+# -----------------------------
+# Pluggable HTML parser
+# -----------------------------
+# The crawlers only need three things from a page: its text, its links (href +
+# anchor text) and the text of the block around each link (enclosing <p>, else
+# the nearest section/article/div). parse_html walks the parsed tree once,
+# keeps exactly that in a PageRecord and drops the tree, so goal checks and
+# heuristics never traverse the document again. The parser behind it can be
+# swapped:
+#
+#   "bs4"   BeautifulSoup(..., "html.parser")  -- default
+#   "lxml"  libxml2 (C) tree                   -- faster, opt-in when installed
+#
+# The backend is chosen per call, else by the HTML_PARSER_BACKEND environment
+# variable, else bs4. On well-formed pages both give the same text and links.
+# On malformed markup libxml2 repairs the tree the way browsers do, so link
+# paragraphs differ from bs4's (benchmarks/bench_html_parser.py lists cases):
+#
+#   <p>one <a>A</a><p>two ...      bs4 nests the second <p> in the first, so A's
+#                                  paragraph runs on into "two ..."; lxml closes
+#                                  the first <p>: paragraph "one A"
+#   <p>.. <div>.. <a>              lxml closes the <p> before the block, so the
+#   <p>.. <ul><li><a>              link has no paragraph and its context is the
+#                                  div / nearest block instead
+#
+# Those links get different paragraph_text / context_text and so different
+# heuristic and classifier scores, which can change the crawl order. bs4 stays
+# the default so scores match the earlier crawls; pick lxml for speed where
+# that is acceptable.
+#
+# A link's context is bounded by a ContextWindow: the enclosing block when it
+# is short, otherwise a window of words around the anchor. Without the bound
+# a link with no <p> gets the text of a wrapper div, often the whole page,
+# which costs a full-page vectorization per link and gives every link of the
+# page the same context.
+
+BACKENDS = ("lxml", "bs4")
+CONTEXT_BLOCK_TAGS = ("section", "article", "div")
+FIRST_TEXT_TAGS = ("title", "h1", "h2", "h3")  # first occurrence kept for first_text()
+# Elements whose strings BeautifulSoup's get_text() leaves out
+_NON_TEXT_TAGS = ("script", "style", "template")
+_SOUP_TEXT_TYPES = (NavigableString, CData)  # exact types, as get_text() uses
+
+
+def available_backends():
+    return tuple(name for name in BACKENDS if name != "lxml" or lxml is not None)
+
+
+def default_backend():
+    backend = os.environ.get("HTML_PARSER_BACKEND", "").strip().lower()
+    if backend:
+        return _check_backend(backend)
+    return "bs4"  # lxml only on request: its link paragraphs differ on malformed markup (see above)
+
+
+def _check_backend(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend {backend!r}; expected one of {BACKENDS}")
+    if backend not in available_backends():
+        raise ValueError(f"HTML parser backend {backend!r} is not installed")
+    return backend
+
+
+def parse_html(html, backend=None, context_window=None):
+    """
+    Parse an HTML string into a PageRecord with the chosen (or default) backend.
+    context_window bounds each link's context_text (default DEFAULT_CONTEXT_WINDOW).
+    """
+    backend = _check_backend(backend) if backend else default_backend()
+    builder = _RecordBuilder(context_window or DEFAULT_CONTEXT_WINDOW)
+    if backend == "lxml":
+        _walk_lxml(_lxml_document(html), builder)
+    else:
+        soup = BeautifulSoup(html, "html.parser")
+        _walk_soup(soup, builder)
+        soup.decompose()
+    return builder.finish(backend)
+
+
+# -----------------------------
+# Link context windows
+# -----------------------------
+class ContextWindow:
+    """
+    What counts as the text around a link: its block (<p>, else the nearest
+    section/article/div) when that is at most max_block_chars long, otherwise
+    the anchor plus `tokens` words on each side of it in document order.
+    """
+
+    __slots__ = ("tokens", "max_block_chars")
+
+    def __init__(self, tokens=40, max_block_chars=1000):
+        self.tokens = tokens
+        self.max_block_chars = max_block_chars
+
+    def context(self, link):
+        block_text = link.block_text
+        if self.tokens is None or self.max_block_chars is None:
+            return block_text
+        if block_text and len(block_text) <= self.max_block_chars:
+            return block_text
+        return link.token_window(self.tokens)
+
+
+DEFAULT_CONTEXT_WINDOW = ContextWindow()
+WHOLE_BLOCK = ContextWindow(tokens=None, max_block_chars=None)  # the block, whatever its size
+
+
+# -----------------------------
+# Page record
+# -----------------------------
+class PageLink:
+    """One <a href> of a page; its surrounding text lives in the page's block table."""
+
+    __slots__ = ("href", "anchor_strings", "paragraph_id", "context_id", "start", "end",
+                 "_blocks", "_strings", "_window", "_context")
+
+    def __init__(self, href, anchor_strings, paragraph_id, context_id, blocks,
+                 start=0, end=0, strings=(), window=WHOLE_BLOCK):
+        self.href = href
+        self.anchor_strings = anchor_strings  # stripped, non-empty text pieces of the <a>
+        self.paragraph_id = paragraph_id      # enclosing <p> in the block table, None if no <p>
+        self.context_id = context_id          # <p>, else nearest section/article/div, else None
+        self.start, self.end = start, end     # the anchor's span in the page's text strings
+        self._blocks = blocks
+        self._strings = strings
+        self._window = window
+        self._context = None
+
+    @property
+    def anchor_text(self):
+        # Same as link_tag.get_text(separator=" ", strip=True)
+        return " ".join(self.anchor_strings)
+
+    @property
+    def paragraph_text(self):
+        return self._blocks[self.paragraph_id] if self.paragraph_id is not None else None
+
+    @property
+    def block_text(self):
+        return self._blocks[self.context_id] if self.context_id is not None else ""
+
+    @property
+    def context_text(self):
+        """The link's context, bounded by the page's ContextWindow."""
+        if self._context is None:
+            self._context = self._window.context(self)
+        return self._context
+
+    def token_window(self, tokens):
+        """Up to `tokens` words before the anchor, the anchor, and up to `tokens` words after."""
+        strings = self._strings
+        before, index = [], self.start - 1
+        while index >= 0 and len(before) < tokens:
+            before.extend(reversed(strings[index].split()))
+            index -= 1
+        after, index = [], self.end
+        while index < len(strings) and len(after) < tokens:
+            after.extend(strings[index].split())
+            index += 1
+        return " ".join(before[:tokens][::-1] + self.anchor_strings + after[:tokens])
+
+
+class PageRecord:
+    """
+    Everything the crawlers read from one page, built in a single tree walk:
+    the document's text strings, its links and a deduplicated table of the
+    context blocks (<p> / section / article / div texts) the links point into.
+    """
+
+    __slots__ = ("backend", "strings", "blocks", "_links", "_first_texts", "_text_cache", "_derived")
+
+    def __init__(self, backend, strings, links, blocks, first_texts):
+        self.backend = backend
+        self.strings = strings    # text nodes in document order, unstripped
+        self.blocks = blocks      # [str] context block texts, each stored once
+        self._links = links
+        self._first_texts = first_texts
+        self._text_cache = {}
+        self._derived = {}
+
+    def get_text(self, separator="", strip=False):
+        """Same contract as BeautifulSoup's Tag.get_text for the whole document (cached)."""
+        key = (separator, strip)
+        text = self._text_cache.get(key)
+        if text is None:
+            strings = self.strings
+            if strip:
+                strings = [s for s in (s.strip() for s in strings) if s]
+            text = self._text_cache[key] = separator.join(strings)
+        return text
+
+    def derived(self, function):
+        """function(get_text(" ", strip=True)), computed once per page and function."""
+        if function not in self._derived:
+            self._derived[function] = function(self.get_text(separator=" ", strip=True))
+        return self._derived[function]
+
+    def links(self):
+        """Every <a href> of the page, in document order."""
+        return self._links
+
+    def first_text(self, *tag_names):
+        """get_text() of the first element of the first tag name present (FIRST_TEXT_TAGS only), or None."""
+        for name in tag_names:
+            if name in self._first_texts:
+                return self._first_texts[name]
+        return None
+
+
+class _RecordBuilder:
+    # Receives start / text / end events from a backend walker
+
+    def __init__(self, context_window):
+        self.context_window = context_window
+        self.strings = []
+        self.open_paragraphs = []  # [string start index]
+        self.open_blocks = []
+        self.open_anchors = []     # link index, or None for <a> without href
+        self.open_first = {}       # tag -> start index while its first element is open
+        self.first_spans = {}
+        self.links = []            # [href, anchor start, anchor end, paragraph span, context span]
+
+    def start(self, tag, href):
+        position = len(self.strings)
+        if tag == "p":
+            self.open_paragraphs.append([position, None])
+        elif tag in CONTEXT_BLOCK_TAGS:
+            self.open_blocks.append([position, None])
+        elif tag == "a":
+            if href is None:
+                self.open_anchors.append(None)
+            else:
+                paragraph = self.open_paragraphs[-1] if self.open_paragraphs else None
+                context = paragraph or (self.open_blocks[-1] if self.open_blocks else None)
+                self.open_anchors.append(len(self.links))
+                self.links.append([href, position, None, paragraph, context])
+        if tag in FIRST_TEXT_TAGS and tag not in self.first_spans and tag not in self.open_first:
+            self.open_first[tag] = position
+
+    def text(self, string):
+        self.strings.append(string)
+
+    def end(self, tag):
+        position = len(self.strings)
+        if tag == "p":
+            self.open_paragraphs.pop()[1] = position
+        elif tag in CONTEXT_BLOCK_TAGS:
+            self.open_blocks.pop()[1] = position
+        elif tag == "a":
+            link_index = self.open_anchors.pop()
+            if link_index is not None:
+                self.links[link_index][2] = position
+        if tag in self.open_first:
+            self.first_spans[tag] = (self.open_first.pop(tag), position)
+
+    def finish(self, backend):
+        strings = self.strings
+        stripped = [s.strip() for s in strings]
+        blocks, block_ids, text_ids = [], {}, {}
+
+        def block_id(span):
+            # One table entry per block element, and per distinct text
+            if span is None:
+                return None
+            key = id(span)
+            if key not in block_ids:
+                text = " ".join(s for s in stripped[span[0]:span[1]] if s)
+                if text not in text_ids:
+                    text_ids[text] = len(blocks)
+                    blocks.append(text)
+                block_ids[key] = text_ids[text]
+            return block_ids[key]
+
+        links = [
+            PageLink(href, [s for s in stripped[start:end] if s], block_id(paragraph), block_id(context), blocks,
+                     start, end, strings, self.context_window)
+            for href, start, end, paragraph, context in self.links
+        ]
+        first_texts = {tag: "".join(strings[start:end]) for tag, (start, end) in self.first_spans.items()}
+        return PageRecord(backend, strings, links, blocks, first_texts)
+
+
+# -------- BeautifulSoup backend --------
+def _walk_soup(soup, builder):
+    stack = [(None, iter(soup.contents))]
+    while stack:
+        tag_name, children = stack[-1]
+        for child in children:
+            if type(child) in _SOUP_TEXT_TYPES:
+                builder.text(str(child))
+            elif isinstance(child, Tag):
+                builder.start(child.name, child.get("href"))
+                stack.append((child.name, iter(child.contents)))
+                break
+        else:
+            stack.pop()
+            if tag_name is not None:
+                builder.end(tag_name)
+
+
+# -------- lxml backend --------
+def _walk_lxml(root, builder):
+    # Comments, processing instructions and script/style/template add no text
+    # (what BeautifulSoup's get_text() skips); the text after each of them
+    # (its tail) stays a string of its own, as it is in BeautifulSoup
+    if root is None:
+        return
+    builder.start(root.tag, root.get("href"))
+    if root.text:
+        builder.text(root.text)
+    stack = [(root, iter(root))]
+    while stack:
+        element, children = stack[-1]
+        for child in children:
+            tag = child.tag
+            if isinstance(tag, str):  # not a comment / processing instruction
+                builder.start(tag, child.get("href"))
+                if tag not in _NON_TEXT_TAGS:
+                    if child.text:
+                        builder.text(child.text)
+                    stack.append((child, iter(child)))
+                    break
+                builder.end(tag)
+            if child.tail:
+                builder.text(child.tail)
+        else:
+            stack.pop()
+            builder.end(element.tag)
+            if element.tail and element is not root:
+                builder.text(element.tail)
+
+
+def _lxml_document(html):
+    if not html or not html.strip():
+        return None
+    try:
+        root = lxml.html.document_fromstring(html)
+    except ValueError:
+        # str input with an XML encoding declaration: hand lxml the bytes instead
+        root = lxml.html.document_fromstring(html.encode("utf-8"), parser=lxml.html.HTMLParser(encoding="utf-8"))
+    except etree.ParserError:  # nothing but whitespace/comments
+        return None
+    return root
@@ -0,0 +1,369 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from common.decoding import sniff_encoding
+from common.politeness import shared_scheduler
+from common.response_cache import OfflineCacheMiss
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; MiniCrawler/1.0; +https://example.org/bot)",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+
+
+# -----------------------------
+# Timed urllib3 connections
+# -----------------------------
+class TimedConnectionMixin:
+    """
+    Records how long the TCP connect and TLS handshake took and when the
+    response headers arrived, and attaches that to the urllib3 response as
+    `response.fetch_timing`. A reused keep-alive connection reports no connect.
+    """
+
+    _tcp_seconds = None
+    _connect_seconds = None
+    _request_sent_at = None
+
+    def _new_conn(self):
+        stime = time.perf_counter()
+        sock = super()._new_conn()
+        self._tcp_seconds = time.perf_counter() - stime
+        return sock
+
+    def connect(self):
+        stime = time.perf_counter()
+        super().connect()
+        self._connect_seconds = time.perf_counter() - stime
+
+    def request(self, *args, **kwargs):
+        super().request(*args, **kwargs)
+        self._request_sent_at = time.perf_counter()
+
+    def getresponse(self):
+        response = super().getresponse()
+        headers_at = time.perf_counter()
+        tcp_seconds, connect_seconds = self._tcp_seconds, self._connect_seconds
+        self._tcp_seconds = self._connect_seconds = None  # next request on this socket is a reuse
+        response.fetch_timing = {
+            "connect": tcp_seconds,
+            "tls": connect_seconds - tcp_seconds if connect_seconds is not None and isinstance(self, HTTPSConnection) else None,
+            "ttfb": headers_at - self._request_sent_at if self._request_sent_at is not None else None,
+            "headers_at": headers_at,
+        }
+        return response
+
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+# -----------------------------
+# Streaming limits
+# -----------------------------
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+READ_CHUNK_BYTES = 64 * 1024
+
+
+class NotHtmlResponse(requests.RequestException):
+    """Raised by html_only fetches when the server says the body is not HTML."""
+
+
+def is_html(content_type):
+    """True for HTML content types, and when the server sent none (the body gets sniffed)."""
+    if not content_type:
+        return True
+    return content_type.split(";", 1)[0].strip().lower() in HTML_CONTENT_TYPES
+
+
+def _read_capped(response, max_bytes, html_only):
+    # Decide from the headers alone, then read at most max_bytes of the body
+    if html_only and response.ok and not is_html(response.headers.get("Content-Type")):
+        response.close()
+        raise NotHtmlResponse(f"{response.url} is {response.headers.get('Content-Type')}, not HTML", response=response)
+
+    chunks, received, truncated = [], 0, False
+    for chunk in response.iter_content(READ_CHUNK_BYTES):
+        if max_bytes is not None and received + len(chunk) > max_bytes:
+            chunks.append(chunk[:max_bytes - received])
+            truncated = True
+            break
+        chunks.append(chunk)
+        received += len(chunk)
+    if truncated:
+        response.close()  # drop the rest instead of draining it
+    response._content = b"".join(chunks)
+    response._content_consumed = True
+    response.truncated = truncated
+
+
+def _wire_bytes(response):
+    # Bytes read off the socket (compressed size), falling back to the body length
+    raw = response.raw
+    if raw is not None and hasattr(raw, "tell"):
+        try:
+            return raw.tell()
+        except (OSError, ValueError):
+            pass
+    return len(response.content)
+
+
+# -----------------------------
+# Per-request stats
+# -----------------------------
+class FetchStats:
+    """
+    Timing of one request. connect/tls are None when a keep-alive connection was
+    reused; truncated/aborted come from the max_bytes / html_only limits;
+    cache is "hit", "revalidated" (304), "miss" or None (no cache);
+    encoding_source is where the body's charset came from (see common/decoding.py).
+    """
+
+    __slots__ = ("url", "host", "status_code", "connect_seconds", "tls_seconds", "ttfb_seconds",
+                 "download_seconds", "total_seconds", "bytes_downloaded", "truncated", "aborted", "cache",
+                 "encoding", "encoding_source", "detect_seconds", "error")
+
+    def __init__(self, url, status_code=None, connect_seconds=None, tls_seconds=None, ttfb_seconds=None,
+                 download_seconds=None, total_seconds=None, bytes_downloaded=0, truncated=False, aborted=False, cache=None,
+                 encoding=None, encoding_source=None, detect_seconds=None, error=None):
+        self.url = url
+        self.host = urlsplit(url).netloc
+        self.status_code = status_code
+        self.connect_seconds = connect_seconds
+        self.tls_seconds = tls_seconds
+        self.ttfb_seconds = ttfb_seconds
+        self.download_seconds = download_seconds
+        self.total_seconds = total_seconds
+        self.bytes_downloaded = bytes_downloaded
+        self.truncated = truncated
+        self.aborted = aborted
+        self.cache = cache
+        self.encoding = encoding
+        self.encoding_source = encoding_source
+        self.detect_seconds = detect_seconds
+        self.error = error
+
+    @property
+    def reused_connection(self):
+        return self.connect_seconds is None and self.error is None and self.cache != "hit"
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"FetchStats({fields})"
+
+
+# -----------------------------
+# Shared HTTP client
+# -----------------------------
+class HttpClient:
+    """
+    The fetch layer every crawler goes through.
+
+    One requests.Session with a keep-alive connection pool per host
+    (`pool_connections` hosts, `pool_maxsize` sockets each), the same headers
+    on every request, optional urllib3 retries, and per-host politeness from
+    `scheduler`. Response bodies get their encoding sniffed once (BOM, header,
+    <meta>) so `response.text` never falls back to whole-body charset
+    detection. After each request `on_stats(FetchStats)` is called, and the
+    running totals are kept in `self.totals`.
+
+    With a ResponseCache, GETs are answered from disk while fresh and otherwise
+    revalidated with If-None-Match / If-Modified-Since; `offline=True` never
+    touches the network and raises OfflineCacheMiss for uncached URLs.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, headers=None, timeout=10,
+                 total_retries=0, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                 allowed_methods=frozenset(["HEAD", "GET", "OPTIONS"]),
+                 scheduler=shared_scheduler, min_delay=0.0, on_stats=None, cache=None, offline=False):
+        if offline and cache is None:
+            raise ValueError("offline mode needs a response cache")
+        self.timeout = timeout
+        self.scheduler = scheduler
+        self.min_delay = min_delay
+        self.on_stats = on_stats
+        self.cache = cache
+        self.offline = offline
+
+        retry = Retry(
+            total=total_retries,
+            read=total_retries,
+            connect=total_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+            allowed_methods=allowed_methods,
+            raise_on_status=False,
+        )
+        adapter = TimedHTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(DEFAULT_HEADERS if headers is None else headers)
+
+        self.totals = {"requests": 0, "errors": 0, "connections_opened": 0, "tls_handshakes": 0, "bytes": 0,
+                       "cache_hits": 0, "not_modified": 0, "truncated": 0, "aborted": 0, "detect_seconds": 0.0}
+        self._totals_lock = threading.Lock()
+
+    def request(self, method, url, timeout=None, min_delay=None, max_bytes=None, html_only=False, **kwargs):
+        """
+        session.request with politeness, caching and timing; exceptions propagate to the caller.
+
+        `html_only` aborts a response whose Content-Type is not HTML before its
+        body is read (NotHtmlResponse); `max_bytes` stops reading the body there
+        and marks the response `truncated`. Either one streams the body.
+        """
+        capped = html_only or max_bytes is not None
+        raw_stream = bool(kwargs.get("stream")) and not capped
+        if capped:
+            kwargs["stream"] = True
+        cacheable = self.cache is not None and method.upper() == "GET" and not raw_stream
+
+        cached = None
+        if cacheable:
+            cached = self.cache.get(url)
+            if cached is not None and (self.offline or self.cache.is_fresh(cached)):
+                if html_only and not is_html(cached.headers.get("Content-Type")):
+                    raise NotHtmlResponse(f"{url} is {cached.headers.get('Content-Type')}, not HTML")
+                self.cache.record("hits", len(cached.body))
+                response = cached.to_response()
+                stats = FetchStats(url, status_code=cached.status_code, total_seconds=0.0, cache="hit")
+                self._set_encoding(response, stats)
+                self._record(stats)
+                return response
+            if self.offline:
+                self.cache.record("misses")
+                raise OfflineCacheMiss(f"offline mode: {url} is not cached")
+            if cached is not None:
+                kwargs["headers"] = {**cached.validators(), **(kwargs.get("headers") or {})}
+
+        if self.scheduler is not None:
+            self.scheduler.wait(url, min_delay=self.min_delay if min_delay is None else min_delay)
+
+        stime = time.perf_counter()
+        try:
+            response = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+        except requests.RequestException as e:
+            self._record(FetchStats(url, total_seconds=time.perf_counter() - stime, error=e))
+            raise
+        if self.scheduler is not None:
+            self.scheduler.observe(url, response)
+
+        aborted = None
+        if capped:
+            try:
+                _read_capped(response, max_bytes, html_only)
+            except NotHtmlResponse as e:
+                aborted = e
+        end_time = time.perf_counter()
+
+        timing = getattr(response.raw, "fetch_timing", None) or {}
+        headers_at = timing.get("headers_at")
+        stats = FetchStats(
+            url,
+            status_code=response.status_code,
+            connect_seconds=timing.get("connect"),
+            tls_seconds=timing.get("tls"),
+            ttfb_seconds=timing.get("ttfb"),
+            download_seconds=end_time - headers_at if headers_at is not None and not raw_stream else None,
+            total_seconds=end_time - stime,
+            bytes_downloaded=0 if raw_stream else _wire_bytes(response),
+            truncated=getattr(response, "truncated", False),
+            aborted=aborted is not None,
+        )
+        if aborted is not None:
+            self._record(stats)
+            raise aborted
+
+        if cached is not None and response.status_code == 304:
+            # Unchanged upstream: serve the stored body, only headers crossed the wire
+            self.cache.refresh(url, response, cached)
+            self.cache.record("revalidated", len(cached.body))
+            stats.cache = "revalidated"
+            response = cached.to_response()
+            self._set_encoding(response, stats)
+            self._record(stats)
+            return response
+        if cacheable:
+            self.cache.record("misses")
+            stats.cache = "miss"
+            if not stats.truncated:  # a partial body must not be served as the page later
+                self.cache.put(url, response)
+        if not raw_stream:
+            self._set_encoding(response, stats)
+        self._record(stats)
+        return response
+
+    @staticmethod
+    def _set_encoding(response, stats):
+        stime = time.perf_counter()
+        response.encoding, stats.encoding_source = sniff_encoding(
+            response.content, response.headers.get("Content-Type")
+        )
+        stats.detect_seconds = time.perf_counter() - stime
+        stats.encoding = response.encoding
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def _record(self, stats):
+        with self._totals_lock:
+            self.totals["requests"] += 1
+            self.totals["cache_hits"] += stats.cache == "hit"
+            self.totals["not_modified"] += stats.cache == "revalidated"
+            self.totals["errors"] += stats.error is not None
+            self.totals["connections_opened"] += stats.connect_seconds is not None
+            self.totals["tls_handshakes"] += stats.tls_seconds is not None
+            self.totals["bytes"] += stats.bytes_downloaded
+            self.totals["truncated"] += stats.truncated
+            self.totals["aborted"] += stats.aborted
+            self.totals["detect_seconds"] += stats.detect_seconds or 0.0
+        if self.on_stats is not None:
+            self.on_stats(stats)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def print_fetch_stats(client):
+    """One-line summary of a client's totals for the end of a crawl."""
+    totals = client.totals
+    requests_made = max(totals["requests"], 1)
+    print(f"Fetch stats            : {totals['requests']} requests, {totals['bytes'] / 1024:.0f} KiB, "
+          f"{totals['connections_opened']} connections, {totals['cache_hits']} cache hits, "
+          f"{totals['not_modified']} not modified, {totals['aborted']} non-HTML aborted, "
+          f"{totals['truncated']} truncated, charset detection "
+          f"{1e6 * totals['detect_seconds'] / requests_made:.0f} us/page")
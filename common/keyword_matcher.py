@@ -0,0 +1,84 @@
+from collections import Counter
+
+# -----------------------------
+# Multi-keyword counting
+# -----------------------------
+# The heuristics count keywords with `sum(text.count(word) for word in words)`:
+# one full scan of the text per keyword. KeywordMatcher is built once per crawl
+# from the keyword list and returns every keyword's count, identical to
+# str.count, at a cost that stops growing with the number of keywords:
+#
+#   - a keyword without whitespace never spans whitespace, so its occurrences
+#     in a text are the sum of its occurrences in the text's whitespace tokens
+#   - each distinct token is matched against the keywords once per crawl and
+#     the hits are memoized, so counting a text is one split plus one dict
+#     lookup per distinct token, for any number of keywords
+#   - keywords with whitespace (or empty ones) are counted with str.count
+#
+# Per-keyword str.count runs in C and wins for short keyword lists and short
+# texts (anchors, paragraphs), so the token path only takes over from
+# TOKEN_SCAN_MIN_KEYWORDS keywords and TOKEN_SCAN_MIN_CHARS characters on
+# (benchmarks/bench_keyword_matcher.py). Works for any script (Arabic and
+# Latin alike); callers lower-case the text and the keywords as before.
+
+TOKEN_SCAN_MIN_KEYWORDS = 32
+TOKEN_SCAN_MIN_CHARS = 2_000
+MAX_CACHED_TOKENS = 200_000  # memo is cleared when it grows past this
+
+
+class KeywordMatcher:
+    """Counts occurrences of every keyword of a fixed list in a text."""
+
+    def __init__(self, keywords, token_scan=None):
+        # token_scan: None picks per text (see above); True / False forces one path
+        self.keywords = list(keywords)
+        distinct_keywords = list(dict.fromkeys(self.keywords))
+        self._in_token = [word for word in distinct_keywords if word.split() == [word]]
+        self._spanning = [word for word in distinct_keywords if word.split() != [word]]
+        if token_scan is None and len(self._in_token) < TOKEN_SCAN_MIN_KEYWORDS:
+            token_scan = False
+        self.token_scan = token_scan
+        self._token_hits = {}  # token -> ((keyword, count in token), ...)
+
+    def counts(self, text):
+        """[text.count(word) for word in keywords]"""
+        counts = self._count_distinct(text)
+        return [counts[word] for word in self.keywords]
+
+    def total(self, text):
+        """sum(text.count(word) for word in keywords)"""
+        counts = self._count_distinct(text)
+        return sum(counts[word] for word in self.keywords)
+
+    def contains_any(self, text):
+        """any(word in text for word in keywords)"""
+        if not self._use_token_scan(text):
+            return any(word in text for word in self._in_token) or any(word in text for word in self._spanning)
+        return any(word in text for word in self._spanning) or any(self._hits(token) for token in set(text.split()))
+
+    def _count_distinct(self, text):
+        if not self._use_token_scan(text):
+            counts = {word: text.count(word) for word in self._in_token}
+        else:
+            counts = dict.fromkeys(self._in_token, 0)
+            for token, occurrences in Counter(text.split()).items():
+                for word, count in self._hits(token):
+                    counts[word] += count * occurrences
+        for word in self._spanning:
+            counts[word] = text.count(word)
+        return counts
+
+    def _use_token_scan(self, text):
+        if self.token_scan is None:
+            return len(text) >= TOKEN_SCAN_MIN_CHARS
+        return self.token_scan
+
+    def _hits(self, token):
+        hits = self._token_hits.get(token)
+        if hits is None:
+            if len(self._token_hits) >= MAX_CACHED_TOKENS:
+                self._token_hits.clear()
+            hits = self._token_hits[token] = tuple(
+                (word, token.count(word)) for word in self._in_token if word in token
+            )
+        return hits
@@ -0,0 +1,57 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+# -----------------------------
+# Page processing on worker processes
+# -----------------------------
+class PagePool:
+    """
+    Runs the CPU-bound part of a crawl (parse, goal check, link scoring) on a
+    pool of worker processes, so it is not serialized behind one GIL.
+
+    `process` must be a module-level function; each batch item is the tuple of
+    arguments for one call (e.g. url, raw body bytes, encoding) and its return
+    value should be compact (goal flag + scored child URLs), since both travel
+    between processes. `initializer(*initargs)` runs once in every worker, the
+    place to preload models and keep the crawl settings.
+
+    Workers are started with "spawn": the coordinator runs HTTP client and
+    fetch threads, which fork() would copy mid-flight.
+    """
+
+    def __init__(self, process, workers, initializer=None, initargs=(), start_method="spawn"):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.process = process
+        self.workers = workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=initializer,
+            initargs=initargs,
+        )
+
+    def process_batch(self, items, process=None):
+        """
+        Return [(result, error), ...] aligned with `items`; exactly one of the
+        pair is None. `process` (module-level too) replaces the pool's for this batch.
+        """
+        process = process or self.process
+        futures = [self._executor.submit(process, *item) for item in items]
+        results = []
+        for future in futures:
+            try:
+                results.append((future.result(), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
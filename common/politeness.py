@@ -0,0 +1,147 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+
+# -----------------------------
+# Per-host politeness scheduler
+# -----------------------------
+class HostState:
+    def __init__(self, burst):
+        self.lock = threading.Lock()  # guards this host's bucket and backoff, never held while sleeping
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0      # set by Retry-After / 429 / 503 backoff
+        self.backoff = 1.0            # multiplier on the request interval
+        self.crawl_delay = None       # robots.txt Crawl-delay (seconds)
+        self.robots_loaded = False
+
+
+class PolitenessScheduler:
+    """
+    Decides when the next request to a host may start.
+
+    Each host gets a token bucket refilled at one token per `interval`, where
+    interval = max(min_delay asked by the caller, robots.txt Crawl-delay)
+    multiplied by an adaptive backoff that grows on 429/503 and decays on
+    success. Retry-After blocks the host until the given time. wait() takes
+    the host's lock only to read and update its bucket and sleeps without it,
+    so observe() is never stuck behind a sleeping request and requests to
+    other hosts go ahead meanwhile.
+    """
+
+    def __init__(self, default_delay=0.0, burst=1, respect_robots=True,
+                 user_agent="*", max_backoff=32.0, robots_timeout=5):
+        self.default_delay = default_delay
+        self.burst = burst
+        self.respect_robots = respect_robots
+        self.user_agent = user_agent
+        self.max_backoff = max_backoff
+        self.robots_timeout = robots_timeout
+        self._hosts = {}
+        self._hosts_lock = threading.Lock()
+
+    def _host_state(self, url):
+        parts = urlsplit(url)
+        with self._hosts_lock:
+            state = self._hosts.get(parts.netloc)
+            if state is None:
+                state = self._hosts[parts.netloc] = HostState(self.burst)
+        return parts, state
+
+    def _load_robots(self, parts, state):
+        state.robots_loaded = True
+        if not self.respect_robots or parts.scheme not in ("http", "https"):
+            return
+        robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+        try:
+            headers = {"User-Agent": self.user_agent} if self.user_agent != "*" else None
+            response = requests.get(robots_url, timeout=self.robots_timeout, headers=headers)
+        except requests.RequestException:
+            return
+        if response.status_code != 200:
+            return
+        parser = RobotFileParser()
+        parser.parse(response.text.splitlines())
+        delay = parser.crawl_delay(self.user_agent)
+        rate = parser.request_rate(self.user_agent)
+        if rate is not None and rate.requests:
+            delay = max(delay or 0.0, rate.seconds / rate.requests)
+        if delay:
+            state.crawl_delay = float(delay)
+
+    def _interval(self, state, min_delay):
+        base = self.default_delay if min_delay is None else min_delay
+        if state.crawl_delay is not None:
+            base = max(base, state.crawl_delay)
+        return base * state.backoff
+
+    def wait(self, url, min_delay=None):
+        """Block until a request to `url`'s host may start; returns the seconds waited."""
+        parts, state = self._host_state(url)
+        waited = 0.0
+        while True:
+            with state.lock:
+                if not state.robots_loaded:
+                    self._load_robots(parts, state)
+                now = time.monotonic()
+                interval = self._interval(state, min_delay)
+                if interval <= 0:
+                    state.tokens = float(self.burst)
+                else:
+                    state.tokens = min(float(self.burst), state.tokens + (now - state.last_refill) / interval)
+                state.last_refill = now
+
+                ready_at = state.blocked_until
+                if state.tokens < 1.0:
+                    ready_at = max(ready_at, now + (1.0 - state.tokens) * interval)
+                if ready_at <= now:
+                    if interval > 0:
+                        state.tokens -= 1.0
+                    return waited
+            # Sleep without the lock (observe() may move blocked_until meanwhile), then re-check
+            time.sleep(ready_at - now)
+            waited += ready_at - now
+
+    def observe(self, url, response):
+        """Feed a response back: 429/503 back off (honouring Retry-After), success decays the backoff."""
+        if response is None:
+            return
+        _, state = self._host_state(url)
+        with state.lock:
+            if response.status_code in (429, 503):
+                state.backoff = min(self.max_backoff, state.backoff * 2.0)
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is None:
+                    # No hint from the server: pause for the backed-off interval (at least 1 s)
+                    retry_after = max(1.0, self._interval(state, None))
+                state.blocked_until = max(state.blocked_until, time.monotonic() + retry_after)
+            elif response.status_code < 400:
+                state.backoff = max(1.0, state.backoff / 2.0)
+
+    def crawl_delay(self, url):
+        """robots.txt Crawl-delay seen for `url`'s host (None if unknown or unset)."""
+        return self._host_state(url)[1].crawl_delay
+
+
+def parse_retry_after(value):
+    """Retry-After header -> seconds from now (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+# One scheduler for the whole process, so every crawler (phase 1 A*, phase 2 A*,
+# save_crawling, the dataset builder) sees the same per-host budget.
+shared_scheduler = PolitenessScheduler()
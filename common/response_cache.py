@@ -0,0 +1,220 @@
+import atexit
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_PATH = REPO_ROOT / ".http_cache" / "responses.sqlite"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+ACCESS_FLUSH_HITS = 256  # cache hits whose last_access updates are written in one commit
+
+# The stored body is already decoded, so these no longer describe it
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+class OfflineCacheMiss(requests.ConnectionError):
+    """Raised in offline mode for a URL that is not in the cache."""
+
+
+# -----------------------------
+# Cached entry
+# -----------------------------
+class CachedResponse:
+    def __init__(self, url, status_code, headers, body, fetched_at):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.fetched_at = fetched_at
+
+    @property
+    def etag(self):
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self):
+        return self.headers.get("Last-Modified")
+
+    def validators(self):
+        """Conditional request headers that let the server answer 304 Not Modified."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self):
+        """Rebuild a requests.Response so callers cannot tell it came from disk."""
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.reason = "OK"
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = self.body
+        response.from_cache = True
+        return response
+
+
+# -----------------------------
+# Persistent response cache
+# -----------------------------
+class ResponseCache:
+    """
+    On-disk cache of successful GET responses, keyed by URL.
+
+    Bodies are zlib-compressed in one SQLite file together with their headers
+    (so ETag / Last-Modified are kept for revalidation). An entry younger than
+    `max_age` seconds is served without touching the network; older entries
+    are revalidated (max_age=None always revalidates). When the compressed
+    bodies exceed `max_bytes`, the least recently used entries are evicted.
+    Safe to share between threads.
+
+    The size total is kept in memory from the value read at open, so another
+    process writing the same file is only counted after a reopen. Hits update
+    last_access in memory; the updates are written with the next put,
+    refresh, flush() or close(), or every ACCESS_FLUSH_HITS hits.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_age=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stores": 0, "evictions": 0, "bytes_saved": 0}
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY, status INTEGER, headers TEXT, body BLOB,"
+            " size INTEGER, fetched_at REAL, last_access REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+        self._db.commit()
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self._pending_access = {}  # url -> last_access not yet written
+
+    def get(self, url):
+        """Return the CachedResponse for `url` (and mark it used), or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, body, fetched_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._pending_access[url] = time.time()
+            if len(self._pending_access) >= ACCESS_FLUSH_HITS:
+                self._write_access()
+                self._db.commit()
+        status, headers, body, fetched_at = row
+        return CachedResponse(url, status, json.loads(headers), zlib.decompress(body), fetched_at)
+
+    def is_fresh(self, entry):
+        return self.max_age is not None and time.time() - entry.fetched_at < self.max_age
+
+    def put(self, url, response):
+        """Store a 200 response (its body must already be read)."""
+        if response.status_code != 200:
+            return
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in _DROPPED_HEADERS}
+        body = zlib.compress(response.content, 6)
+        now = time.time()
+        with self._lock:
+            self._pending_access.pop(url, None)
+            self._write_access()
+            previous = self._db.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, response.status_code, json.dumps(headers), body, len(body), now, now),
+            )
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            self.stats["stores"] += 1
+            self._evict()
+            self._db.commit()
+
+    def refresh(self, url, not_modified_response, entry):
+        """Handle a 304: restart the entry's max_age and merge the updated validators."""
+        headers = dict(entry.headers)
+        for name in ("ETag", "Last-Modified", "Cache-Control", "Expires", "Date"):
+            if name in not_modified_response.headers:
+                headers[name] = not_modified_response.headers[name]
+        entry.headers = headers
+        entry.fetched_at = time.time()
+        with self._lock:
+            self._pending_access.pop(url, None)
+            self._write_access()
+            self._db.execute(
+                "UPDATE responses SET headers = ?, fetched_at = ?, last_access = ? WHERE url = ?",
+                (json.dumps(headers), entry.fetched_at, entry.fetched_at, url),
+            )
+            self._db.commit()
+
+    def _write_access(self):
+        # Caller holds the lock and commits
+        if self._pending_access:
+            self._db.executemany("UPDATE responses SET last_access = ? WHERE url = ?",
+                                 [(accessed, url) for url, accessed in self._pending_access.items()])
+            self._pending_access.clear()
+
+    def _evict(self):
+        # Caller holds the lock, after _write_access() so the LRU order is current
+        if self._total_bytes <= self.max_bytes:
+            return
+        for url, size in self._db.execute("SELECT url, size FROM responses ORDER BY last_access").fetchall():
+            self._db.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self.stats["evictions"] += 1
+            self._total_bytes -= size
+            if self._total_bytes <= self.max_bytes:
+                break
+
+    def record(self, outcome, bytes_saved=0):
+        with self._lock:
+            self.stats[outcome] += 1
+            self.stats["bytes_saved"] += bytes_saved
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def flush(self):
+        """Write the last_access updates of recent hits."""
+        with self._lock:
+            self._write_access()
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._pending_access.clear()
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._write_access()
+            self._db.commit()
+            self._db.close()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def default_cache():
+    """Process-wide cache at DEFAULT_CACHE_PATH, opened on first use."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+            atexit.register(_default_cache.flush)
+        return _default_cache
@@ -0,0 +1,76 @@
+import re
+import unicodedata
+
+# -----------------------------
+# Text normalization for goal detection
+# -----------------------------
+# page_contains_phrase compares the target phrase and the page text after
+# folding both:
+#
+#   arabic mode (phrase or page contains Arabic letters):
+#       lower -> NFKC -> drop diacritics -> unify alef / yeh / waw / teh marbuta
+#       -> collapse whitespace
+#   otherwise:
+#       collapse whitespace -> lower
+#
+# Diacritics are one precompiled character class and the letter unification
+# only touches letters present in the text; the Arabic test is a precompiled
+# character class too, and pure-ASCII text skips the Unicode steps (they
+# leave it unchanged). The target is folded once per crawl (TargetPhrase) and
+# a page's folded text once per page (PageRecord.derived).
+#
+# A single str.translate table was tried for the diacritics + letters: CPython
+# translates non-ASCII text one character at a time through the table and it
+# was ~5x slower than this on Arabic pages (benchmarks/bench_text_normalization.py).
+
+ARABIC_LETTER_RE = re.compile("[\u0600-\u06FF]")  # 0600 - 06FF is arabic letter range in unicode
+ARABIC_DIACRITICS_RE = re.compile("[\u0617-\u061A\u064B-\u0652]")
+ARABIC_LETTER_FORMS = (  # unify common forms
+    ("أ", "ا"), ("إ", "ا"), ("آ", "ا"),
+    ("ى", "ي"), ("ؤ", "و"), ("ئ", "ي"), ("ة", "ه"),
+)
+
+
+def contains_arabic(text):
+    return ARABIC_LETTER_RE.search(text or "") is not None
+
+
+def collapse_whitespace(text):
+    # Same as re.sub(r"\s+", " ", text).strip(): both use str.isspace
+    return " ".join(text.split())
+
+
+def normalize_arabic_text(text):
+    if not text:
+        return ""
+    if not text.isascii():
+        text = ARABIC_DIACRITICS_RE.sub("", unicodedata.normalize("NFKC", text))
+        for letter_form, letter in ARABIC_LETTER_FORMS:
+            if letter_form in text:
+                text = text.replace(letter_form, letter)
+    return collapse_whitespace(text)
+
+
+def fold_arabic(text):
+    """Arabic-mode form of a phrase or page text."""
+    return normalize_arabic_text(text.lower())
+
+
+def fold_plain(text):
+    """Plain-mode form of a phrase or page text."""
+    return collapse_whitespace(text).lower()
+
+
+class TargetPhrase:
+    """A goal phrase with both folded forms computed once (per crawl)."""
+
+    __slots__ = ("raw", "has_arabic", "arabic_form", "plain_form")
+
+    def __init__(self, phrase):
+        self.raw = phrase or ""
+        self.has_arabic = contains_arabic(self.raw)
+        self.arabic_form = fold_arabic(self.raw)
+        self.plain_form = fold_plain(self.raw)
+
+    def __str__(self):
+        return self.raw
@@ -1,11 +1,126 @@
 from AStar.AStarHelperFunctions import *
-from AStar.AStarHeuristicFunction import estimate_child_relevance_weighted
+from AStar.AStarHeuristicFunction import estimate_child_relevance_weighted, keyword_links_on_page
+import sys
 import time
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urldefrag
+from urllib.parse import urldefrag, urlparse
+from pathlib import Path
 import heapq
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # repo root, for common/
+from common.async_fetch import ConcurrentFetcher
+from common.html_parser import parse_html
+from common.http_client import HttpClient, print_fetch_stats
+from common.keyword_matcher import KeywordMatcher
+from common.page_pool import PagePool
+from common.politeness import shared_scheduler
+from common.response_cache import default_cache
+from common.text_normalization import TargetPhrase
+
+NON_HTML_EXTENSIONS = (".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx")
+
+
+# ----- Per-page processing (inline, or on worker processes) -----
+class PageSettings:
+    """Crawl-wide settings pages are processed with; sent once to each worker process."""
+
+    def __init__(self, target_phrase, topic_keyword_list, phrase_token_list, base_domain,
+                 parser_backend=None, link_context_window=None):
+        self.target_phrase = target_phrase
+        self.topic_keyword_list = topic_keyword_list
+        self.phrase_token_list = phrase_token_list
+        self.base_domain = base_domain
+        self.parser_backend = parser_backend
+        self.link_context_window = link_context_window
+        # Keyword counting compiled once per crawl (common/keyword_matcher.py)
+        self.topic_keyword_matcher = KeywordMatcher(topic_keyword_list)
+        self.phrase_keyword_matcher = KeywordMatcher(phrase_token_list)
+        # Goal phrase folded once per crawl (common/text_normalization.py)
+        self.goal_phrase = TargetPhrase(target_phrase)
+
+
+def process_page(html_text, current_web_address, settings, skip=()):
+    """
+    Parse a page and check it for the goal phrase.
+
+    Returns (goal_found, children): children yields (absolute_url, blended
+    relevance score) for the page's in-domain, not obviously non-HTML links
+    that are not in `skip`, in document order, scoring each link when asked for it.
+    """
+    current_page = parse_html(html_text, settings.parser_backend, settings.link_context_window)
+    if page_contains_phrase(current_page, settings.goal_phrase) or find_tgt(settings.target_phrase, current_page):
+        return True, iter(())
+    return False, _scored_children(current_page, current_web_address, settings, skip)
+
+
+def _scored_children(current_page, current_web_address, settings, skip):
+    all_links_on_page = current_page.links()
+    # Sibling keyword-link counts, once per page instead of once per scored link
+    topic_keyword_links = keyword_links_on_page(settings.topic_keyword_list, all_links_on_page,
+                                                settings.topic_keyword_matcher)
+    phrase_keyword_links = (keyword_links_on_page(settings.phrase_token_list, all_links_on_page,
+                                                  settings.phrase_keyword_matcher)
+                            if settings.phrase_token_list else None)
+
+    for link in all_links_on_page:
+        absolute_url = requests.compat.urljoin(current_web_address, link.href)
+        absolute_url, _fragment = urldefrag(absolute_url)
+
+        if absolute_url in skip:
+            continue
+
+        # Stay within domain
+        if not is_within_domain(settings.base_domain, absolute_url):
+            continue
+
+        # Skip obvious non-HTML
+        if absolute_url.lower().endswith(NON_HTML_EXTENSIONS):
+            continue
+
+        # --- Heuristic scoring ---
+        topic_relevance_score = estimate_child_relevance_weighted(
+            settings.topic_keyword_list,
+            link,
+            all_links_on_page,
+            topic_keyword_links,
+            settings.topic_keyword_matcher
+        )
+
+        if settings.phrase_token_list:
+            phrase_relevance_score = estimate_child_relevance_weighted(
+                settings.phrase_token_list,
+                link,
+                all_links_on_page,
+                phrase_keyword_links,
+                settings.phrase_keyword_matcher
+            )
+        else:
+            phrase_relevance_score = 0.0
+
+        blended_relevance_score = (
+            0.3 * float(topic_relevance_score)
+            + 0.7 * float(phrase_relevance_score)
+        )
+        yield absolute_url, blended_relevance_score
+
+
+# State of a worker process (PagePool), set once by _init_page_worker
+_worker_settings = None
+
+
+def _init_page_worker(settings):
+    global _worker_settings
+    _worker_settings = settings
+
+
+def _process_page_in_worker(current_web_address, body, encoding):
+    # Raw bytes in, compact result out; decoded the way response.text does.
+    # Every eligible link is scored: the coordinator knows which ones are new.
+    html_text = str(body, encoding or "utf-8", errors="replace")
+    goal_found, children = process_page(html_text, current_web_address, _worker_settings)
+    return goal_found, list(children)
+
+
 def a_star_web_crawl(
     seed_web_address,
     target_phrase,
@@ -13,7 +128,17 @@ def a_star_web_crawl(
     maximum_pages_to_visit=200,
     maximum_child_links_per_page=100,
     requests_timeout_seconds=5,
-    depth_penalty_per_level=75.0
+    depth_penalty_per_level=75.0,
+    max_concurrency=1,  # >1 fetches the top-N frontier pages concurrently (thread pool)
+    per_host_concurrency=2,  # concurrent fetches allowed to a single host
+    politeness_delay_seconds=0.0,  # minimum gap between requests to the same host
+    scheduler=None,  # PolitenessScheduler; defaults to the process-wide one
+    http_client=None,  # HttpClient to fetch with (e.g. one with an on_stats hook)
+    offline=False,  # serve pages only from the on-disk response cache
+    max_page_bytes=2_000_000,  # stop reading a page body here (None = no cap)
+    parser_backend=None,  # "bs4" / "lxml"; default: HTML_PARSER_BACKEND or bs4
+    link_context_window=None,  # ContextWindow bounding link contexts; WHOLE_BLOCK = the enclosing block as-is
+    page_workers=0  # >0 parses and scores each fetched batch on this many processes (with max_concurrency > 1)
 ):
 
     start_time_seconds = time.time()
@@ -34,21 +159,54 @@ def a_star_web_crawl(
     parent_web_address = {}
     depth_of_page = {}
 
-    non_html_extensions = (".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx")
+    # Links are kept on the seed's host
+    base_domain = urlparse(seed_web_address).netloc
+
+    settings = PageSettings(target_phrase, topic_keyword_list, phrase_token_list, base_domain,
+                            parser_backend, link_context_window)
+
+    # Parsing and scoring run here, or on worker processes
+    page_pool = None
+    if page_workers > 0:
+        page_pool = PagePool(_process_page_in_worker, page_workers,
+                             initializer=_init_page_worker, initargs=(settings,))
+
+    # Keep-alive connection pools shared by every fetch of this crawl, with
+    # per-host politeness (robots.txt Crawl-delay, Retry-After, 429/503 backoff)
+    # and revalidation of pages cached by earlier runs
+    if http_client is None:
+        http_client = HttpClient(
+            pool_maxsize=max(max_concurrency, per_host_concurrency),
+            scheduler=scheduler or shared_scheduler,
+            cache=default_cache(),
+            offline=offline,
+        )
+
+    def fetch_page(web_address):
+        # Streams the body: non-HTML is aborted from its headers, long pages are
+        # cut at max_page_bytes and the goal check runs on what was read
+        return http_client.get(web_address, timeout=requests_timeout_seconds, min_delay=politeness_delay_seconds,
+                               max_bytes=max_page_bytes, html_only=True)
+
+    page_fetcher = None
+    if max_concurrency > 1:
+        page_fetcher = ConcurrentFetcher(fetch_page, max_concurrency, per_host_concurrency)
 
     # ----- Fetch seed page -----
     try:
-        seed_response = requests.get(seed_web_address, timeout=requests_timeout_seconds)
-        if not getattr(seed_response, "encoding", None):
-            seed_response.encoding = "utf-8"
-        seed_html_text = seed_response.text
-        seed_soup_object = BeautifulSoup(seed_html_text, "html.parser")
+        seed_response = fetch_page(seed_web_address)
+        seed_html_text = seed_response.text  # charset already sniffed by the client
+        seed_page = parse_html(seed_html_text, parser_backend, link_context_window)
     except Exception as fetch_error:
         print("Failed to fetch seed web address:", fetch_error)
+        if page_fetcher is not None:
+            page_fetcher.close()
+        if page_pool is not None:
+            page_pool.close()
         return None
 
     
-    seed_page_relevance = calculate_relevance_value(topic_keyword_list, seed_soup_object)
+    seed_page_relevance = calculate_relevance_value(topic_keyword_list, seed_page, settings.topic_keyword_matcher)
     depth_of_page[seed_web_address] = 0
 
     start_node = AStarNode(
@@ -71,100 +229,100 @@ def a_star_web_crawl(
     stopped_reason = "unknown"
 
     while frontier_queue and len(visited_web_addresses) < maximum_pages_to_visit:
-        current_node = heapq.heappop(frontier_queue)
-        current_web_address = current_node.web_address
-
-        if current_web_address in visited_web_addresses:
-            continue
-
-        visited_web_addresses.add(current_web_address)
-        search_step_counter += 1
-        print(f"[A*] Exploring page {search_step_counter}: {current_web_address}", flush=True)
-
-        current_depth = depth_of_page.get(current_web_address, 0)
-
-        # ----- Fetch and parse current page -----
-        try:
-            current_response = requests.get(current_web_address, timeout=requests_timeout_seconds)
-            if not getattr(current_response, "encoding", None):
-                current_response.encoding = "utf-8"
-            current_html_text = current_response.text
-            current_soup_object = BeautifulSoup(current_html_text, "html.parser")
-        except Exception as exception_error:
-            print(f"[A*] Skipping unreachable page: {current_web_address} ({exception_error})", flush=True)
-            continue
-
-        
-        if page_contains_phrase(current_soup_object, target_phrase) or find_tgt(target_phrase, current_soup_object):
-            stopped_reason = "goal_found"
-            break
-
-        # ----- CHILD EXPANSION -----
-        all_link_tags_on_page = current_soup_object.find_all("a", href=True)
-        links_considered = 0
-
-        for link_tag in all_link_tags_on_page:
-            if links_considered >= maximum_child_links_per_page:
-                break
-
-            absolute_url = requests.compat.urljoin(current_web_address, link_tag["href"])
-            absolute_url, _fragment = urldefrag(absolute_url)
-
-            if absolute_url in visited_web_addresses:
+        # Pop the best unvisited nodes: one in sequential mode, up to
+        # max_concurrency in concurrent mode
+        batch_web_addresses = []
+        while (frontier_queue and len(batch_web_addresses) < max_concurrency
+               and len(visited_web_addresses) < maximum_pages_to_visit):
+            current_node = heapq.heappop(frontier_queue)
+            if current_node.web_address in visited_web_addresses:
                 continue
-
-            # Stay within domain
-            if not is_within_domain(seed_web_address, absolute_url) and not is_within_domain(seed_web_address, absolute_url):
+            visited_web_addresses.add(current_node.web_address)
+            batch_web_addresses.append(current_node.web_address)
+
+        # ----- Fetch the batch -----
+        if page_fetcher is None:
+            batch_results = []
+            for web_address in batch_web_addresses:
+                try:
+                    batch_results.append((fetch_page(web_address), None))
+                except Exception as fetch_error:
+                    batch_results.append((None, fetch_error))
+        else:
+            batch_results = page_fetcher.fetch_batch(batch_web_addresses)
+
+        # Worker processes parse and score the whole batch at once
+        if page_pool is not None:
+            processed_batch = iter(page_pool.process_batch(
+                [(web_address, response.content, response.encoding)
+                 for web_address, (response, fetch_error) in zip(batch_web_addresses, batch_results)
+                 if fetch_error is None]
+            ))
+
+        # Results are handled in the order they were popped (best-first)
+        for current_web_address, (current_response, fetch_error) in zip(batch_web_addresses, batch_results):
+            search_step_counter += 1
+            print(f"[A*] Exploring page {search_step_counter}: {current_web_address}", flush=True)
+
+            current_depth = depth_of_page.get(current_web_address, 0)
+
+            # ----- Parse current page, check for the goal -----
+            try:
+                if fetch_error is not None:
+                    raise fetch_error
+                if page_pool is None:
+                    goal_found, scored_children = process_page(
+                        current_response.text, current_web_address, settings, skip=visited_web_addresses
+                    )
+                else:
+                    processed, process_error = next(processed_batch)
+                    if process_error is not None:
+                        raise process_error
+                    goal_found, scored_children = processed
+            except Exception as exception_error:
+                print(f"[A*] Skipping unreachable page: {current_web_address} ({exception_error})", flush=True)
                 continue
 
-            # Skip obvious non-HTML
-            if absolute_url.lower().endswith(non_html_extensions):
-                continue
+            if goal_found:
+                stopped_reason = "goal_found"
+                break
 
-            # --- Heuristic scoring ---
+            # ----- CHILD EXPANSION -----
+            links_considered = 0
+            child_depth = current_depth + 1
 
-            
-            topic_relevance_score = estimate_child_relevance_weighted(
-                topic_keyword_list,
-                link_tag,
-                all_link_tags_on_page
-            )
+            for absolute_url, blended_relevance_score in scored_children:
+                if links_considered >= maximum_child_links_per_page:
+                    break
 
-            
-            if phrase_token_list:
-                phrase_relevance_score = estimate_child_relevance_weighted(
-                    phrase_token_list,
-                    link_tag,
-                    all_link_tags_on_page
-                )
-            else:
-                phrase_relevance_score = 0.0
+                if absolute_url in visited_web_addresses:
+                    continue
 
             
-            blended_relevance_score = (
-                0.3 * float(topic_relevance_score)
-                + 0.7 * float(phrase_relevance_score)
-            )
-
-            child_depth = current_depth + 1
+                child_cumulative_relevance = -depth_penalty_per_level * float(child_depth)
 
             
-            child_cumulative_relevance = -depth_penalty_per_level * float(child_depth)
+                child_heuristic_relevance = blended_relevance_score
 
-            
-            child_heuristic_relevance = blended_relevance_score
+                child_node = AStarNode(
+                    web_address=absolute_url,
+                    cumulative_relevance=child_cumulative_relevance,
+                    heuristic_relevance=child_heuristic_relevance
+                )
 
-            child_node = AStarNode(
-                web_address=absolute_url,
-                cumulative_relevance=child_cumulative_relevance,
-                heuristic_relevance=child_heuristic_relevance
-            )
+                if absolute_url not in parent_web_address:
+                    parent_web_address[absolute_url] = current_web_address
+                    depth_of_page[absolute_url] = child_depth
+                    heapq.heappush(frontier_queue, child_node)
+                    links_considered += 1
+
+        if stopped_reason == "goal_found":
+            break
 
-            if absolute_url not in parent_web_address:
-                parent_web_address[absolute_url] = current_web_address
-                depth_of_page[absolute_url] = child_depth
-                heapq.heappush(frontier_queue, child_node)
-                links_considered += 1
+    if page_fetcher is not None:
+        page_fetcher.close()
+    if page_pool is not None:
+        page_pool.close()
 
     # ----- Determine stop reason -----
     if not frontier_queue and stopped_reason == "unknown" and len(visited_web_addresses) < maximum_pages_to_visit:
@@ -186,6 +344,7 @@ def a_star_web_crawl(
         print("Stop reason            :", stopped_reason)
         print("Pages visited          :", len(visited_web_addresses))
         print("Time taken             : {:.2f} seconds".format(end_time_seconds - start_time_seconds))
+        print_fetch_stats(http_client)
         print("\nA* path from seed to target:")
         for path_step in path_from_seed_to_target:
             print("  ", path_step)
@@ -195,4 +354,5 @@ def a_star_web_crawl(
     print("Stop reason            :", stopped_reason)
     print("Pages visited          :", len(visited_web_addresses))
     print("Time taken             : {:.2f} seconds".format(end_time_seconds - start_time_seconds))
+    print_fetch_stats(http_client)
     return None
\ No newline at end of file
@@ -1,21 +1,25 @@
 ﻿import re
+import sys
 import requests
-import unicodedata 
+from pathlib import Path
 
-def calculate_relevance_value(topic_keyword_list, soup_object):
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # repo root, for common/
+from common.keyword_matcher import KeywordMatcher
+from common.text_normalization import TargetPhrase, contains_arabic, fold_arabic, fold_plain, normalize_arabic_text
+
+def calculate_relevance_value(topic_keyword_list, soup_object, keyword_matcher=None):
+    # keyword_matcher: KeywordMatcher over the cleaned topic words, compiled once per crawl
     if soup_object is None:
         return 0
 
     page_text = soup_object.get_text(separator=" ", strip=True).lower()
-    relevance_score = 0
 
-    for topic_word in topic_keyword_list:
-        cleaned_topic_word = topic_word.strip().lower()
-        if not cleaned_topic_word:
-            continue
+    if keyword_matcher is None:
+        cleaned_topic_words = [topic_word.strip().lower() for topic_word in topic_keyword_list]
+        keyword_matcher = KeywordMatcher([word for word in cleaned_topic_words if word])
 
-        
-        relevance_score += page_text.count(cleaned_topic_word)
+    # Every topic word counted in one pass over the page text
+    relevance_score = keyword_matcher.total(page_text)
 
     return relevance_score
 
@@ -32,41 +36,21 @@ class AStarNode:
         return self.total_relevance > other_node.total_relevance
 
 
-def normalize_arabic_text(text):
-    if not text:
-        return ""
-    text = unicodedata.normalize("NFKC", text)
-    # remove Arabic diacritics
-    text = re.sub(r"[\u0617-\u061A\u064B-\u0652]", "", text)
-    # unify common forms
-    text = (text
-            .replace("أ", "ا").replace("إ", "ا").replace("آ", "ا")
-            .replace("ى", "ي").replace("ؤ", "و").replace("ئ", "ي").replace("ة", "ه"))
-    # collapse whitespace
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-def contains_arabic(text):
-    return any('\u0600' <= ch <= '\u06FF' for ch in text or "") #0600 - 06FF is arabic letter range in unicode
-
 def page_contains_phrase(soup_object, target_phrase):
+    # target_phrase: str, or a TargetPhrase folded once per crawl
     if soup_object is None:
         return False
 
-    page_text_raw = soup_object.get_text(separator=" ", strip=True)
-    target_raw = target_phrase or ""
+    if not isinstance(target_phrase, TargetPhrase):
+        target_phrase = TargetPhrase(target_phrase)
 
-    # Decide if we should apply Arabic normalization
-    arabic_mode = contains_arabic(target_raw) or contains_arabic(page_text_raw)
+    # Decide if we should apply Arabic normalization; the page's folded text is
+    # computed once per page (common/text_normalization.py)
+    arabic_mode = target_phrase.has_arabic or soup_object.derived(contains_arabic)
 
     if arabic_mode:
-        page_text = normalize_arabic_text(page_text_raw.lower())
-        target_text = normalize_arabic_text(target_raw.lower())
-    else:
-        page_text = re.sub(r"\s+", " ", page_text_raw).strip().lower()
-        target_text = re.sub(r"\s+", " ", target_raw).strip().lower()
-
-    return target_text in page_text
+        return target_phrase.arabic_form in soup_object.derived(fold_arabic)
+    return target_phrase.plain_form in soup_object.derived(fold_plain)
 
 def extract_anchor_text_map(soup_object, base_web_address):
     anchor_tuples = []
@@ -1,32 +1,52 @@
-def estimate_child_relevance_weighted(topic_keyword_list, link_tag, all_link_tags_on_page):
-    if link_tag is None:
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # repo root, for common/
+from common.keyword_matcher import KeywordMatcher
+
+
+def keyword_links_on_page(topic_keyword_list, all_links_on_page, keyword_matcher=None):
+    # One pass per page and keyword list: (number of links whose anchor text
+    # contains any keyword, ids of those links). The sibling count for any link
+    # is then that number minus the link itself.
+    if keyword_matcher is None:
+        keyword_matcher = KeywordMatcher(topic_keyword_list)
+    matching_link_ids = set()
+    matching_link_count = 0
+    for other_link in all_links_on_page:
+        other_text = other_link.anchor_text.lower()
+        if keyword_matcher.contains_any(other_text):
+            matching_link_ids.add(id(other_link))
+            matching_link_count += 1
+    return matching_link_count, matching_link_ids
+
+
+def estimate_child_relevance_weighted(topic_keyword_list, link, all_links_on_page, keyword_links=None, keyword_matcher=None):
+    # link / all_links_on_page are PageLink objects (common/html_parser.py)
+    # keyword_links: keyword_links_on_page(topic_keyword_list, all_links_on_page),
+    # computed once per page by the caller; computed here when not given
+    # keyword_matcher: KeywordMatcher(topic_keyword_list), compiled once per crawl
+    if link is None:
         return 0
+    if keyword_matcher is None:
+        keyword_matcher = KeywordMatcher(topic_keyword_list)
 
     # Link text matches
-    link_text = link_tag.get_text(separator=" ", strip=True).lower()
-    link_text_matches = sum(link_text.count(word) for word in topic_keyword_list)
+    link_text = link.anchor_text.lower()
+    link_text_matches = keyword_matcher.total(link_text)
 
-    # Surrounding paragraph matches (fallback to closest parent text if no <p>)
-    paragraph_text = ""
-    parent_paragraph = link_tag.find_parent("p")
-    if parent_paragraph:
-        paragraph_text = parent_paragraph.get_text(separator=" ", strip=True).lower()
-    else:
-        parent_block = link_tag.find_parent(["section", "article", "div"])
-        if parent_block:
-            paragraph_text = parent_block.get_text(separator=" ", strip=True).lower()
+    # Surrounding paragraph matches (fallback to closest section/article/div text if no <p>;
+    # words around the anchor when that block is long, see ContextWindow)
+    paragraph_text = link.context_text.lower()
 
-    paragraph_matches = sum(paragraph_text.count(word) for word in topic_keyword_list)
+    paragraph_matches = keyword_matcher.total(paragraph_text)
 
     # Sibling links on the same page that contain any keyword
-    sibling_keyword_links = 0
-    for other_link in all_link_tags_on_page:
-        if other_link is link_tag:
-            continue
-        other_text = other_link.get_text(separator=" ", strip=True).lower()
-        if any(word in other_text for word in topic_keyword_list):
-            sibling_keyword_links += 1
+    if keyword_links is None:
+        keyword_links = keyword_links_on_page(topic_keyword_list, all_links_on_page, keyword_matcher)
+    matching_link_count, matching_link_ids = keyword_links
+    sibling_keyword_links = matching_link_count - (id(link) in matching_link_ids)
 
     
     heuristic_score = (5 * link_text_matches) + (3 * paragraph_matches) + (1 * sibling_keyword_links)
-    return heuristic_score
\ No newline at end of file
+    return heuristic_score
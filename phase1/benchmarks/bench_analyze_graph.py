@@ -0,0 +1,98 @@
+# Benchmark: analyze_graph (best_first/h.py) on 10k-100k-edge graphs
+#
+# Builds synthetic crawl graphs the way save_crawling stores them (page
+# bodies in a BodyStore, link text + surrounding paragraph + body_id on each
+# edge) and scores them with:
+#   - the per-edge loop analyze_graph used before (keyword counted per edge
+#     in link text and paragraph, out-neighbours rebuilt per edge)
+#   - the precomputed counts + NumPy edge arrays of analyze_graph
+# and checks that both return the same scores, in the same order.
+#
+# Usage (from phase1/):
+#   python benchmarks/bench_analyze_graph.py
+
+import random
+import sys
+import time
+from pathlib import Path
+
+import networkx as nx
+
+PHASE1_DIR = Path(__file__).resolve().parents[1]  # .../phase1/
+sys.path.append(str(PHASE1_DIR))
+sys.path.append(str(PHASE1_DIR.parent))  # repo root, for common/
+
+from best_first.h import analyze_graph, calculate_hueristic, get_number_of_links_containing_similar_keyword
+from common.body_store import BodyStore, edge_body, edge_body_key
+from common.keyword_matcher import KeywordMatcher
+
+EDGE_COUNTS = (10_000, 30_000, 100_000)
+OUT_DEGREE = 60
+KEYWORD = "Alumni"
+WORDS = ("faculty research students computer science department course admission alumni "
+         "office hours seminar news events library campus kuwait university").split()
+
+
+def make_graph(number_of_edges, seed=0):
+    rng = random.Random(seed)
+    number_of_pages = number_of_edges // OUT_DEGREE
+    urls = [f"https://www.example.edu/{rng.choice(WORDS)}/{page}" for page in range(number_of_pages * 2)]
+    anchors = [" ".join(rng.choices(WORDS, k=2)).title() for _ in range(300)]
+    paragraphs = [" ".join(rng.choices(WORDS, k=25)) for _ in range(2000)]
+    store = BodyStore()
+    graph = nx.DiGraph(body_store=store)
+    for page in range(number_of_pages):
+        src = urls[page]
+        body_id = store.add(f"<html><body>{' '.join(rng.choices(WORDS, k=800))}</body></html>")
+        graph.add_node(src, body_id=body_id)
+        for target in rng.sample(urls, OUT_DEGREE):
+            if target != src:
+                graph.add_edge(src, target, link_text=rng.choice(anchors),
+                               surrounding_paragraph=rng.choice(paragraphs), body_id=body_id)
+    return graph
+
+
+def old_analyze_graph(graph, keyword):
+    # Per-edge loop as it was (distinct bodies already counted once)
+    heuristic_scores = {}
+    keyword_matcher = KeywordMatcher([keyword.lower()])
+    body_counts = {}
+    for u, v, data in graph.edges(data=True):
+        link_text = data.get('link_text', '') or ''
+        surrounding_paragraph = data.get('surrounding_paragraph', '') or ''
+        body_key = edge_body_key(graph, data, v, u)
+        occr_goal_key_in_link_text = keyword_matcher.total(link_text.lower())
+        occr_in_surr_paragraph = keyword_matcher.total(surrounding_paragraph.lower())
+        if body_key not in body_counts:
+            body = edge_body(graph, data, v, u, lower=True)
+            body_counts[body_key] = keyword_matcher.total(body) if body else 0
+        occr_in_body = body_counts[body_key]
+        neighbors_of_u = [nbr for _, nbr in graph.out_edges(u)]
+        number_of_links_containing_similar_keyword = get_number_of_links_containing_similar_keyword(neighbors_of_u, keyword)
+        score = calculate_hueristic(occr_goal_key_in_link_text, occr_in_surr_paragraph, occr_in_body,
+                                    number_of_links_containing_similar_keyword)
+        prev = heuristic_scores.get(v, float('-inf'))
+        heuristic_scores[v] = max(prev, score)
+    return heuristic_scores
+
+
+def timed(function, *args):
+    stime = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - stime, result
+
+
+def run():
+    print(f"=== analyze_graph (out-degree {OUT_DEGREE}, keyword {KEYWORD!r}) ===")
+    print(f"{'edges':>8} {'per-edge s':>11} {'arrays s':>9} {'speedup':>8} {'same scores':>12}")
+    for number_of_edges in EDGE_COUNTS:
+        graph = make_graph(number_of_edges)
+        old_seconds, old_scores = timed(old_analyze_graph, graph, KEYWORD)
+        new_seconds, new_scores = timed(analyze_graph, graph, KEYWORD)
+        same = list(old_scores.items()) == list(new_scores.items())
+        print(f"{graph.number_of_edges():>8} {old_seconds:>11.3f} {new_seconds:>9.3f} "
+              f"{old_seconds / new_seconds:>7.1f}x {'yes' if same else 'NO':>12}")
+
+
+if __name__ == "__main__":
+    run()
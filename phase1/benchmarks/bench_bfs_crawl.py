@@ -0,0 +1,80 @@
+# Benchmark: sequential vs concurrent BFS levels in save_crawling (best_first/crawler_graph.py)
+#
+# A local server stands in for a university site: SITE_PAGES pages, each
+# linking to LINKS_PER_PAGE others (plus a shared nav bar), answering after
+# PAGE_LATENCY_SECONDS. Every run builds the depth-2 graph from the same seed
+# and must produce exactly the graph of the sequential build: same nodes and
+# edges, in the same order, with the same edge attributes. Pages are cached in
+# a temporary response cache, not the repo's .http_cache/.
+#
+# Usage (from phase1/):
+#   python benchmarks/bench_bfs_crawl.py
+
+import contextlib
+import sys
+import time
+from pathlib import Path
+
+PHASE1_DIR = Path(__file__).resolve().parents[1]  # .../phase1/
+sys.path.append(str(PHASE1_DIR))
+sys.path.append(str(PHASE1_DIR.parent))  # repo root, for common/ and the shared benchmarks/local_site.py
+
+from best_first import crawler_graph
+from best_first.crawler_graph import save_crawling
+from benchmarks.local_site import PageHandler, client_cache, local_site, page_number, temporary_cache
+
+SITE_PAGES = 400
+LINKS_PER_PAGE = 12
+NAV_PAGES = 8
+PAGE_LATENCY_SECONDS = 0.05
+MAX_DEPTH = 2
+WORKER_COUNTS = (1, 4, 8, 16)
+
+
+def page_html(page_number):
+    nav = "".join(f'<li><a href="/page/{i}">section {i}</a></li>' for i in range(NAV_PAGES))
+    links = "".join(
+        f'<p>department news {child} <a href="/page/{child}/">faculty page {child}</a> and more</p>'
+        for child in ((page_number * LINKS_PER_PAGE + 7 * k + 1) % SITE_PAGES for k in range(LINKS_PER_PAGE))
+    )
+    return (f"<html><body><nav><ul>{nav}</ul></nav><h1>Page {page_number}</h1>{links}"
+            f'<a href="mailto:office@example.org">office</a><a href="#top">top</a></body></html>')
+
+
+class SiteHandler(PageHandler):
+    latency_seconds = PAGE_LATENCY_SECONDS
+
+    def page(self, path):
+        return page_html(page_number(path) % SITE_PAGES)
+
+
+@contextlib.contextmanager
+def crawl_cache():
+    # save_crawling fetches through crawler_graph's module-level client
+    with temporary_cache() as cache, client_cache(crawler_graph._client, cache):
+        yield cache
+
+
+def graph_signature(graph):
+    return list(graph.nodes()), list(graph.edges(data=True))
+
+
+def run():
+    print(f"=== save_crawling depth {MAX_DEPTH} ({PAGE_LATENCY_SECONDS * 1000:.0f} ms/page server latency) ===")
+    print(f"{'max_workers':>12} {'seconds':>8} {'nodes':>6} {'edges':>6} {'speedup':>8} {'same graph':>11}")
+    with local_site(SiteHandler, "/page/0") as seed_url, crawl_cache():
+        reference = sequential_seconds = None
+        for max_workers in WORKER_COUNTS:
+            stime = time.perf_counter()
+            graph = save_crawling(seed_url, max_depth=MAX_DEPTH, same_domain=True, delay_sec=0.0,
+                                  max_workers=max_workers, per_host_concurrency=max_workers)
+            seconds = time.perf_counter() - stime
+            signature = graph_signature(graph)
+            reference = reference or signature
+            sequential_seconds = sequential_seconds or seconds
+            print(f"{max_workers:>12} {seconds:>8.2f} {graph.number_of_nodes():>6} {graph.number_of_edges():>6} "
+                  f"{sequential_seconds / seconds:>7.1f}x {'yes' if signature == reference else 'NO':>11}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,107 @@
+# Benchmark: page bodies on every edge vs the content-addressed body store
+#
+# Builds a depth-1 graph of a local university-like site (pages of ~30 KiB
+# with LINKS_PER_PAGE links each) with save_crawling, then compares it with
+# the same graph in the previous layout, the page's HTML as a `body`
+# attribute on each edge (one shared string per page, as create_graph used
+# to store it):
+#   - pickle size
+#   - peak memory to load the pickle
+#   - analyze_graph / check_similarity time, and identical results
+# Pages are cached in a temporary response cache, not the repo's .http_cache/.
+#
+# Usage (from phase1/):
+#   python benchmarks/bench_body_store.py
+
+import contextlib
+import io
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PHASE1_DIR = Path(__file__).resolve().parents[1]  # .../phase1/
+sys.path.append(str(PHASE1_DIR))
+sys.path.append(str(PHASE1_DIR.parent))  # repo root, for common/ and the shared benchmarks/local_site.py
+
+from best_first.crawler_graph import save_crawling
+from best_first.h import analyze_graph
+from best_first.prog import check_similarity
+from benchmarks.bench_bfs_crawl import crawl_cache
+from benchmarks.local_site import PageHandler, local_site, page_number
+
+SITE_PAGES = 120
+LINKS_PER_PAGE = 150
+KEYWORD = "Alumni"
+WORDS = ("faculty research students computer science department course admission alumni "
+         "office hours seminar news events library campus kuwait university").split()
+
+
+def page_html(page_number):
+    rng = random.Random(page_number)
+    links = "".join(
+        f'<p>{" ".join(rng.choices(WORDS, k=20))} <a href="/page/{rng.randrange(SITE_PAGES)}">'
+        f'{" ".join(rng.choices(WORDS, k=3))}</a> {" ".join(rng.choices(WORDS, k=12))}</p>'
+        for _ in range(LINKS_PER_PAGE)
+    )
+    return f"<html><body><h1>Page {page_number}</h1>{links}</body></html>"
+
+
+class SiteHandler(PageHandler):
+    def page(self, path):
+        return page_html(page_number(path) % SITE_PAGES)
+
+
+def legacy_layout(graph):
+    # Previous format: the page's HTML on each of its out-edges, no store
+    legacy = graph.copy()
+    store = legacy.graph.pop("body_store")
+    bodies = {}
+    for u, v, data in legacy.edges(data=True):
+        body_id = data.pop("body_id")
+        if body_id not in bodies:
+            bodies[body_id] = store.get(body_id)
+        data["body"] = bodies[body_id]
+    for _, data in legacy.nodes(data=True):
+        data.pop("body_id", None)
+    return legacy
+
+
+def load_peak(blob):
+    tracemalloc.start()
+    graph = pickle.loads(blob)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return graph, peak
+
+
+def timed(function, *args):
+    stime = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - stime, result
+
+
+def run():
+    with local_site(SiteHandler, "/page/0") as seed_url, crawl_cache():
+        graph = save_crawling(seed_url, max_depth=1, same_domain=True, max_workers=8)
+    edges = graph.number_of_edges()
+    print(f"=== Body store ({graph.number_of_nodes()} nodes, {edges} edges, "
+          f"{edges / max(len(graph.graph['body_store']), 1):.0f} edges per stored body) ===")
+    print(f"{'layout':>14} {'pickle KiB':>11} {'load peak KiB':>14} {'analyze s':>10} {'similarity s':>13}")
+    results = []
+    for name, layout in (("body on edges", legacy_layout(graph)), ("body store", graph)):
+        blob = pickle.dumps(layout)
+        loaded, peak = load_peak(blob)
+        analyze_seconds, heuristic = timed(analyze_graph, loaded, KEYWORD)
+        with contextlib.redirect_stdout(io.StringIO()):  # check_top_k prints its ranking
+            similarity_seconds, similar = timed(check_similarity, loaded, KEYWORD, heuristic)
+        results.append((heuristic, similar))
+        print(f"{name:>14} {len(blob) / 1024:>11.0f} {peak / 1024:>14.0f} {analyze_seconds:>10.3f} "
+              f"{similarity_seconds:>13.3f}")
+    print("same results:", results[0] == results[1])
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,167 @@
+# Benchmark: networkx DiGraph vs CompactGraph (best_first/compact_graph.py)
+#
+# Streams synthetic crawl edges shaped like save_crawling's (out-degree 60,
+# link text + surrounding paragraph + body_id on each edge, bodies in a
+# BodyStore) into a DiGraph and into a CompactGraphBuilder and compares:
+#   - memory of the graph structure per edge (tracemalloc; the URL, text and
+#     body objects are shared by both and not counted) and pickle size
+#   - traversal: BFS over successors(), edges(data=True), analyze_graph,
+#     check_similarity and greedy_best_first_search, which must give the
+#     same results on both
+# The largest size is built as a CompactGraph only.
+#
+# Usage (from phase1/):
+#   python benchmarks/bench_compact_graph.py
+
+import contextlib
+import gc
+import io
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+import networkx as nx
+
+PHASE1_DIR = Path(__file__).resolve().parents[1]  # .../phase1/
+sys.path.append(str(PHASE1_DIR))
+sys.path.append(str(PHASE1_DIR.parent))  # repo root, for common/
+
+from best_first.compact_graph import CompactGraphBuilder
+from best_first.cp_h_sample import greedy_best_first_search
+from best_first.h import analyze_graph
+from best_first.prog import check_similarity
+from common.body_store import BodyStore
+
+MEMORY_EDGE_COUNTS = (100_000, 300_000)
+COMPACT_ONLY_EDGE_COUNT = 1_000_000
+TRAVERSAL_EDGE_COUNT = 300_000
+OUT_DEGREE = 60
+KEYWORD = "Alumni"
+WORDS = ("faculty research students computer science department course admission alumni "
+         "office hours seminar news events library campus kuwait university").split()
+
+
+class Site:
+    # URLs, anchors, paragraphs and page bodies, made before anything is measured
+    def __init__(self, number_of_edges, seed=0):
+        rng = random.Random(seed)
+        self.number_of_pages = number_of_edges // OUT_DEGREE
+        self.urls = [f"https://www.example.edu/{rng.choice(WORDS)}/{page}" for page in range(self.number_of_pages * 2)]
+        self.anchors = [" ".join(rng.choices(WORDS, k=2)).title() for _ in range(300)]
+        self.paragraphs = [" ".join(rng.choices(WORDS, k=25)) for _ in range(2000)]
+        self.store = BodyStore()
+        self.body_ids = [self.store.add(f"<html><body>{' '.join(rng.choices(WORDS, k=200))} {page}</body></html>")
+                         for page in range(self.number_of_pages)]
+        self.seed = seed
+
+    def pages(self):
+        # (url, body_id, [(target, link_text, paragraph), ...]) per crawled page
+        rng = random.Random(self.seed + 1)
+        for page in range(self.number_of_pages):
+            src = self.urls[page]
+            links = [(target, rng.choice(self.anchors), rng.choice(self.paragraphs))
+                     for target in rng.sample(self.urls, OUT_DEGREE) if target != src]
+            yield src, self.body_ids[page], links
+
+
+def build_networkx(site):
+    graph = nx.DiGraph(body_store=site.store)
+    for src, body_id, links in site.pages():
+        graph.add_node(src, body_id=body_id)
+        for target, link_text, paragraph in links:
+            graph.add_edge(src, target, link_text=link_text, surrounding_paragraph=paragraph, body_id=body_id)
+    return graph
+
+
+def build_compact(site):
+    builder = CompactGraphBuilder({"body_store": site.store})
+    for src, body_id, links in site.pages():
+        builder.add_node(src, body_id=body_id)
+        for target, link_text, paragraph in links:
+            builder.add_edge(src, target, link_text, paragraph, body_id)
+    return builder.build()
+
+
+def measured(build, site):
+    # Memory held by the built graph (allocations made while building that are still alive)
+    gc.collect()
+    tracemalloc.start()
+    graph = build(site)
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return graph, held
+
+
+def bfs(graph, start):
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        for nbr in graph.successors(queue.popleft()):
+            if nbr not in seen:
+                seen.add(nbr)
+                queue.append(nbr)
+    return len(seen)
+
+
+def edge_pass(graph):
+    return sum(len(data.get("link_text") or "") for _, _, data in graph.edges(data=True))
+
+
+def timed(function, *args):
+    stime = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # check_top_k prints its ranking
+        result = function(*args)
+    return time.perf_counter() - stime, result
+
+
+def memory_table():
+    print(f"=== Memory (out-degree {OUT_DEGREE}) ===")
+    print(f"{'edges':>9} {'layout':>8} {'build s':>8} {'MiB':>8} {'B/edge':>7} {'pickle B/edge':>14}")
+    for number_of_edges, layouts in [(count, ("networkx", "compact")) for count in MEMORY_EDGE_COUNTS] + \
+                                    [(COMPACT_ONLY_EDGE_COUNT, ("compact",))]:
+        site = Site(number_of_edges)
+        for layout in layouts:
+            stime = time.perf_counter()
+            graph, held = measured(build_networkx if layout == "networkx" else build_compact, site)
+            build_seconds = time.perf_counter() - stime
+            edges = graph.number_of_edges()
+            pickle_bytes = len(pickle.dumps(graph, protocol=pickle.HIGHEST_PROTOCOL)) - len(pickle.dumps(site.store))
+            print(f"{edges:>9} {layout:>8} {build_seconds:>8.1f} {held / 2**20:>8.1f} {held / edges:>7.0f} "
+                  f"{pickle_bytes / edges:>14.0f}")
+            del graph
+
+
+def traversal_table():
+    site = Site(TRAVERSAL_EDGE_COUNT)
+    graphs = {"networkx": build_networkx(site), "compact": build_compact(site)}
+    heuristic = analyze_graph(graphs["networkx"], KEYWORD)
+    start = next(node for node in graphs["networkx"] if node in heuristic and graphs["networkx"].out_degree(node))
+    tasks = (
+        ("BFS successors", lambda graph: bfs(graph, start)),
+        ("edges(data=True)", edge_pass),
+        ("analyze_graph", lambda graph: list(analyze_graph(graph, KEYWORD).items())),
+        ("check_similarity", lambda graph: check_similarity(graph, KEYWORD, heuristic)),
+        ("greedy search", lambda graph: greedy_best_first_search(graph, start, KEYWORD, heuristic)),
+    )
+    print(f"\n=== Traversal ({graphs['compact'].number_of_nodes()} nodes, "
+          f"{graphs['compact'].number_of_edges()} edges) ===")
+    print(f"{'task':>18} {'networkx s':>11} {'compact s':>10} {'ratio':>7} {'same result':>12}")
+    for name, task in tasks:
+        (nx_seconds, nx_result), (compact_seconds, compact_result) = (timed(task, graphs[layout])
+                                                                      for layout in ("networkx", "compact"))
+        print(f"{name:>18} {nx_seconds:>11.3f} {compact_seconds:>10.3f} {nx_seconds / compact_seconds:>6.2f}x "
+              f"{'yes' if nx_result == compact_result else 'NO':>12}")
+
+
+def run():
+    memory_table()
+    traversal_table()
+
+
+if __name__ == "__main__":
+    run()
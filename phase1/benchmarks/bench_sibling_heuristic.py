@@ -0,0 +1,87 @@
+# Benchmark: estimate_child_relevance_weighted on pages with many links
+#
+# Scores every link of a synthetic directory-style page twice (topic keywords
+# and phrase tokens), as AStarCrawler does, with:
+#   - the old per-link sibling loop (anchor text of every other link, O(L^2))
+#   - keyword_links_on_page once per page + O(1) sibling counts
+# and checks that every score is identical.
+#
+# Usage (from phase1/):
+#   python benchmarks/bench_sibling_heuristic.py
+
+import random
+import sys
+import time
+from pathlib import Path
+
+PHASE1_DIR = Path(__file__).resolve().parents[1]  # .../phase1/
+sys.path.append(str(PHASE1_DIR))
+sys.path.append(str(PHASE1_DIR.parent))  # repo root, for common/
+
+from AStar.AStarHeuristicFunction import estimate_child_relevance_weighted, keyword_links_on_page
+from common.html_parser import parse_html
+from common.keyword_matcher import KeywordMatcher
+
+LINK_COUNTS = (100, 500, 1000, 2000)
+TOPIC_KEYWORDS = ["faculty", "research", "computer", "science"]
+PHRASE_TOKENS = ["abeer", "alsafran"]
+WORDS = "faculty research students computer science department course admission staff office".split()
+
+
+def make_page(number_of_links, seed=0):
+    rng = random.Random(seed)
+    rows = "".join(
+        f'<p>{" ".join(rng.choices(WORDS, k=8))} <a href="/people/{i}">{" ".join(rng.choices(WORDS, k=2))}</a></p>'
+        for i in range(number_of_links)
+    )
+    return f"<html><body><div>{rows}</div></body></html>"
+
+
+def old_estimate(topic_keyword_list, link, all_links_on_page):
+    # Sibling count as it was: every other link's anchor text, per scored link
+    link_text = link.anchor_text.lower()
+    link_text_matches = sum(link_text.count(word) for word in topic_keyword_list)
+    paragraph_text = link.context_text.lower()
+    paragraph_matches = sum(paragraph_text.count(word) for word in topic_keyword_list)
+    sibling_keyword_links = 0
+    for other_link in all_links_on_page:
+        if other_link is link:
+            continue
+        other_text = other_link.anchor_text.lower()
+        if any(word in other_text for word in topic_keyword_list):
+            sibling_keyword_links += 1
+    return (5 * link_text_matches) + (3 * paragraph_matches) + (1 * sibling_keyword_links)
+
+
+def score_old(links):
+    return [(old_estimate(TOPIC_KEYWORDS, link, links), old_estimate(PHRASE_TOKENS, link, links)) for link in links]
+
+
+def score_new(links):
+    topic_matcher, phrase_matcher = KeywordMatcher(TOPIC_KEYWORDS), KeywordMatcher(PHRASE_TOKENS)
+    topic_keyword_links = keyword_links_on_page(TOPIC_KEYWORDS, links, topic_matcher)
+    phrase_keyword_links = keyword_links_on_page(PHRASE_TOKENS, links, phrase_matcher)
+    return [(estimate_child_relevance_weighted(TOPIC_KEYWORDS, link, links, topic_keyword_links, topic_matcher),
+             estimate_child_relevance_weighted(PHRASE_TOKENS, link, links, phrase_keyword_links, phrase_matcher))
+            for link in links]
+
+
+def timed(function, links):
+    stime = time.perf_counter()
+    scores = function(links)
+    return time.perf_counter() - stime, scores
+
+
+def run():
+    print("=== Sibling-link heuristic (every link scored for topic + phrase) ===")
+    print(f"{'links':>6} {'per-link loop s':>16} {'per-page count s':>17} {'speedup':>8} {'same scores':>12}")
+    for number_of_links in LINK_COUNTS:
+        links = parse_html(make_page(number_of_links)).links()
+        old_seconds, old_scores = timed(score_old, links)
+        new_seconds, new_scores = timed(score_new, links)
+        print(f"{number_of_links:>6} {old_seconds:>16.3f} {new_seconds:>17.4f} {old_seconds / new_seconds:>7.0f}x "
+              f"{str(old_scores == new_scores):>12}")
+
+
+if __name__ == "__main__":
+    run()
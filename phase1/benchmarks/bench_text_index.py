@@ -0,0 +1,75 @@
+# Benchmark: goal resolution in check_similarity, full scan vs GraphTextIndex
+#
+# Uses a synthetic crawl graph (bench_analyze_graph.make_graph: page bodies in
+# a BodyStore, link text + paragraph on every edge) of about the size of a
+# depth-2 crawl, builds the text index once, saves and reloads it next to the
+# pickled graph (checked by the cheap signature, and with verify=True by the
+# full fingerprint), then resolves a set of goal descriptions (single words,
+# phrases, URL pieces, absent names) with the scan and with the index. Both
+# must return the same goal node.
+#
+# Usage (from phase1/):
+#   python benchmarks/bench_text_index.py
+
+import contextlib
+import io
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PHASE1_DIR = Path(__file__).resolve().parents[1]  # .../phase1/
+sys.path.append(str(PHASE1_DIR))
+
+from best_first.h import analyze_graph
+from best_first.prog import check_similarity
+from best_first.text_index import GraphTextIndex, index_path_for
+from benchmarks.bench_analyze_graph import make_graph
+
+EDGES = 30_000
+QUERIES = ("Alumni", "office hours", "kuwait university news", "library/12", "Hamid Alhamadi",
+           "campus  events", "science department course")
+
+
+def resolve(graph, query, heuristic, text_index=None):
+    with contextlib.redirect_stdout(io.StringIO()):  # check_top_k prints its ranking
+        stime = time.perf_counter()
+        goal = check_similarity(graph, query, heuristic, text_index)
+        return time.perf_counter() - stime, goal
+
+
+def run():
+    graph = make_graph(EDGES)
+    print(f"=== Goal resolution ({graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges) ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        graph_path = Path(directory) / "crawled_graph.gpickle"
+        with open(graph_path, "wb") as f:
+            pickle.dump(graph, f)
+
+        stime = time.perf_counter()
+        GraphTextIndex.for_graph(graph, graph_path)
+        build_seconds = time.perf_counter() - stime
+        stime = time.perf_counter()
+        text_index = GraphTextIndex.for_graph(graph, graph_path)
+        load_seconds = time.perf_counter() - stime
+        stime = time.perf_counter()
+        verified = GraphTextIndex.load(index_path_for(graph_path), graph, graph_path, verify=True)
+        verify_seconds = time.perf_counter() - stime
+        print(f"index: built + saved in {build_seconds:.2f} s, loaded in {load_seconds:.2f} s "
+              f"({verify_seconds:.2f} s with verify=True{'' if verified is not None else ', REJECTED'}), "
+              f"{index_path_for(graph_path).stat().st_size / 1024:.0f} KiB "
+              f"(graph pickle {graph_path.stat().st_size / 1024:.0f} KiB)")
+
+    print(f"{'query':>28} {'scan ms':>9} {'index ms':>9} {'speedup':>8} {'same goal':>10}")
+    for query in QUERIES:
+        heuristic = analyze_graph(graph, query)
+        scan_seconds, scan_goal = resolve(graph, query, heuristic)
+        index_seconds, index_goal = resolve(graph, query, heuristic, text_index)
+        print(f"{query!r:>28} {1000 * scan_seconds:>9.1f} {1000 * index_seconds:>9.2f} "
+              f"{scan_seconds / index_seconds:>7.0f}x {'yes' if scan_goal == index_goal else 'NO':>10}")
+
+
+if __name__ == "__main__":
+    run()
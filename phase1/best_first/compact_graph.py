@@ -0,0 +1,313 @@
+import sys
+from array import array
+from collections.abc import Hashable
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # repo root, for common/
+from common.body_store import BodyStore
+
+# -----------------------------
+# Compact crawl graph
+# -----------------------------
+# A networkx DiGraph keeps every URL as a node key and a Python dict of
+# attributes per edge, kilobytes per edge once the adjacency dicts are
+# counted. CompactGraph holds the same crawl in a few arrays:
+#
+#   urls              node id -> URL (each URL interned once)
+#   indptr, indices   CSR adjacency: the targets of node i are
+#                     indices[indptr[i]:indptr[i + 1]], in insertion order
+#   link_text_ids,    per edge, an id into one table of distinct strings
+#   paragraph_ids     (-1: attribute missing)
+#   body_ids          per edge, an id into the table of body_ids of the
+#                     graph's BodyStore (-1: none)
+#
+# Node and edge order match the DiGraph built the same way, so everything
+# that walks the graph sees the same sequence. CompactGraph answers the part
+# of the networkx API the best-first pipeline uses (nodes(), nodes.get(),
+# edges(nbunch, data=True), successors(), graph[u], number_of_edges(),
+# graph.graph, ...), so analyze_graph, check_similarity, GraphTextIndex and
+# greedy_best_first_search run on it unchanged. Edge data dicts are built
+# on the fly and are read-only views: the graph is immutable once built.
+#
+# Build one with CompactGraphBuilder (edge by edge or subgraph by subgraph,
+# as save_crawling(..., compact=True) does) or CompactGraph.from_networkx.
+
+NO_ID = -1
+EDGE_TEXT_ATTRIBUTES = ("link_text", "surrounding_paragraph")
+
+
+class CompactGraphBuilder:
+    """Collects nodes and edges in arrays; build() returns the CompactGraph."""
+
+    def __init__(self, graph_attributes=None):
+        self.graph_attributes = dict(graph_attributes or {})
+        self._node_ids = {}
+        self.urls = []
+        self.node_data = {}  # node id -> attribute dict, only for nodes that have attributes
+        self._string_ids = {}
+        self.strings = []
+        self._body_id_ids = {}
+        self.body_id_table = []
+        self._sources = array("i")
+        self._targets = array("i")
+        self._columns = {attribute: array("i") for attribute in EDGE_TEXT_ATTRIBUTES}
+        self._body_ids = array("i")
+
+    def add_node(self, url, **attributes):
+        node_id = self._node_ids.get(url)
+        if node_id is None:
+            node_id = self._node_ids[url] = len(self.urls)
+            self.urls.append(url)
+        if attributes:
+            self.node_data.setdefault(node_id, {}).update(attributes)
+        return node_id
+
+    def add_edge(self, u, v, link_text=None, surrounding_paragraph=None, body_id=None, body=None):
+        # body: a legacy page body, moved into the graph's BodyStore
+        if body and body_id is None:
+            body_id = self._body_store().add(body)
+        self._sources.append(self.add_node(u))
+        self._targets.append(self.add_node(v))
+        self._columns["link_text"].append(self._string_id(link_text))
+        self._columns["surrounding_paragraph"].append(self._string_id(surrounding_paragraph))
+        self._body_ids.append(self._body_id_id(body_id))
+
+    def add_graph(self, graph):
+        """Merge a networkx graph: add_nodes_from(nodes(data=True)) + add_edges_from(edges(data=True))."""
+        for node, data in graph.nodes(data=True):
+            self.add_node(node, **data)
+        for u, v, data in graph.edges(data=True):
+            self.add_edge(u, v, data.get("link_text"), data.get("surrounding_paragraph"),
+                          data.get("body_id"), data.get("body"))
+        for key, value in graph.graph.items():
+            self.graph_attributes.setdefault(key, value)
+
+    def build(self):
+        sources, targets = _int_array(self._sources), _int_array(self._targets)
+        columns = [_int_array(values) for values in (*self._columns.values(), self._body_ids)]
+        kept = _merge_repeated_edges(sources, targets, columns)
+        if kept is not None:
+            sources, targets = sources[kept], targets[kept]
+            columns = [values[kept] for values in columns]
+
+        order = np.argsort(sources, kind="stable")  # grouped by source, insertion order within
+        indptr = np.zeros(len(self.urls) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(self.urls)), out=indptr[1:])
+        link_text_ids, paragraph_ids, body_ids = (values[order] for values in columns)
+        return CompactGraph(self.urls, indptr, targets[order], link_text_ids, paragraph_ids, body_ids,
+                            self.strings, self.body_id_table, self.node_data, self.graph_attributes)
+
+    def _string_id(self, text):
+        if text is None:
+            return NO_ID
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = self._string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def _body_id_id(self, body_id):
+        if body_id is None:
+            return NO_ID
+        index = self._body_id_ids.get(body_id)
+        if index is None:
+            index = self._body_id_ids[body_id] = len(self.body_id_table)
+            self.body_id_table.append(body_id)
+        return index
+
+    def _body_store(self):
+        return self.graph_attributes.setdefault("body_store", BodyStore())
+
+
+def _int_array(values):
+    return np.array(values, dtype=np.int32) if values else np.empty(0, dtype=np.int32)
+
+
+def _merge_repeated_edges(sources, targets, columns):
+    # A repeated (u, v) updates the first one, as add_edge does on a DiGraph:
+    # attributes given again replace the old ones. Returns the positions of
+    # the edges to keep, or None when no edge repeats (the usual crawl).
+    keys = sources.astype(np.int64) << 32 | targets
+    unique_keys, first = np.unique(keys, return_index=True)
+    if len(unique_keys) == len(keys):
+        return None
+    first_of_key = dict(zip(unique_keys.tolist(), first.tolist()))
+    for position in np.flatnonzero(~np.isin(np.arange(len(keys)), first)).tolist():
+        original = first_of_key[int(keys[position])]
+        for values in columns:
+            if values[position] != NO_ID:
+                values[original] = values[position]
+    return np.sort(first)
+
+
+class CompactGraph:
+    """Immutable directed crawl graph on integer ids and CSR arrays (see above)."""
+
+    def __init__(self, urls, indptr, indices, link_text_ids, paragraph_ids, body_ids,
+                 strings, body_id_table, node_data=None, graph_attributes=None):
+        self.urls = urls
+        self.indptr = indptr
+        self.indices = indices
+        self.link_text_ids = link_text_ids
+        self.paragraph_ids = paragraph_ids
+        self.body_ids = body_ids
+        self.strings = strings
+        self.body_id_table = body_id_table
+        self.node_data = node_data or {}
+        self.graph = graph_attributes if graph_attributes is not None else {}
+        self._attach_views()
+
+    @classmethod
+    def from_networkx(cls, graph):
+        builder = CompactGraphBuilder()
+        builder.add_graph(graph)
+        return builder.build()
+
+    # -------- networkx-style queries --------
+    def is_directed(self):
+        return True
+
+    def number_of_nodes(self):
+        return len(self.urls)
+
+    def number_of_edges(self):
+        return len(self.indices)
+
+    def successors(self, url):
+        node_id = self.node_ids[url]
+        urls = self.urls
+        return iter([urls[target] for target in self._targets[self._offsets[node_id]:self._offsets[node_id + 1]].tolist()])
+
+    neighbors = successors
+
+    def out_edges(self, url, data=False):
+        return self.edges(url, data=data)
+
+    def out_degree(self, url):
+        node_id = self.node_ids[url]
+        return self._offsets[node_id + 1] - self._offsets[node_id]
+
+    def __getitem__(self, url):
+        # graph[u]: u's successors (iterating it is all the search needs)
+        return list(self.successors(url))
+
+    def __contains__(self, url):
+        return url in self.node_ids
+
+    def __iter__(self):
+        return iter(self.urls)
+
+    def __len__(self):
+        return len(self.urls)
+
+    def has_edge(self, u, v):
+        if u not in self.node_ids or v not in self.node_ids:
+            return False
+        node_id = self.node_ids[u]
+        return self.node_ids[v] in self._targets[self._offsets[node_id]:self._offsets[node_id + 1]].tolist()
+
+    def to_networkx(self):
+        import networkx as nx
+        graph = nx.DiGraph(**self.graph)
+        graph.add_nodes_from(self.nodes(data=True))
+        graph.add_edges_from(self.edges(data=True))
+        return graph
+
+    # -------- edge data --------
+    def _iter_edges(self, node_ids, data):
+        urls, strings, body_id_table, offsets = self.urls, self.strings, self.body_id_table, self._offsets
+        columns = (self._targets, self._link_text_ids, self._paragraph_ids, self._body_ids)
+        for node_id in node_ids:
+            u = urls[node_id]
+            start, end = offsets[node_id], offsets[node_id + 1]
+            if not data:
+                for target in columns[0][start:end].tolist():
+                    yield u, urls[target]
+                continue
+            for target, link_text_id, paragraph_id, body_id in zip(*(column[start:end].tolist() for column in columns)):
+                attributes = {}
+                if link_text_id != NO_ID:
+                    attributes["link_text"] = strings[link_text_id]
+                if paragraph_id != NO_ID:
+                    attributes["surrounding_paragraph"] = strings[paragraph_id]
+                if body_id != NO_ID:
+                    attributes["body_id"] = body_id_table[body_id]
+                yield u, urls[target], attributes
+
+    def _attach_views(self):
+        # derived from the arrays, rebuilt after unpickling; memoryviews index to plain ints
+        self.node_ids = {url: node_id for node_id, url in enumerate(self.urls)}
+        self._offsets = memoryview(self.indptr)
+        self._targets = memoryview(self.indices)
+        self._link_text_ids = memoryview(self.link_text_ids)
+        self._paragraph_ids = memoryview(self.paragraph_ids)
+        self._body_ids = memoryview(self.body_ids)
+        self.nodes = _NodeView(self)
+        self.edges = _EdgeView(self)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for derived in ("node_ids", "_offsets", "_targets", "_link_text_ids", "_paragraph_ids", "_body_ids",
+                        "nodes", "edges"):
+            state.pop(derived)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._attach_views()
+
+
+class _NodeView:
+    # graph.nodes / graph.nodes(data=True) / graph.nodes[url] / graph.nodes.get(url, default)
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __call__(self, data=False):
+        if not data:
+            return iter(self._graph.urls)
+        node_data = self._graph.node_data
+        return ((url, node_data.get(node_id, {})) for node_id, url in enumerate(self._graph.urls))
+
+    def __iter__(self):
+        return iter(self._graph.urls)
+
+    def __len__(self):
+        return len(self._graph.urls)
+
+    def __contains__(self, url):
+        return url in self._graph.node_ids
+
+    def __getitem__(self, url):
+        return self._graph.node_data.get(self._graph.node_ids[url], {})
+
+    def get(self, url, default=None):
+        node_id = self._graph.node_ids.get(url)
+        if node_id is None:
+            return default
+        return self._graph.node_data.get(node_id, {})
+
+
+class _EdgeView:
+    # graph.edges(data=True) / graph.edges(url, data=True) / len(graph.edges)
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __call__(self, nbunch=None, data=False):
+        graph = self._graph
+        if nbunch is None:
+            node_ids = range(len(graph.urls))
+        elif isinstance(nbunch, Hashable) and nbunch in graph.node_ids:
+            node_ids = [graph.node_ids[nbunch]]
+        else:  # an iterable of nodes (a list or set is not hashable), unknown ones skipped
+            node_ids = [graph.node_ids[url] for url in nbunch if url in graph.node_ids]
+        return graph._iter_edges(node_ids, data)
+
+    def __iter__(self):
+        return self()
+
+    def __len__(self):
+        return len(self._graph.indices)
@@ -27,7 +27,7 @@ class Node:
 # ----------------------------------------------
 # Standard Greedy Best-First Search
 # ----------------------------------------------
-def greedy_best_first_search(graph, start, goal, heuristic):
+def greedy_best_first_search(graph, start, goal, heuristic, text_index=None):
     """
     Perform Greedy Best-First Search using only heuristic values.
 
@@ -36,9 +36,10 @@ def greedy_best_first_search(graph, start, goal, heuristic):
         start: str - starting node
         goal: str - target node
         heuristic: dict - heuristic values for each node
+        text_index: GraphTextIndex of graph (optional) - resolves the goal by index lookup
     """
     # Check if goal can be resolved
-    resolved_goal = check_similarity(graph, goal, heuristic)
+    resolved_goal = check_similarity(graph, goal, heuristic, text_index)
     if not resolved_goal:
         return None # Goal not found in graph
 
@@ -1,11 +1,20 @@
 
+import sys
 import time
 import requests
+from pathlib import Path
 from urllib.parse import urlsplit, urlunsplit, urljoin
-from bs4 import BeautifulSoup
 import networkx as nx
 import matplotlib.pyplot as plt
 import pickle
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # repo root, for common/
+from common.async_fetch import ConcurrentFetcher
+from common.body_store import BodyStore
+from common.html_parser import parse_html
+from common.http_client import HttpClient
+from common.response_cache import default_cache
+from best_first.compact_graph import CompactGraph, CompactGraphBuilder
 # -----------------------------
 # URL normalization utilities
 # -----------------------------
@@ -31,9 +40,18 @@ _DEFAULT_HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; MiniCrawler/1.0; +https://example.org/bot)"
 }
 
-def safe_get(url: str, timeout: int = 10) -> requests.Response | None:
+# Keep-alive connections are reused across every page of a crawl; the client
+# also applies per-host politeness, so a request waits only for the same host,
+# and revalidates pages cached by earlier runs instead of downloading them again
+_client = HttpClient(headers=_DEFAULT_HEADERS, cache=default_cache())
+
+MAX_PAGE_BYTES = 2_000_000
+
+def safe_get(url: str, timeout: int = 10, min_delay: float = 0.0,
+             max_bytes: int | None = MAX_PAGE_BYTES) -> requests.Response | None:
     try:
-        r = requests.get(url, headers=_DEFAULT_HEADERS, timeout=timeout)
+        # Non-HTML responses are dropped from their headers; bodies stop at max_bytes
+        r = _client.get(url, timeout=timeout, min_delay=min_delay, max_bytes=max_bytes, html_only=True)
         r.raise_for_status()
         return r
     except requests.RequestException:
@@ -43,32 +61,39 @@ def safe_get(url: str, timeout: int = 10) -> requests.Response | None:
 # -----------------------------
 # Graph construction
 # -----------------------------
-def create_graph(src: str) -> nx.DiGraph:
+def create_graph(src: str, delay_sec: float = 0.0, body_store: BodyStore | None = None) -> nx.DiGraph:
+    """
+    One page's graph: an edge to every http(s) link with its link text and
+    surrounding paragraph. The page body goes into `body_store` (a new one if
+    None, kept in graph.graph["body_store"]) and node and edges carry its body_id.
+    """
     src = normalize_url(src)
-    graph = nx.DiGraph()
+    graph = nx.DiGraph(body_store=body_store if body_store is not None else BodyStore())
     graph.add_node(src)
 
-    resp = safe_get(src)
+    resp = safe_get(src, min_delay=delay_sec)
     if resp is None:
         return graph
 
-    soup = BeautifulSoup(resp.text, 'html.parser')
+    html = resp.text  # decode once
+    body_id = graph.graph["body_store"].add(html)
+    graph.nodes[src]["body_id"] = body_id
+    page = parse_html(html)
 
-    for a in soup.find_all('a', href=True):
-        full = absolutize_and_normalize(src, a['href'])
+    for link in page.links():
+        full = absolutize_and_normalize(src, link.href)
         # Keep only http(s) and not self-loops
         if not (full.startswith('http://') or full.startswith('https://')):
             continue
         if full == src:
             continue
 
-        link_text = a.get_text(strip=True) or ''
-        p = a.find_parent('p')
-        surrounding_paragraph = p.get_text(' ', strip=True) if p else ''
+        link_text = ''.join(link.anchor_strings)
+        surrounding_paragraph = link.paragraph_text or ''
         graph.add_edge(src, full,
                        link_text=link_text,
                        surrounding_paragraph=surrounding_paragraph,
-                       body=resp.text)
+                       body_id=body_id)
     return graph
 
 
@@ -132,7 +157,10 @@ def save_crawling(src: str,
                   max_depth: int = 1,
                   same_domain: bool = True,
                   delay_sec: float = 0.0,
-                  visualize_each: bool = False) -> nx.DiGraph:
+                  visualize_each: bool = False,
+                  max_workers: int = 1,
+                  per_host_concurrency: int = 4,
+                  compact: bool = False) -> nx.DiGraph | CompactGraph:
     """
     Crawl starting at `src`, expanding links up to `max_depth`, merging subgraphs into a single DiGraph.
     Includes the checks/fixes:
@@ -140,15 +168,38 @@ def save_crawling(src: str,
       - No mutation during iteration (iterate over a snapshot).
       - Draw subgraph using positions computed on the union (avoid 'no position' errors).
       - Skip non-http(s) links and self-loops.
+      - Page bodies stored once, compressed, in graph.graph["body_store"];
+        edges carry a body_id (common/body_store.py).
       - Optional same-domain restriction.
-      - Optional polite delay between requests.
+      - Optional polite delay between requests to the same host (per-host
+        scheduler, also honouring robots.txt Crawl-delay and Retry-After).
+      - Optional concurrent level expansion: with max_workers > 1 all children of
+        a BFS level are fetched in parallel (at most per_host_concurrency per host)
+        and merged in the sequential order by this thread alone, so the graph is
+        identical to the sequential build.
+      - Optional compact result: with compact=True pages are merged into a
+        CompactGraphBuilder instead of a DiGraph and a CompactGraph (integer ids,
+        CSR adjacency; best_first/compact_graph.py) is returned, for crawls too
+        large to hold as a DiGraph. Same nodes, edges and order as the DiGraph.
     Returns the merged graph.
     """
+    if compact and visualize_each:
+        raise ValueError("visualize_each draws the networkx graph; it cannot be used with compact=True")
+
     src = normalize_url(src)
     root_domain = urlsplit(src).netloc
 
-    # Build the initial page graph
-    graph = create_graph(src)
+    # Build the initial page graph; every page body goes into its body store
+    graph = create_graph(src, delay_sec=delay_sec)
+    body_store = graph.graph["body_store"]
+
+    # Compact mode: only the out-links of the frontier are kept outside the builder
+    builder = None
+    if compact:
+        builder = CompactGraphBuilder(graph.graph)
+        builder.add_graph(graph)
+        successors = {src: list(graph.successors(src))}
+        graph = None
 
     # BFS frontier up to max_depth
     visited = {src}
@@ -158,41 +209,65 @@ def save_crawling(src: str,
     # optional: keep a running layout for smooth visualization
     pos = None
 
-    while depth < max_depth and frontier:
-        next_frontier: list[str] = []
-        # iterate over a stable snapshot of nodes in the current frontier
-        for node in list(frontier):
-            # Expand out-edges from this node to get candidate child pages
-            children = [v for _, v in graph.out_edges(node)] # directed graph
-            # children = [v for _, v in graph.edges(node)]
-
-            # Iterate over a stable copy
-            for child in list(children):
-                if child in visited:
-                    continue
-                if same_domain and urlsplit(child).netloc != root_domain:
-                    continue
+    fetcher = None
+    if max_workers > 1:
+        fetcher = ConcurrentFetcher(lambda url: create_graph(url, delay_sec=delay_sec, body_store=body_store),
+                                    max_workers, per_host_concurrency)
 
-                subgraph = create_graph(child)
+    try:
+        while depth < max_depth and frontier:
+            # Children of this level, in the order the sequential crawl visits them.
+            # Out-edges of frontier nodes are final (each page is fetched once), so
+            # the whole level is known before any of it is fetched.
+            next_frontier: list[str] = []
+            for node in list(frontier):
+                # Expand out-edges from this node to get candidate child pages
+                if builder is not None:
+                    children = successors.pop(node)
+                else:
+                    children = [v for _, v in graph.out_edges(node)] # directed graph
+                # children = [v for _, v in graph.edges(node)]
+
+                for child in children:
+                    if child in visited:
+                        continue
+                    if same_domain and urlsplit(child).netloc != root_domain:
+                        continue
+                    visited.add(child)
+                    next_frontier.append(child)
+
+            if fetcher is None:
+                subgraphs = ((create_graph(child, delay_sec=delay_sec, body_store=body_store), None)
+                             for child in next_frontier)
+            else:
+                subgraphs = fetcher.fetch_batch(next_frontier)
+
+            # Single writer: subgraphs are merged one by one, in level order
+            for child, (subgraph, error) in zip(next_frontier, subgraphs):
+                if error is not None:
+                    raise error
+
+                if builder is not None:
+                    builder.add_graph(subgraph)
+                    if depth + 1 < max_depth:  # expanded at the next level
+                        successors[child] = list(subgraph.successors(child))
+                    continue
 
                 # Merge BEFORE optionally visualizing so the union has all nodes
                 graph.add_nodes_from(subgraph.nodes(data=True))
                 graph.add_edges_from(subgraph.edges(data=True))
 
-                visited.add(child)
-                next_frontier.append(child)
-
                 if visualize_each:
                     pos = show_subgraph(graph, subgraph, pos=pos,
                                         title=f"Graph with subgraph from: {child}")
 
-                if delay_sec > 0:
-                    time.sleep(delay_sec)
-
-        frontier = next_frontier
-        depth += 1
+            frontier = next_frontier
+            depth += 1
+    finally:
+        if fetcher is not None:
+            fetcher.close()
 
-    return graph
+    return builder.build() if builder is not None else graph
 
 
 # -----------------------------
@@ -1,8 +1,15 @@
+import sys
+from pathlib import Path
 import requests
 from bs4 import BeautifulSoup
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # repo root, for common/
+from common.body_store import edge_body, edge_body_key
+from common.keyword_matcher import KeywordMatcher
+
 
 # -----------------------------
 # function to calculate heuristic score based on given parameters
@@ -34,40 +41,95 @@ def get_number_of_links_containing_similar_keyword(links, keyword): # links is a
     return count
 
 def analyze_graph(graph, keyword):
-    heuristic_scores = {}
-
-    for u, v, data in graph.edges(data=True):
-        link_text = data.get('link_text', '') or ''
-        surrounding_paragraph = data.get('surrounding_paragraph', '') or ''
-
-        # Try edge body first, then node[v], then node[u]
-        body = (data.get('body') or
-                graph.nodes.get(v, {}).get('body') or
-                graph.nodes.get(u, {}).get('body') or '')
-
-        occr_goal_key_in_link_text = get_occr_goal_key_in_link_text(link_text, keyword)
-        occr_in_surr_paragraph = get_occr_in_surr_paragraph(surrounding_paragraph, keyword)
-        occr_in_body = get_occr_in_body(body, keyword)
-
-        # neighbors of u (outgoing from u)
-        neighbors_of_u = [nbr for _, nbr in graph.out_edges(u)] if graph.is_directed() else [nbr for nbr in graph.neighbors(u)]
-        number_of_links_containing_similar_keyword = get_number_of_links_containing_similar_keyword(neighbors_of_u, keyword)
-
-        score = calculate_hueristic(
-            occr_goal_key_in_link_text,
-            occr_in_surr_paragraph,
-            occr_in_body,
-            number_of_links_containing_similar_keyword
-        )
-
-        # Aggregate instead of overwrite (max is usually good for “best” edge)
-        prev = heuristic_scores.get(v, float('-inf'))
-        heuristic_scores[v] = max(prev, score)
-
-        # with open("heuristic_scores.txt", "a") as f:
-        #     f.write(f"Edge {u} -> {v} | link:{occr_goal_key_in_link_text} para:{occr_in_surr_paragraph} body:{occr_in_body} links_like:{number_of_links_containing_similar_keyword} => score:{score}\n")
+    """
+    Heuristic score of every node that is the target of an edge: the best
+    calculate_hueristic() over its incoming edges. Same scores as counting
+    per edge with the get_occr_* helpers, computed in passes:
+      1. the keyword counted once per distinct link text, paragraph and page
+         body, and once per node for its keyword-bearing neighbours
+      2. the edge scores as NumPy array operations over per-edge indices
+      3. the maximum per target node
+    """
+    keyword_matcher = KeywordMatcher([keyword.lower()])
+    lowered_keyword = keyword.lower()
+
+    # -------- 1. counts per distinct string / body / node --------
+    text_ids = {}     # link text or paragraph -> index into text_counts
+    text_counts = []
+    body_ids = {}     # body key (edge_body_key) -> index into body_counts
+    body_counts = []
+    node_ids = {}     # node -> index into node arrays
+    nodes = []
+
+    def text_id(text):
+        index = text_ids.get(text)
+        if index is None:
+            index = text_ids[text] = len(text_counts)
+            text_counts.append(keyword_matcher.total(text.lower()))
+        return index
+
+    def node_id(node):
+        index = node_ids.get(node)
+        if index is None:
+            index = node_ids[node] = len(nodes)
+            nodes.append(node)
+        return index
+
+    number_of_edges = graph.number_of_edges()
+    source_index = np.empty(number_of_edges, dtype=np.intp)
+    target_index = np.empty(number_of_edges, dtype=np.intp)
+    link_text_index = np.empty(number_of_edges, dtype=np.intp)
+    paragraph_index = np.empty(number_of_edges, dtype=np.intp)
+    body_index = np.empty(number_of_edges, dtype=np.intp)
+
+    for edge, (u, v, data) in enumerate(graph.edges(data=True)):
+        source_index[edge] = node_id(u)
+        target_index[edge] = node_id(v)
+        link_text_index[edge] = text_id(data.get('link_text', '') or '')
+        paragraph_index[edge] = text_id(data.get('surrounding_paragraph', '') or '')
+
+        # Body by id from the graph's body store; legacy graphs: edge body first, then node[v], then node[u]
+        body_key = edge_body_key(graph, data, v, u)
+        index = body_ids.get(body_key)
+        if index is None:
+            index = body_ids[body_key] = len(body_counts)
+            body = edge_body(graph, data, v, u, lower=True)
+            body_counts.append(keyword_matcher.total(body) if body else 0)
+        body_index[edge] = index
+
+    if number_of_edges == 0:
+        return {}
+
+    # neighbours of u (outgoing from u) whose URL contains the keyword, once per node
+    neighbours = graph.successors if graph.is_directed() else graph.neighbors
+    url_has_keyword = {}
+    neighbour_counts = np.zeros(len(nodes), dtype=np.int64)
+    for index in np.unique(source_index).tolist():
+        count = 0
+        for nbr in neighbours(nodes[index]):
+            has_keyword = url_has_keyword.get(nbr)
+            if has_keyword is None:
+                has_keyword = url_has_keyword[nbr] = lowered_keyword in nbr.lower()
+            count += has_keyword
+        neighbour_counts[index] = count
+
+    # -------- 2. edge scores (calculate_hueristic over arrays) --------
+    text_counts = np.asarray(text_counts, dtype=np.int64)
+    scores = calculate_hueristic(
+        text_counts[link_text_index],
+        text_counts[paragraph_index],
+        np.asarray(body_counts, dtype=np.int64)[body_index],
+        neighbour_counts[source_index],
+    )
 
-    return heuristic_scores
+    # -------- 3. best score per target node --------
+    # Aggregate instead of overwrite (max is usually good for “best” edge)
+    best = np.full(len(nodes), np.iinfo(np.int64).min, dtype=np.int64)
+    np.maximum.at(best, target_index, scores)
+    # keys in the order targets first appear in the edge list
+    targets, first_edge = np.unique(target_index, return_index=True)
+    targets = targets[np.argsort(first_edge, kind="stable")]
+    return dict(zip((nodes[index] for index in targets.tolist()), best[targets].tolist()))
 
 
 # -----------------------------
@@ -1,7 +1,13 @@
 import pickle
+import sys
+from pathlib import Path
 import networkx as nx
 import matplotlib.pyplot as plt
 from best_first.h import analyze_graph
+from best_first.text_index import GraphTextIndex
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # repo root, for common/
+from common.body_store import edge_body
 
 
 # ----------------------------------------------
@@ -34,7 +40,9 @@ def check_top_k(k,similars, heuristic):
 # ----------------------------------------------
 # Check similarity of nodes in graph to the given keyword (version 4)
 # ----------------------------------------------
-def check_similarity(graph, keyword, heuristic):
+def check_similarity(graph, keyword, heuristic, text_index=None):
+    # text_index: GraphTextIndex of this graph (best_first/text_index.py); the
+    # matching nodes then come from an index lookup instead of a full scan
     keyword = keyword.lower()
     similars = set()
 
@@ -42,6 +50,13 @@ def check_similarity(graph, keyword, heuristic):
         # treat missing as 0 instead of -inf so we don't drop nodes prematurely
         return heuristic.get(n, 0) >= 0
 
+    matching_nodes = text_index.matching_nodes(keyword) if text_index is not None else None
+    if matching_nodes is not None:
+        for node in matching_nodes:
+            if has_any_h(node):
+                similars.add(node)
+        return check_top_k(k=3, similars=similars, heuristic=heuristic) if similars else None
+
     for node in graph.nodes():
         node_l = node.lower()
 
@@ -52,9 +67,9 @@ def check_similarity(graph, keyword, heuristic):
             link_text = (data.get('link_text') or '').lower()
             para = (data.get('surrounding_paragraph') or '').lower()
 
-            # prefer edge body, else node body (either direction)
-            body = (data.get('body') or
-                    (graph.nodes.get(node, {}).get('body') or '')).lower()
+            # body by id from the graph's body store (lower-cased once per page);
+            # legacy graphs: prefer edge body, else node body (either direction)
+            body = edge_body(graph, data, node, lower=True)
 
             if (keyword in link_text or keyword in para or keyword in body) and has_any_h(node):
                 similars.add(node)
@@ -73,12 +88,14 @@ if __name__ == "__main__":
     with open("crawled_graph1.gpickle", "rb") as f:
         G = pickle.load(f)
         print(f"\nCrawled nodes: {len(G.nodes())}, edges: {len(G.edges())}\n\n")
+    # Text index saved next to the graph (built on first use)
+    text_index = GraphTextIndex.for_graph(G, "crawled_graph1.gpickle")
     
     # create_graph_dict(G)  # just to create the file
 
     heuristic = analyze_graph(G, keyword)
 
-    num1 = check_similarity(G, keyword, heuristic)
+    num1 = check_similarity(G, keyword, heuristic, text_index)
     
     print("\nMost similar node to 'Hamid alhamadi':", num1)
     
@@ -0,0 +1,245 @@
+import hashlib
+import pickle
+import re
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # repo root, for common/
+from common.body_store import body_store_of, edge_body, edge_body_key
+
+# -----------------------------
+# Inverted text index over a crawled graph
+# -----------------------------
+# check_similarity resolves a goal description to the nodes whose URL, or
+# one of whose edges' link text / surrounding paragraph / page body, contains
+# it (lower-cased substring test). GraphTextIndex answers that without
+# scanning the graph:
+#
+#   documents   every node URL, every distinct link text and paragraph, every
+#               distinct page body; each knows the nodes it belongs to
+#   postings    word token -> {document: [positions]}, tokens being the \w+
+#               runs of the lower-cased text
+#
+# A query's tokens q1..qk can only occur as a substring where some document
+# has consecutive tokens t1..tk with t1 ending in q1, qk starting tk and the
+# ones in between equal (for one token: a token containing q1). The
+# vocabulary is scanned for those tokens, positions keep only consecutive
+# runs, and the few candidate documents left get the exact substring test,
+# so the result is the one the full scan gives.
+#
+# The index is built once per graph and pickled next to it
+# (<graph file>.index). Loading it is checked against a cheap signature of
+# the graph (node and edge counts, size and mtime of the graph file), so a
+# re-crawled graph file gets a new index without walking the graph. The
+# full content fingerprint (every edge and body) is kept too and compared
+# only on request: load(..., verify=True).
+
+FORMAT_VERSION = 2
+TOKEN_RE = re.compile(r"\w+")
+INDEX_SUFFIX = ".index"
+
+
+def graph_fingerprint(graph):
+    """Hash of the nodes, edges and the text attributes the index reads."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{graph.is_directed()} {graph.number_of_nodes()} {graph.number_of_edges()}".encode())
+    for node in graph.nodes():
+        digest.update(repr(node).encode("utf-8", errors="surrogatepass"))
+    body_hashes = {}  # id of a legacy body string -> its hash; a page's body is shared by its edges
+    for u, v, data in graph.edges(data=True):
+        body_key = edge_body_key(graph, data, u)
+        if data.get("body_id") is None:
+            # legacy graphs: the body text itself, so a re-crawled body of the same length still counts
+            body_hash = body_hashes.get(id(body_key))
+            if body_hash is None:
+                body_hash = body_hashes[id(body_key)] = hashlib.blake2b(
+                    body_key.encode("utf-8", errors="surrogatepass"), digest_size=16).hexdigest()
+            body_key = body_hash
+        digest.update(repr((u, v, data.get("link_text"), data.get("surrounding_paragraph"), body_key))
+                      .encode("utf-8", errors="surrogatepass"))
+    return digest.hexdigest()
+
+
+def graph_signature(graph, graph_path=None):
+    """Node and edge counts, plus the size and mtime of the graph's file when given."""
+    signature = (graph.is_directed(), graph.number_of_nodes(), graph.number_of_edges())
+    if graph_path is None:
+        return signature
+    try:
+        stat = Path(graph_path).stat()
+    except OSError:
+        return signature + (None, None)
+    return signature + (stat.st_size, stat.st_mtime_ns)
+
+
+def index_path_for(graph_path):
+    return Path(str(graph_path) + INDEX_SUFFIX)
+
+
+class GraphTextIndex:
+    """Positional inverted index of a graph's URLs, link texts, paragraphs and page bodies."""
+
+    def __init__(self, graph):
+        self.format_version = FORMAT_VERSION
+        self.fingerprint = graph_fingerprint(graph)
+        self.signature = graph_signature(graph)  # with the graph file's stat once saved next to it
+        self._graph = graph
+        self.nodes = list(graph.nodes())
+        self.doc_nodes = []     # document -> node ordinals it belongs to
+        self.doc_texts = []     # document -> lower-cased text, or ("body_id", id) for stored bodies
+        self.postings = {}      # token -> {document: [positions]}
+        self._build(graph)
+
+    # -------- build --------
+    def _build(self, graph):
+        documents = {}  # (kind, key) -> document
+
+        def document(kind, key, text):
+            doc = documents.get((kind, key))
+            if doc is None:
+                doc = documents[(kind, key)] = len(self.doc_texts)
+                self.doc_nodes.append([])
+                self.doc_texts.append(text if text is not None else ("body_id", key))
+                self._add_postings(doc, text if text is not None else body_store_of(graph).lower(key) or "")
+            return doc
+
+        for ordinal, node in enumerate(self.nodes):
+            docs = {document("url", node, node.lower())}
+            # the fields check_similarity tests, edge by edge
+            for _, _, data in graph.edges(node, data=True):
+                for attribute in ("link_text", "surrounding_paragraph"):
+                    text = (data.get(attribute) or "").lower()
+                    docs.add(document("text", text, text))
+                body_key = edge_body_key(graph, data, node)
+                if "body_id" in data and body_store_of(graph) is not None:
+                    docs.add(document("body", body_key, None))
+                else:
+                    docs.add(document("body", body_key, edge_body(graph, data, node, lower=True)))
+            for doc in docs:
+                self.doc_nodes[doc].append(ordinal)
+
+    def _add_postings(self, doc, text):
+        postings = self.postings
+        for position, match in enumerate(TOKEN_RE.finditer(text)):
+            token = match.group()
+            doc_positions = postings.get(token)
+            if doc_positions is None:
+                doc_positions = postings[token] = {}
+            positions = doc_positions.get(doc)
+            if positions is None:
+                doc_positions[doc] = [position]
+            else:
+                positions.append(position)
+
+    # -------- query --------
+    def matching_nodes(self, keyword):
+        """
+        Nodes (in graph order) whose URL or out-edge fields contain `keyword`
+        lower-cased, exactly as check_similarity's scan decides; None when the
+        keyword has no word characters (the scan has to decide then).
+        """
+        keyword = keyword.lower()
+        query_tokens = TOKEN_RE.findall(keyword)
+        if not query_tokens:
+            return None
+
+        # tokens each query token may stand for, and the documents where they occur
+        last = len(query_tokens) - 1
+        vocabulary = self.postings.keys()
+        token_sets = []
+        for i, query_token in enumerate(query_tokens):
+            if last == 0:
+                tokens = [t for t in vocabulary if query_token in t]
+            elif i == 0:
+                tokens = [t for t in vocabulary if t.endswith(query_token)]
+            elif i == last:
+                tokens = [t for t in vocabulary if t.startswith(query_token)]
+            else:
+                tokens = [query_token] if query_token in self.postings else []
+            if not tokens:
+                return []
+            token_sets.append(tokens)
+
+        # documents holding a token of every set
+        position_sets = []
+        for tokens in token_sets:
+            by_doc = {}
+            for token in tokens:
+                for doc, positions in self.postings[token].items():
+                    by_doc.setdefault(doc, []).extend(positions)
+            position_sets.append(by_doc)
+        candidates = set(position_sets[0])
+        for by_doc in position_sets[1:]:
+            candidates &= by_doc.keys()
+
+        # URLs, link texts and paragraphs first: a node they match needs no body test
+        single_word = keyword == query_tokens[0]  # token containment is the substring test itself
+        matched = set()
+        for doc in sorted(candidates, key=lambda doc: (isinstance(self.doc_texts[doc], tuple), doc)):
+            owners = self.doc_nodes[doc]
+            if all(ordinal in matched for ordinal in owners):
+                continue
+            if single_word or (_has_run(doc, position_sets) and keyword in self._text(doc)):
+                matched.update(owners)
+        return [self.nodes[ordinal] for ordinal in sorted(matched)]
+
+    def _text(self, doc):
+        text = self.doc_texts[doc]
+        if isinstance(text, tuple):
+            return body_store_of(self._graph).lower(text[1]) or ""
+        return text
+
+    # -------- persistence --------
+    def save(self, path, graph_path=None):
+        """Pickle the index to `path`; graph_path: the graph's file, whose size and mtime load() checks."""
+        self.signature = graph_signature(self._graph, graph_path)
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path, graph, graph_path=None, verify=False):
+        """
+        The index saved at `path` if it was built from this graph, else None.
+        The graph is matched by graph_signature (counts + graph_path's stat);
+        verify=True also recomputes the full graph_fingerprint, O(edges + body bytes).
+        """
+        try:
+            with open(path, "rb") as f:
+                index = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        if getattr(index, "format_version", None) != FORMAT_VERSION:
+            return None
+        if index.signature != graph_signature(graph, graph_path):
+            return None
+        if verify and index.fingerprint != graph_fingerprint(graph):
+            return None
+        index._graph = graph
+        return index
+
+    @classmethod
+    def for_graph(cls, graph, graph_path=None, verify=False):
+        """Load the index saved next to `graph_path`, or build it (and save it there)."""
+        if graph_path is not None:
+            index = cls.load(index_path_for(graph_path), graph, graph_path, verify)
+            if index is not None:
+                return index
+        index = cls(graph)
+        if graph_path is not None:
+            index.save(index_path_for(graph_path), graph_path)
+        return index
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_graph", None)  # saved next to the graph, not with it
+        return state
+
+
+def _has_run(doc, position_sets):
+    # Consecutive positions p, p+1, ... holding a token of each set in turn
+    starts = set(position_sets[0][doc])
+    for offset, by_doc in enumerate(position_sets[1:], 1):
+        starts.intersection_update([position - offset for position in by_doc[doc]])
+        if not starts:
+            return False
+    return True
@@ -36,7 +36,7 @@ def main():
 
             # Measure time taken for greedy best-first search
             stime = time.time()
-            graph = save_crawling(src, max_depth=1, same_domain=True, delay_sec=0.0, visualize_each=False)
+            graph = save_crawling(src, max_depth=1, same_domain=True, delay_sec=0.0, visualize_each=False, max_workers=8)
             heuristic = analyze_graph(graph, dest)
             pos = nx.spring_layout(graph)
             result_path = greedy_best_first_search(graph, src, dest, heuristic)
@@ -1,7 +1,16 @@
-import requests
+import sys
+from pathlib import Path
 from bs4 import BeautifulSoup
 import time 
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # repo root, for common/
+from common.http_client import HttpClient
+from common.response_cache import default_cache
+
+# One keep-alive session for the whole crawl instead of a new connection per page;
+# pages from earlier runs are revalidated instead of downloaded again
+client = HttpClient(cache=default_cache())
+
 # function to match the target with the text of the html
 def find_tgt(tgt, content):
   content = content.get_text()
@@ -27,8 +36,8 @@ def driver(src, visisted, target , sub_links):
     if sub_link not in visisted:
       visisted.append(sub_link)
       visisted.append(sub_link +'/')
-      response = requests.get(sub_link)
-      html_content = response.content
+      response = client.get(sub_link)
+      html_content = response.text  # charset sniffed once by the client
       soup = BeautifulSoup(html_content, 'html.parser')
       if find_tgt(target, soup):
         print('\nTgt found at ', sub_link, ' and the depth is ', len(visisted))
@@ -48,13 +57,13 @@ target ='Abeer Alsafran, Abdulwahab Alobaid'
 visited = []
 stime = time.time()
 # make first get request
-response = requests.get(src)
+response = client.get(src)
 # Add src to visited array
 visited.append(src)
 visited.append(src+'/')
 
 # Get the content
-html_content = response.content
+html_content = response.text
 # Soup is the whole content
 soup = BeautifulSoup(html_content, 'html.parser')
 # Find the target
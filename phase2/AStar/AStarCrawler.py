@@ -1,12 +1,24 @@
 from AStar.AStarHelperFunctions import *
+import sys
 import time
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urldefrag, urlparse
 import heapq
 from pathlib import Path
-import joblib
 import re
+import numpy as np
+from model_registry import get_linear_scorer, get_model, model_version, registry
+from score_cache import ScoreCache, context_key, print_score_cache_stats
+from sparse_models import predict_proba_sparse, predict_sparse
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # repo root, for common/
+from common.async_fetch import ConcurrentFetcher
+from common.html_parser import parse_html
+from common.http_client import HttpClient, print_fetch_stats
+from common.page_pool import PagePool
+from common.politeness import shared_scheduler
+from common.response_cache import default_cache
+from common.text_normalization import TargetPhrase
 
 print(f"[DEBUG] AStarCrawler module loaded from: {__file__}")
 
@@ -23,70 +35,111 @@ HEADERS = {
 # Load ML Model + Vectorizer
 # -------------------------
 PHASE2_DIR = Path(__file__).resolve().parents[1]  # .../phase2/
+# Models come from the process-wide registry (model_registry.py): each pickle
+# is loaded once and reused for every link instead of being unpickled per link.
 
-def score_link_with_mnb(link_tag,model_type):
+def extract_link_context(link):
+    """
+    Build the lower-cased text a link (a PageLink from common/html_parser.py)
+    is scored on: anchor text + surrounding paragraph (or nearest section/article/div),
+    bounded by the page's ContextWindow.
+    """
+    pieces = [link.anchor_text, link.context_text]
+    return " ".join(piece for piece in pieces if piece).strip().lower()
+
+
+def _relevance_probabilities(model, X):
+    """Probability of the relevant class (index 1) for every row of the CSR matrix X."""
+    if hasattr(model, "predict_proba"):
+        return predict_proba_sparse(model, X)[:, 1]
+    # Fallback to predicted label in {0,1}
+    return np.asarray(predict_sparse(model, X)).astype(float)
+
+
+def score_link_contexts(link_contexts, model_type, compiled_scorer=False, score_cache=None, score_texts=None):
+    """
+    Score all link contexts gathered on one page in a single pass:
+    one sparse vectorizer transform and one model call for the whole batch.
+
+    With compiled_scorer=True the exported {model_type}_linear.npz weight
+    table is used instead (MNB / linear models only, see linear_scorer.py).
+    With a ScoreCache (score_cache.py), contexts scored before by the same
+    model version are not vectorized again, and repeats within the page are
+    scored once. score_texts(texts) -> heuristics replaces the in-process
+    model call for the contexts that need scoring (the page workers).
+
+    Returns a float array of heuristics in roughly [0, 1000], aligned with
+    `link_contexts`. Empty contexts score 0.0, like score_link_with_mnb.
+    """
+    if score_texts is None:
+        def score_texts(texts):
+            return _score_texts(texts, model_type, compiled_scorer)
+
+    scores = np.zeros(len(link_contexts), dtype=float)
+    non_empty = [i for i, text in enumerate(link_contexts) if text]
+    if not non_empty:
+        return scores
+
+    if score_cache is None:
+        scores[non_empty] = score_texts([link_contexts[i] for i in non_empty])
+        return scores
+
+    model_id = (f"{model_type}/{'compiled' if compiled_scorer else 'sklearn'}",
+                model_version(model_type, compiled_scorer))
+    keys = [context_key(link_contexts[i]) for i in non_empty]
+    missing = {}  # key -> text, each distinct missing context once
+    for i, key, cached in zip(non_empty, keys, score_cache.get_many(model_id, keys)):
+        if cached is None:
+            missing.setdefault(key, link_contexts[i])
+        else:
+            scores[i] = cached
+    if missing:
+        new_scores = score_texts(list(missing.values()))
+        score_cache.put_many(model_id, list(missing), new_scores)
+        new_score_of = dict(zip(missing, new_scores))
+        for i, key in zip(non_empty, keys):
+            if key in new_score_of:
+                scores[i] = new_score_of[key]
+    return scores
+
+
+def _score_texts(texts, model_type, compiled_scorer):
+    # Heuristics in [0, 1000] for non-empty texts, one batch
+    if compiled_scorer:
+        scorer = get_linear_scorer(model_type)
+        return 1000.0 * scorer.score_texts(texts)
+
+    model, vectorizer = get_model(model_type)
+    # Stays CSR; only GaussianNB sees dense rows, one small chunk at a time
+    X = vectorizer.transform(texts)
+
+    # Scale to a 0..1000-ish range for compatibility with old heuristic scale
+    return 1000.0 * _relevance_probabilities(model, X)
+
+
+def score_link_with_mnb(link,model_type):
     """
     Score a link using ONLY the MNB model probability
     on the link's local textual context (anchor + nearby text).
 
     Returns a heuristic in roughly [0, 1000].
+    Prefer score_link_contexts when scoring every link of a page.
     """
-    pieces = []
-    if model_type == 'MNB':
-        MNB_MODEL_PATH = PHASE2_DIR / "MNB_model.pkl"
-        MNB_VECTORIZER_PATH = PHASE2_DIR / "tfidf_MNB_vectorizer.pkl"
-
-        model = joblib.load(MNB_MODEL_PATH)
-        vectorizer = joblib.load(MNB_VECTORIZER_PATH)
-    elif model_type == 'SVM':
-        SVM_MODEL_PATH = PHASE2_DIR / "SVM_model.pkl"
-        SVM_VECTORIZER_PATH = PHASE2_DIR / "tfidf_SVM_vectorizer.pkl"
-
-        model = joblib.load(SVM_MODEL_PATH)
-        vectorizer = joblib.load(SVM_VECTORIZER_PATH)
-    elif model_type == 'GNB':
-        GNB_MODEL_PATH = PHASE2_DIR / "GNB_model.pkl"
-        GNB_VECTORIZER_PATH = PHASE2_DIR / "tfidf_GNB_vectorizer.pkl"
-
-        model = joblib.load(GNB_MODEL_PATH)
-        vectorizer = joblib.load(GNB_VECTORIZER_PATH)
-    elif model_type == 'DT':
-        DT_MODEL_PATH = PHASE2_DIR / "DT_model.pkl"
-        DT_VECTORIZER_PATH = PHASE2_DIR / "tfidf_DT_vectorizer.pkl"
-
-        model = joblib.load(DT_MODEL_PATH)
-        vectorizer = joblib.load(DT_VECTORIZER_PATH)
-    else:
-        raise ValueError("Unsupported model type for scoring link.")
-
-    if link_tag:
-        # Anchor text
-        link_text = link_tag.get_text(separator=" ", strip=True)
-        if link_text:
-            pieces.append(link_text)
-
-        # Surrounding paragraph or block
-        parent_paragraph = link_tag.find_parent("p")
-        if parent_paragraph:
-            pieces.append(parent_paragraph.get_text(separator=" ", strip=True))
-        else:
-            parent_block = link_tag.find_parent(["section", "article", "div"])
-            if parent_block:
-                pieces.append(parent_block.get_text(separator=" ", strip=True))
+    model, vectorizer = get_model(model_type)
 
-    combined_text = " ".join(pieces).strip().lower()
+    combined_text = extract_link_context(link)
 
     if not combined_text:
         return 0.0
 
-    X = vectorizer.transform([combined_text]).toarray()
+    X = vectorizer.transform([combined_text])  # CSR, never densified
 
     if hasattr(model, "predict_proba"):
         # Probability of the "AI-related / relevant" class (index 1)
-        ml_score = float(model.predict_proba(X)[0][1])  # 0..1
+        ml_score = float(predict_proba_sparse(model, X)[0][1])  # 0..1
     else:
         # Fallback to predicted label in {0,1}
-        label = int(model.predict(X)[0])
+        label = int(predict_sparse(model, X)[0])
         ml_score = float(label)
 
     # Scale to a 0..1000-ish range for compatibility with old heuristic scale
@@ -94,6 +147,197 @@ def score_link_with_mnb(link_tag,model_type):
     return heuristic_value
 
 
+# -------------------------
+# Per-page processing (inline, or on worker processes)
+# -------------------------
+NON_HTML_EXTENSIONS = (".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx")
+
+
+class PageSettings:
+    """Crawl-wide settings pages are processed with; sent once to each worker process."""
+
+    def __init__(self, target_phrase, base_domain, model_type, compiled_scorer,
+                 parser_backend=None, link_context_window=None, cascade_top_m=None, cascade_keywords=None):
+        self.target_phrase = target_phrase
+        self.goal_phrase = TargetPhrase(target_phrase)  # folded once per crawl (common/text_normalization.py)
+        self.base_domain = base_domain
+        self.model_type = model_type
+        self.compiled_scorer = compiled_scorer
+        self.parser_backend = parser_backend
+        self.link_context_window = link_context_window
+        # Cascade: only the top M links of a page by the keyword pre-score reach the model
+        self.cascade_top_m = cascade_top_m
+        self.cascade_matcher = KeywordMatcher(
+            cascade_keywords if cascade_keywords is not None else keyword_tokens(target_phrase)
+        )
+
+
+def preload_scorer(model_type, compiled_scorer):
+    """Warm the model registry so the first page is not charged for unpickling."""
+    if compiled_scorer:
+        get_linear_scorer(model_type)
+    else:
+        registry.preload(model_type)
+
+
+def process_page(html_text, current_url, settings, score_cache=None, skip=()):
+    """
+    Parse a page, check it for the goal phrase and score its child links.
+
+    Returns (goal_found, links_found, links_skipped, [(score, absolute_url), ...]):
+    candidate children in document order, de-duplicated, on the base domain,
+    not obviously non-HTML and not in `skip`. In cascade mode only the
+    settings.cascade_top_m candidates with the best keyword pre-score are
+    model-scored and returned; links_skipped counts the others.
+    """
+    goal_found, links_found, links_skipped, child_urls, link_contexts = page_candidates(
+        html_text, current_url, settings, skip)
+    if goal_found:
+        return True, 0, 0, []
+
+    # ML-only heuristic based on link context, scored for the whole page at once
+    link_scores = score_link_contexts(link_contexts, settings.model_type, settings.compiled_scorer, score_cache)
+    return False, links_found, links_skipped, [(float(score), url) for score, url in zip(link_scores, child_urls)]
+
+
+def page_candidates(html_text, current_url, settings, skip=()):
+    """
+    The part of process_page before the model: parse, goal check and child
+    candidates (after the cascade pre-filter), with the context each one is
+    scored on. Returns (goal_found, links_found, links_skipped, child_urls, link_contexts).
+    """
+    page = parse_html(html_text, settings.parser_backend, settings.link_context_window)
+
+    # -------- Check for target phrase on this page --------
+    if page_contains_phrase(page, settings.goal_phrase) or find_tgt(settings.target_phrase, page):
+        return True, 0, 0, [], []
+
+    # -------- Child candidates --------
+    all_links = page.links()
+    child_urls = []
+    link_contexts = []
+    anchor_texts = []
+    seen_urls = set()
+
+    for link in all_links:
+        absolute_url = requests.compat.urljoin(current_url, link.href)
+        absolute_url, _ = urldefrag(absolute_url)
+
+        # De-duplicate URLs within this page
+        if absolute_url in seen_urls:
+            continue
+        seen_urls.add(absolute_url)
+
+        # Already visited?
+        if absolute_url in skip:
+            continue
+
+        # Domain restriction using helper
+        if not is_within_domain(settings.base_domain, absolute_url):
+            continue
+
+        # Skip obviously non-HTML resources
+        if absolute_url.lower().endswith(NON_HTML_EXTENSIONS):
+            continue
+
+        child_urls.append(absolute_url)
+        link_contexts.append(extract_link_context(link))
+        anchor_texts.append(link.anchor_text)
+
+    # -------- Cascade: cheap keyword/URL pre-filter before the model --------
+    links_skipped = 0
+    if settings.cascade_top_m is not None and len(child_urls) > settings.cascade_top_m:
+        prefilter_scores = [
+            link_prefilter_score(context, anchor_text, url, settings.cascade_matcher)
+            for context, anchor_text, url in zip(link_contexts, anchor_texts, child_urls)
+        ]
+        # Best M by pre-score (ties: document order), scored in document order
+        kept = sorted(sorted(range(len(child_urls)), key=lambda i: -prefilter_scores[i])[:settings.cascade_top_m])
+        links_skipped = len(child_urls) - len(kept)
+        child_urls = [child_urls[i] for i in kept]
+        link_contexts = [link_contexts[i] for i in kept]
+
+    return False, len(all_links), links_skipped, child_urls, link_contexts
+
+
+def print_cascade_stats(cascade_stats):
+    """One-line summary of the cascade pre-filter for the end of a crawl."""
+    candidates = cascade_stats["candidates"]
+    skipped = cascade_stats["skipped"]
+    print(f"Cascade                : {skipped} of {candidates} candidate links skipped the model "
+          f"({100 * skipped / max(candidates, 1):.0f}%)")
+
+
+def process_batch_on_pool(page_pool, items, settings, score_cache):
+    """
+    process_page for a batch of fetched pages on a PagePool, in two rounds:
+    the workers parse the pages and return their candidates and link contexts,
+    then the coordinator looks every context of the batch up in its own
+    score_cache and the workers score only the distinct misses. The cache
+    (hits, stats, its file) thus stays in one process, as inline.
+
+    items: (url, raw body bytes, encoding, skip) per page. Returns
+    [(result, error), ...] aligned with items, result as process_page's.
+    """
+    parsed = page_pool.process_batch(items)
+    contexts = [context for result, error in parsed if error is None for context in result[4]]
+    try:
+        scores = score_link_contexts(contexts, settings.model_type, settings.compiled_scorer, score_cache,
+                                     score_texts=lambda texts: _score_texts_on_pool(page_pool, texts))
+    except Exception as e:
+        scores, scoring_error = None, e
+
+    processed, offset = [], 0
+    for result, error in parsed:
+        if error is not None:
+            processed.append((None, error))
+            continue
+        goal_found, links_found, links_skipped, child_urls, link_contexts = result
+        if goal_found:
+            processed.append(((True, 0, 0, []), None))
+        elif scores is None:
+            processed.append((None, scoring_error))
+        else:
+            page_scores = scores[offset:offset + len(link_contexts)]
+            processed.append(((False, links_found, links_skipped,
+                               [(float(score), url) for score, url in zip(page_scores, child_urls)]), None))
+        offset += len(link_contexts)
+    return processed
+
+
+def _score_texts_on_pool(page_pool, texts):
+    # One chunk of the batch's cache misses per worker
+    chunk_size = -(-len(texts) // page_pool.workers)
+    chunks = [(texts[start:start + chunk_size],) for start in range(0, len(texts), chunk_size)]
+    scored = page_pool.process_batch(chunks, process=_score_texts_in_worker)
+    for _, error in scored:
+        if error is not None:
+            raise error
+    return np.concatenate([scores for scores, _ in scored])
+
+
+# State of a worker process (PagePool), set once by _init_page_worker
+_worker_settings = None
+
+
+def _init_page_worker(settings):
+    global _worker_settings
+    _worker_settings = settings
+    preload_scorer(settings.model_type, settings.compiled_scorer)
+
+
+def _page_candidates_in_worker(current_url, body, encoding, skip):
+    # Raw bytes in, candidates and their contexts out; decoded the way
+    # response.text does. skip: the coordinator's visited set, so the
+    # cascade's top M is taken among the same links as inline
+    html_text = str(body, encoding or "utf-8", errors="replace")
+    return page_candidates(html_text, current_url, _worker_settings, skip)
+
+
+def _score_texts_in_worker(texts):
+    return _score_texts(texts, _worker_settings.model_type, _worker_settings.compiled_scorer)
+
+
 def a_star_web_crawl(
     seed_web_address,
     target_phrase,
@@ -102,7 +346,21 @@ def a_star_web_crawl(
     requests_timeout_seconds=5,
     depth_penalty_per_level=75.0,
     base_domain=None,  # optional base domain
-    model_type='MNB'
+    model_type='MNB',
+    compiled_scorer=False,  # score with the exported .npz weight table instead of sklearn
+    max_concurrency=1,  # >1 fetches the top-N frontier pages concurrently (thread pool)
+    per_host_concurrency=2,  # concurrent fetches allowed to a single host
+    politeness_delay_seconds=1.0,  # minimum gap between requests to the same host
+    scheduler=None,  # PolitenessScheduler; defaults to the process-wide one
+    http_client=None,  # HttpClient to fetch with (e.g. one with an on_stats hook)
+    offline=False,  # serve pages only from the on-disk response cache
+    max_page_bytes=2_000_000,  # stop reading a page body here (None = no cap)
+    parser_backend=None,  # "bs4" / "lxml"; default: HTML_PARSER_BACKEND or bs4
+    link_context_window=None,  # ContextWindow bounding link contexts; WHOLE_BLOCK = the enclosing block as-is
+    score_cache=None,  # ScoreCache; default: in memory for this crawl (ScoreCache.for_site(url) persists)
+    page_workers=0,  # >0 parses and scores each fetched batch on this many processes (with max_concurrency > 1)
+    cascade_top_m=None,  # model-score only the top M links of each page by a keyword/URL pre-score (None = all)
+    cascade_keywords=None  # words of the cascade pre-score; default: the target phrase's tokens
 ):
 
     start_time_seconds = time.time()
@@ -121,21 +379,56 @@ def a_star_web_crawl(
     parent_of = {}
     depth_of = {}
 
-    non_html_ext = (".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx")
+    # Link contexts repeated across pages (nav bars, footers) are scored once
+    if score_cache is None:
+        score_cache = ScoreCache()
+
+    settings = PageSettings(target_phrase, base_domain, model_type, compiled_scorer, parser_backend,
+                            link_context_window, cascade_top_m, cascade_keywords)
+    cascade_stats = {"candidates": 0, "skipped": 0}
+
+    # Parsing and scoring run here, or on worker processes that preload the
+    # model once each; the score cache stays here either way
+    page_pool = None
+    if page_workers > 0:
+        page_pool = PagePool(_page_candidates_in_worker, page_workers,
+                             initializer=_init_page_worker, initargs=(settings,))
+    else:
+        preload_scorer(model_type, compiled_scorer)
+
+    # Keep-alive connection pools shared by every fetch of this crawl; the
+    # client also applies per-host politeness, so only requests to the same
+    # host wait for each other, and revalidates pages cached by earlier runs
+    if http_client is None:
+        http_client = HttpClient(
+            pool_maxsize=max(max_concurrency, per_host_concurrency),
+            headers=HEADERS,
+            scheduler=scheduler or shared_scheduler,
+            cache=default_cache(),
+            offline=offline,
+        )
+
+    def fetch_page(url):
+        # Streams the body: non-HTML is aborted from its headers, long pages are
+        # cut at max_page_bytes and the goal check runs on what was read
+        return http_client.get(url, timeout=requests_timeout_seconds, min_delay=politeness_delay_seconds,
+                               max_bytes=max_page_bytes, html_only=True)
+
+    fetcher = None
+    if max_concurrency > 1:
+        fetcher = ConcurrentFetcher(fetch_page, max_concurrency, per_host_concurrency)
 
     # -------- Fetch seed page --------
     try:
         print(f"[DEBUG] Fetching seed: {seed_web_address}")
-        seed_res = requests.get(
-            seed_web_address,
-            headers=HEADERS,
-            timeout=requests_timeout_seconds
-        )
-        print(f"[DEBUG] Seed status: {seed_res.status_code}, length: {len(seed_res.text)}")
-        seed_res.encoding = seed_res.encoding or "utf-8"
-        seed_soup = BeautifulSoup(seed_res.text, "html.parser")
+        seed_res = fetch_page(seed_web_address)
+        print(f"[DEBUG] Seed status: {seed_res.status_code}, length: {len(seed_res.content)} bytes")
     except Exception as e:
         print("Failed to fetch seed URL:", e)
+        if fetcher is not None:
+            fetcher.close()
+        if page_pool is not None:
+            page_pool.close()
         return None
 
     depth_of[seed_web_address] = 0
@@ -161,93 +454,104 @@ def a_star_web_crawl(
     current_url = seed_web_address  # in case we never move
 
     while frontier and len(visited) < maximum_pages_to_visit:
-        current = heapq.heappop(frontier)
-        current_url = current.web_address
-
-        if current_url in visited:
-            continue
-
-        visited.add(current_url)
-        search_steps += 1
-        print(f"[A*] Exploring {search_steps}: {current_url}", flush=True)
-
-        current_depth = depth_of.get(current_url, 0)
-
-        # -------- Fetch current page --------
-        try:
-            time.sleep(1.0)  # be polite
-            res = requests.get(
-                current_url,
-                headers=HEADERS,
-                timeout=requests_timeout_seconds
-            )
-            print(f"[DEBUG] Fetch {current_url} -> status {res.status_code}, length {len(res.text)}")
-            res.encoding = res.encoding or "utf-8"
-            soup = BeautifulSoup(res.text, "html.parser")
-        except Exception as e:
-            print(f"[A*] Skipping unreachable page: {current_url} ({e})")
-            continue
-
-        # -------- Check for target phrase on this page --------
-        if page_contains_phrase(soup, target_phrase) or find_tgt(target_phrase, soup):
-            stopped_reason = "goal_found"
-            break
-
-        # -------- Child expansion (ML-guided top-K) --------
-        all_links = soup.find_all("a", href=True)
-        print(f"[DEBUG] Found {len(all_links)} links on this page")
-
-        candidates = []
-        seen_urls = set()
-
-        for link in all_links:
-            absolute_url = requests.compat.urljoin(current_url, link["href"])
-            absolute_url, _ = urldefrag(absolute_url)
-
-            # De-duplicate URLs within this page
-            if absolute_url in seen_urls:
+        # Pop the best unvisited nodes: one in sequential mode, up to
+        # max_concurrency in concurrent mode
+        batch = []
+        while frontier and len(batch) < max_concurrency and len(visited) < maximum_pages_to_visit:
+            current = heapq.heappop(frontier)
+            if current.web_address in visited:
                 continue
-            seen_urls.add(absolute_url)
-
-            # Already visited?
-            if absolute_url in visited:
-                continue
-
-            # Domain restriction using helper
-            if not is_within_domain(base_domain, absolute_url):
+            visited.add(current.web_address)
+            batch.append(current.web_address)
+
+        # -------- Fetch the batch --------
+        if fetcher is None:
+            results = []
+            for url in batch:
+                try:
+                    results.append((fetch_page(url), None))
+                except Exception as e:
+                    results.append((None, e))
+        else:
+            results = fetcher.fetch_batch(batch)
+
+        # Worker processes parse and score the whole batch at once; visited does
+        # not change while the batch is handled, so one snapshot serves every page
+        if page_pool is not None:
+            visited_snapshot = frozenset(visited)
+            processed_batch = iter(process_batch_on_pool(
+                page_pool,
+                [(url, res.content, res.encoding, visited_snapshot) for url, (res, fetch_error) in zip(batch, results)
+                 if fetch_error is None],
+                settings, score_cache,
+            ))
+
+        # Results are handled in the order they were popped (best-first)
+        for current_url, (res, fetch_error) in zip(batch, results):
+            search_steps += 1
+            print(f"[A*] Exploring {search_steps}: {current_url}", flush=True)
+
+            current_depth = depth_of.get(current_url, 0)
+
+            try:
+                if fetch_error is not None:
+                    raise fetch_error
+                print(f"[DEBUG] Fetch {current_url} -> status {res.status_code}, length {len(res.content)} bytes"
+                      + (" (truncated)" if getattr(res, "truncated", False) else ""))
+                if page_pool is None:
+                    processed = process_page(res.text, current_url, settings, score_cache, skip=visited)
+                else:
+                    processed, process_error = next(processed_batch)
+                    if process_error is not None:
+                        raise process_error
+            except Exception as e:
+                print(f"[A*] Skipping unreachable page: {current_url} ({e})")
                 continue
 
-            # Skip obviously non-HTML resources
-            if absolute_url.lower().endswith(non_html_ext):
-                continue
+            goal_found, links_found, links_skipped, scored_children = processed
+            if goal_found:
+                stopped_reason = "goal_found"
+                break
+            cascade_stats["candidates"] += len(scored_children) + links_skipped
+            cascade_stats["skipped"] += links_skipped
 
+            # -------- Child expansion (ML-guided top-K) --------
+            print(f"[DEBUG] Found {links_found} links on this page")
             child_depth = current_depth + 1
+            candidates = [
+                (heur, absolute_url, child_depth)
+                for heur, absolute_url in scored_children
+                if absolute_url not in visited
+            ]
+
+            # Sort by heuristic score (high → low) and take top-K
+            candidates.sort(key=lambda x: x[0], reverse=True)
+            top_k = candidates[:maximum_child_links_per_page]
+
+            debug_limit = 10
+            for idx, (heur, absolute_url, child_depth) in enumerate(top_k):
+                if absolute_url not in parent_of and absolute_url not in visited:
+                    parent_of[absolute_url] = current_url
+                    depth_of[absolute_url] = child_depth
+
+                    node = AStarNode(
+                        web_address=absolute_url,
+                        cumulative_relevance=-depth_penalty_per_level * float(child_depth),
+                        heuristic_relevance=heur
+                    )
+                    heapq.heappush(frontier, node)
+
+                    if idx < debug_limit:
+                        print("  [DEBUG] Add to frontier (top-K):", absolute_url, "| heuristic:", heur)
+
+        if stopped_reason == "goal_found":
+            break
 
-            # ML-only heuristic based on link context
-            heur = score_link_with_mnb(link,model_type)
-
-            candidates.append((heur, absolute_url, child_depth))
-
-        # Sort by heuristic score (high → low) and take top-K
-        candidates.sort(key=lambda x: x[0], reverse=True)
-        top_k = candidates[:maximum_child_links_per_page]
-
-        debug_limit = 10
-        for idx, (heur, absolute_url, child_depth) in enumerate(top_k):
-            if absolute_url not in parent_of and absolute_url not in visited:
-                parent_of[absolute_url] = current_url
-                depth_of[absolute_url] = child_depth
-
-                node = AStarNode(
-                    web_address=absolute_url,
-                    cumulative_relevance=-depth_penalty_per_level * float(child_depth),
-                    heuristic_relevance=heur
-                )
-                heapq.heappush(frontier, node)
-
-                if idx < debug_limit:
-                    print("  [DEBUG] Add to frontier (top-K):", absolute_url, "| heuristic:", heur)
-
+    if fetcher is not None:
+        fetcher.close()
+    if page_pool is not None:
+        page_pool.close()
+    score_cache.save()
     end = time.time()
 
     if stopped_reason == "goal_found":
@@ -261,6 +565,10 @@ def a_star_web_crawl(
         print("\nTarget phrase FOUND at:", current_url)
         print("Pages visited:", len(visited))
         print("Time taken:", round(end - start_time_seconds, 2), "seconds")
+        print_fetch_stats(http_client)
+        print_score_cache_stats(score_cache)
+        if cascade_top_m is not None:
+            print_cascade_stats(cascade_stats)
         print("\nA* Path:")
         for step in path:
             print("  ", step)
@@ -269,4 +577,8 @@ def a_star_web_crawl(
     print("\nTarget phrase NOT found.")
     print("Pages visited:", len(visited))
     print("Time taken:", round(end - start_time_seconds, 2), "seconds")
+    print_fetch_stats(http_client)
+    print_score_cache_stats(score_cache)
+    if cascade_top_m is not None:
+        print_cascade_stats(cascade_stats)
     return None
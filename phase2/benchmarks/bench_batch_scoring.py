@@ -0,0 +1,62 @@
+# Benchmark: per-link scoring (score_link_with_mnb) vs batched page scoring (score_link_contexts)
+#
+# Usage (from phase2/):
+#   python benchmarks/bench_batch_scoring.py [MNB|SVM|GNB|DT]
+
+import random
+import sys
+import time
+from pathlib import Path
+
+PHASE2_DIR = Path(__file__).resolve().parents[1]  # .../phase2/
+sys.path.append(str(PHASE2_DIR))
+
+from model_registry import registry
+from AStar.AStarCrawler import extract_link_context, score_link_contexts, score_link_with_mnb
+from common.html_parser import parse_html
+
+WORDS = (
+    "artificial intelligence machine learning research faculty students courses "
+    "admission news events library campus exam schedule alumni computer science "
+    "department kuwait university neural networks data robotics capstone people"
+).split()
+
+LINK_COUNTS = (50, 500, 5000)
+
+
+def make_page(number_of_links, seed=0):
+    """Synthetic page: each link sits in a short paragraph of random words."""
+    rng = random.Random(seed)
+    paragraphs = []
+    for i in range(number_of_links):
+        before = " ".join(rng.choices(WORDS, k=12))
+        anchor = " ".join(rng.choices(WORDS, k=3))
+        after = " ".join(rng.choices(WORDS, k=12))
+        paragraphs.append(f'<p>{before} <a href="/page/{i}">{anchor}</a> {after}</p>')
+    return "<html><body><div>" + "\n".join(paragraphs) + "</div></body></html>"
+
+
+def run(model_type):
+    registry.preload(model_type)
+    print(f"=== Link scoring benchmark ({model_type}) ===")
+    print(f"{'links':>8} {'per-link (s)':>14} {'batched (s)':>12} {'speedup':>9} {'max |diff|':>11}")
+
+    for number_of_links in LINK_COUNTS:
+        links = parse_html(make_page(number_of_links)).links()
+
+        stime = time.perf_counter()
+        per_link = [score_link_with_mnb(link, model_type) for link in links]
+        per_link_time = time.perf_counter() - stime
+
+        stime = time.perf_counter()
+        contexts = [extract_link_context(link) for link in links]
+        batched = score_link_contexts(contexts, model_type)
+        batched_time = time.perf_counter() - stime
+
+        max_diff = max(abs(a - b) for a, b in zip(per_link, batched))
+        print(f"{number_of_links:>8} {per_link_time:>14.3f} {batched_time:>12.3f} "
+              f"{per_link_time / batched_time:>8.1f}x {max_diff:>11.2e}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1].upper() if len(sys.argv) > 1 else "MNB")
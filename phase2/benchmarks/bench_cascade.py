@@ -0,0 +1,138 @@
+# Benchmark: cascade scoring (keyword/URL pre-filter, then the model on the top M links)
+#
+# Crawls a synthetic university site served by a local server with no
+# latency. Every page repeats a 65-link template (nav bar, sidebar, footer)
+# around 12 content links; a few hub pages lead to the goal page, which is
+# the only page with the target phrase. Each run crawls from the same seed
+# with cascade_top_m = None (every link model-scored) and smaller M, and
+# reports the time, the pages visited until the goal and the share of
+# candidate links that skipped the model.
+#
+# The links towards the goal carry words of the target phrase (anchor and URL),
+# the case the pre-filter is built for; a path that only the model recognizes
+# would be cut by a small M.
+#
+# Each M is then crawled again in batches of BATCH_SIZE, inline and with
+# page_workers = POOL_WORKERS: both must explore the same pages in the same
+# order and skip the same links. Pages are cached in a temporary response
+# cache, not the repo's .http_cache/.
+#
+# Usage (from phase2/):
+#   python benchmarks/bench_cascade.py [MNB|SVM|GNB|DT]
+
+import contextlib
+import io
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+PHASE2_DIR = Path(__file__).resolve().parents[1]  # .../phase2/
+sys.path.append(str(PHASE2_DIR))
+sys.path.append(str(PHASE2_DIR.parent))  # repo root, for common/ and the shared benchmarks/local_site.py
+
+from AStar.AStarCrawler import a_star_web_crawl
+from benchmarks.local_site import PageHandler, local_site, temporary_cache
+from common.http_client import HttpClient
+
+PAGES = 400
+TEMPLATE_LINKS = 65
+CONTENT_LINKS_PER_PAGE = 12
+HUB_EVERY = 40  # pages 0, 40, 80, ... link to a hub page leading to the goal
+GOAL_PAGE = PAGES - 1
+TARGET_PHRASE = "reading group meets thursday in room 101"
+WORDS = ("admission news events library campus exam schedule alumni kuwait university "
+         "people parking housing sports calendar registration fees contact map careers").split()
+TOP_M_VALUES = (None, 40, 20, 10)
+PAGES_TO_VISIT = 300
+BATCH_SIZE = 8
+POOL_WORKERS = 2
+
+
+def words(rng, k):
+    return " ".join(rng.choices(WORDS, k=k))
+
+
+def make_site(seed=0):
+    rng = random.Random(seed)
+    template = [f'<li><a href="/page/{i}">{words(rng, 2)}</a></li>' for i in range(TEMPLATE_LINKS)]
+    nav, sidebar, footer = "".join(template[:30]), "".join(template[30:45]), "".join(template[45:])
+    pages = {}
+    for page_number in range(PAGES):
+        content = [
+            f'<p>{words(rng, 15)} <a href="/page/{rng.randrange(PAGES - 1)}">{words(rng, 3)}</a> {words(rng, 10)}</p>'
+            for _ in range(CONTENT_LINKS_PER_PAGE)
+        ]
+        if page_number % HUB_EVERY == 0:
+            content.insert(rng.randrange(len(content)),
+                           f'<p>{words(rng, 8)} <a href="/groups/{page_number}">groups and rooms</a></p>')
+        pages[f"/page/{page_number}"] = (f"<html><body><ul>{nav}</ul><main><ul>{sidebar}</ul>{''.join(content)}"
+                                         f"</main><ul>{footer}</ul></body></html>")
+        pages[f"/groups/{page_number}"] = (
+            f"<html><body><ul>{nav}</ul><main><h1>Research groups</h1>"
+            f'<p>{words(rng, 12)} <a href="/page/{GOAL_PAGE}">reading group</a> '
+            f"meets on thursday, see the schedule</p></main><ul>{footer}</ul></body></html>"
+        )
+    pages[f"/page/{GOAL_PAGE}"] = (f"<html><body><ul>{nav}</ul><main><h1>Machine learning reading group</h1>"
+                                   f"<p>The {TARGET_PHRASE}.</p></main></body></html>")
+    return {path: html.encode("utf-8") for path, html in pages.items()}
+
+
+SITE = make_site()
+
+
+class SiteHandler(PageHandler):
+    def page(self, path):
+        return SITE.get(path)
+
+
+def crawl(seed_url, model_type, cascade_top_m, cache, max_concurrency=1, page_workers=0):
+    http_client = HttpClient(pool_maxsize=max_concurrency, cache=cache)
+    output = io.StringIO()
+    stime = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        path = a_star_web_crawl(
+            seed_url,
+            TARGET_PHRASE,
+            maximum_pages_to_visit=PAGES_TO_VISIT,
+            model_type=model_type,
+            max_concurrency=max_concurrency,
+            per_host_concurrency=max_concurrency,
+            politeness_delay_seconds=0.0,
+            http_client=http_client,
+            page_workers=page_workers,
+            cascade_top_m=cascade_top_m,
+        )
+    seconds = time.perf_counter() - stime
+    http_client.close()
+    log = output.getvalue()
+    pages_visited = int(re.search(r"Pages visited: (\d+)", log).group(1))
+    # (skipped, candidates, percent) from the cascade summary line
+    skips = re.search(r"(\d+) of (\d+) candidate links skipped the model \((\d+)%\)", log)
+    skips = skips.groups() if skips else ("0", "0", "0")
+    explored = [line.split(": ", 1)[1] for line in log.splitlines() if line.startswith("[A*] Exploring")]
+    return seconds, pages_visited, path is not None, skips, explored
+
+
+def run(model_type):
+    print(f"=== Cascade scoring ({model_type}, {PAGES} pages, {TEMPLATE_LINKS + CONTENT_LINKS_PER_PAGE} links/page) ===")
+    print(f"{'cascade_top_m':>14} {'seconds':>8} {'pages visited':>14} {'goal':>5} {'skipped model':>14}")
+    with local_site(SiteHandler, "/page/0") as seed_url, temporary_cache() as cache:
+        for cascade_top_m in TOP_M_VALUES:
+            seconds, pages_visited, found, skips, _ = crawl(seed_url, model_type, cascade_top_m, cache)
+            print(f"{str(cascade_top_m):>14} {seconds:>8.2f} {pages_visited:>14} {'yes' if found else 'no':>5} "
+                  f"{skips[2] + '%':>14}")
+
+        print(f"\n=== Inline vs page_workers={POOL_WORKERS} (batches of {BATCH_SIZE}) ===")
+        print(f"{'cascade_top_m':>14} {'pages visited':>14} {'skipped model':>14} {'same order':>11} {'same skips':>11}")
+        for cascade_top_m in TOP_M_VALUES:
+            _, pages_visited, _, skips, explored = crawl(seed_url, model_type, cascade_top_m, cache, BATCH_SIZE)
+            _, _, _, pool_skips, pool_explored = crawl(seed_url, model_type, cascade_top_m, cache, BATCH_SIZE,
+                                                       POOL_WORKERS)
+            print(f"{str(cascade_top_m):>14} {pages_visited:>14} {skips[2] + '%':>14} "
+                  f"{'yes' if pool_explored == explored else 'NO':>11} {'yes' if pool_skips == skips else 'NO':>11}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else "MNB")
@@ -0,0 +1,65 @@
+# Benchmark: compiled .npz linear scorer vs sklearn (model bundle model + vectorizer)
+#
+# Reports model load time, per-link scoring time and the largest score difference.
+# Exports {model_type}_linear.npz from the model bundle first if it is missing.
+#
+# Usage (from phase2/):
+#   python benchmarks/bench_linear_scorer.py [MNB]
+
+import sys
+import time
+from pathlib import Path
+
+PHASE2_DIR = Path(__file__).resolve().parents[1]  # .../phase2/
+sys.path.append(str(PHASE2_DIR))
+
+from linear_scorer import LinearScorer, export_linear_scorer
+from model_bundle import load_model, load_vectorizer
+from model_registry import linear_scorer_path
+from sparse_models import predict_proba_sparse
+from benchmarks.bench_batch_scoring import make_page
+from AStar.AStarCrawler import extract_link_context
+from common.html_parser import parse_html
+
+NUMBER_OF_LINKS = 2000
+
+
+def run(model_type):
+    stime = time.perf_counter()
+    model = load_model(model_type)
+    vectorizer = load_vectorizer()
+    bundle_load_time = time.perf_counter() - stime
+
+    npz_path = linear_scorer_path(model_type)
+    if not npz_path.exists():
+        export_linear_scorer(model, vectorizer, npz_path)
+
+    stime = time.perf_counter()
+    scorer = LinearScorer.load(npz_path)
+    npz_load_time = time.perf_counter() - stime
+
+    contexts = [extract_link_context(link) for link in parse_html(make_page(NUMBER_OF_LINKS)).links()]
+
+    stime = time.perf_counter()
+    for text in contexts:
+        predict_proba_sparse(model, vectorizer.transform([text]))[0][1]
+    sklearn_per_link = (time.perf_counter() - stime) / len(contexts)
+
+    stime = time.perf_counter()
+    sklearn_scores = predict_proba_sparse(model, vectorizer.transform(contexts))[:, 1]
+    sklearn_batched = (time.perf_counter() - stime) / len(contexts)
+
+    stime = time.perf_counter()
+    compiled_scores = scorer.score_texts(contexts)
+    compiled_per_link = (time.perf_counter() - stime) / len(contexts)
+
+    print(f"=== Compiled linear scorer ({model_type}, {len(contexts)} links) ===")
+    print(f"load: bundle {bundle_load_time * 1000:.1f} ms | npz {npz_load_time * 1000:.1f} ms "
+          f"({npz_path.stat().st_size / 1024:.0f} KiB)")
+    print(f"per link: sklearn single {sklearn_per_link * 1e6:.1f} us | sklearn batched "
+          f"{sklearn_batched * 1e6:.1f} us | compiled {compiled_per_link * 1e6:.1f} us")
+    print(f"max |score diff|: {abs(sklearn_scores - compiled_scores).max():.2e}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1].upper() if len(sys.argv) > 1 else "MNB")
@@ -0,0 +1,63 @@
+# Benchmark: whole-block link contexts vs bounded context windows
+#
+# Synthetic pages in the common "wrapper div" layout: every link sits in a
+# nav list or a card with no <p>, so its block is the page-wide <div>. Scores
+# every link of a page with score_link_contexts using
+#   - WHOLE_BLOCK: the enclosing block as-is (the old behaviour)
+#   - DEFAULT_CONTEXT_WINDOW: the block if short, else words around the anchor
+# and reports context size per link, scoring time, how many distinct contexts
+# the page has and the spread of the scores.
+#
+# Usage (from phase2/):
+#   python benchmarks/bench_link_context.py [MNB|SVM|GNB|DT]
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PHASE2_DIR = Path(__file__).resolve().parents[1]  # .../phase2/
+sys.path.append(str(PHASE2_DIR))
+
+from model_registry import registry
+from AStar.AStarCrawler import extract_link_context, score_link_contexts
+from benchmarks.bench_batch_scoring import WORDS
+from common.html_parser import DEFAULT_CONTEXT_WINDOW, WHOLE_BLOCK, parse_html
+
+LINK_COUNTS = (50, 500, 2000)
+
+
+def make_wrapper_page(number_of_links, seed=0):
+    """Links in nav items and cards, all inside one page-wide <div>, no <p>."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(number_of_links):
+        anchor = " ".join(rng.choices(WORDS, k=3))
+        blurb = " ".join(rng.choices(WORDS, k=10))
+        if i % 2:
+            items.append(f'<li><a href="/nav/{i}">{anchor}</a></li>')
+        else:
+            items.append(f'<span class="card"><a href="/card/{i}">{anchor}</a> {blurb}</span>')
+    return '<html><body><div id="wrapper">' + "\n".join(items) + "</div></body></html>"
+
+
+def run(model_type):
+    registry.preload(model_type)
+    print(f"=== Link contexts on wrapper-div pages ({model_type}) ===")
+    print(f"{'links':>6} {'context':>22} {'chars/link':>11} {'score s':>8} {'distinct':>9} {'score stdev':>12}")
+    for number_of_links in LINK_COUNTS:
+        html = make_wrapper_page(number_of_links)
+        for name, window in (("whole block", WHOLE_BLOCK), ("bounded window", DEFAULT_CONTEXT_WINDOW)):
+            links = parse_html(html, context_window=window).links()
+            stime = time.perf_counter()
+            contexts = [extract_link_context(link) for link in links]
+            scores = score_link_contexts(contexts, model_type)
+            seconds = time.perf_counter() - stime
+            chars = sum(len(link.context_text) for link in links) / len(links)
+            print(f"{number_of_links:>6} {name:>22} {chars:>11.0f} {seconds:>8.3f} "
+                  f"{len(set(link.context_text for link in links)):>9} {statistics.pstdev(scores):>12.2f}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1].upper() if len(sys.argv) > 1 else "MNB")
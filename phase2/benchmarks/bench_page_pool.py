@@ -0,0 +1,87 @@
+# Benchmark: parse + score on worker processes (common/page_pool.py) vs inline
+#
+# Replays a crawl of the synthetic university site from bench_score_cache.py
+# (shared nav bar, sidebar and footer around each page's content links)
+# served by a local server with no latency, so the run is bound by parsing
+# and link scoring rather than the network. Each configuration crawls the
+# same PAGES_TO_VISIT pages with max_concurrency = BATCH_SIZE; pages/sec is
+# compared and every run must explore the pages in the same order as the
+# inline run, with the same link-context score cache hit rate (the cache
+# stays on the coordinator, workers score only its misses).
+#
+# Worker processes only add throughput when there are cores to run them on:
+# the printed CPU count bounds the expected speedup. Times include starting
+# the workers (each imports the crawler and loads the model once). Pages are
+# cached in a temporary response cache, not the repo's .http_cache/.
+#
+# Usage (from phase2/):
+#   python benchmarks/bench_page_pool.py [MNB|SVM|GNB|DT]
+
+import contextlib
+import io
+import os
+import sys
+import time
+import zlib
+from pathlib import Path
+
+PHASE2_DIR = Path(__file__).resolve().parents[1]  # .../phase2/
+sys.path.append(str(PHASE2_DIR))
+sys.path.append(str(PHASE2_DIR.parent))  # repo root, for common/ and the shared benchmarks/local_site.py
+
+from AStar.AStarCrawler import a_star_web_crawl
+from benchmarks.bench_score_cache import make_site
+from benchmarks.local_site import PageHandler, local_site, temporary_cache
+from common.http_client import HttpClient
+from score_cache import ScoreCache
+
+PAGES_TO_VISIT = 150
+BATCH_SIZE = 8
+WORKER_COUNTS = (0, 1, 2, 4)  # 0 = inline
+SITE = [html.encode("utf-8") for html in make_site()]
+
+
+class ReplayHandler(PageHandler):
+    def page(self, path):
+        return SITE[zlib.crc32(path.encode("utf-8")) % len(SITE)]
+
+
+def crawl(seed_url, model_type, page_workers, cache):
+    http_client = HttpClient(pool_maxsize=BATCH_SIZE, cache=cache)
+    score_cache = ScoreCache()
+    output = io.StringIO()
+    stime = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        a_star_web_crawl(
+            seed_url,
+            "phrase that is not on the site",
+            maximum_pages_to_visit=PAGES_TO_VISIT,
+            model_type=model_type,
+            max_concurrency=BATCH_SIZE,
+            per_host_concurrency=BATCH_SIZE,
+            politeness_delay_seconds=0.0,
+            page_workers=page_workers,
+            http_client=http_client,
+            score_cache=score_cache,
+        )
+    seconds = time.perf_counter() - stime
+    http_client.close()
+    explored = [line.split(": ", 1)[1] for line in output.getvalue().splitlines() if line.startswith("[A*] Exploring")]
+    return seconds, explored, score_cache.hit_rate()
+
+
+def run(model_type):
+    print(f"=== Page processing pool ({model_type}, {PAGES_TO_VISIT} pages, batches of {BATCH_SIZE}, "
+          f"{os.cpu_count()} CPUs) ===")
+    print(f"{'page_workers':>13} {'seconds':>8} {'pages/sec':>10} {'same order':>11} {'cache hits':>11}")
+    with local_site(ReplayHandler, "/") as seed_url, temporary_cache() as cache:
+        reference = None
+        for page_workers in WORKER_COUNTS:
+            seconds, explored, hit_rate = crawl(seed_url, model_type, page_workers, cache)
+            reference = reference or explored
+            print(f"{page_workers or 'inline':>13} {seconds:>8.2f} {len(explored) / seconds:>10.1f} "
+                  f"{'yes' if explored == reference else 'NO':>11} {100 * hit_rate:>10.0f}%")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else "MNB")
@@ -0,0 +1,92 @@
+# Benchmark: link scoring with and without the link-context score cache
+#
+# Replays the scoring of a crawl over a synthetic university site: every page
+# repeats the same navigation bar, sidebar and footer (as site templates do)
+# around its own content links. Each page's link contexts are scored with
+# score_link_contexts
+#   - without a cache
+#   - with an in-memory ScoreCache (first crawl)
+#   - with the ScoreCache persisted by the first crawl (second crawl)
+# and reports time, hit rate and the largest score difference. A lookup under
+# a different model version shows persisted scores are not reused.
+#
+# Usage (from phase2/):
+#   python benchmarks/bench_score_cache.py [MNB|SVM|GNB|DT]
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PHASE2_DIR = Path(__file__).resolve().parents[1]  # .../phase2/
+sys.path.append(str(PHASE2_DIR))
+
+from model_registry import registry
+from score_cache import ScoreCache, context_key
+from AStar.AStarCrawler import extract_link_context, score_link_contexts
+from benchmarks.bench_batch_scoring import WORDS
+from common.html_parser import parse_html
+
+PAGES = 200
+CONTENT_LINKS_PER_PAGE = 12
+
+
+def template_block(rng, name, number_of_links):
+    links = "".join(f'<li><a href="/{name}/{i}">{" ".join(rng.choices(WORDS, k=2))}</a></li>'
+                    for i in range(number_of_links))
+    return f'<div class="{name}"><ul>{links}</ul></div>'
+
+
+def make_site(seed=0):
+    rng = random.Random(seed)
+    nav, sidebar, footer = (template_block(rng, "nav", 30), template_block(rng, "side", 15),
+                            template_block(rng, "footer", 20))
+    pages = []
+    for page_number in range(PAGES):
+        content = "".join(
+            f'<p>{" ".join(rng.choices(WORDS, k=15))} <a href="/page/{page_number}/{i}">'
+            f'{" ".join(rng.choices(WORDS, k=3))}</a> {" ".join(rng.choices(WORDS, k=10))}</p>'
+            for i in range(CONTENT_LINKS_PER_PAGE)
+        )
+        pages.append(f"<html><body>{nav}<main>{sidebar}{content}</main>{footer}</body></html>")
+    return pages
+
+
+def crawl_scores(page_contexts, model_type, score_cache=None):
+    stime = time.perf_counter()
+    scores = [score_link_contexts(contexts, model_type, score_cache=score_cache) for contexts in page_contexts]
+    return time.perf_counter() - stime, scores
+
+
+def max_difference(scores, reference):
+    return max(float(abs(a - b).max()) for a, b in zip(scores, reference))
+
+
+def run(model_type):
+    registry.preload(model_type)
+    page_contexts = [[extract_link_context(link) for link in parse_html(html).links()] for html in make_site()]
+    links = sum(len(contexts) for contexts in page_contexts)
+    print(f"=== Link score cache ({model_type}, {PAGES} pages, {links} links) ===")
+    print(f"{'run':>22} {'seconds':>8} {'hit rate':>9} {'max |diff|':>11}")
+
+    seconds, reference = crawl_scores(page_contexts, model_type)
+    print(f"{'no cache':>22} {seconds:>8.3f} {'-':>9} {0:>11.2e}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = Path(directory) / "site.sqlite"
+        for name in ("first crawl", "second crawl (disk)"):
+            score_cache = ScoreCache(path=cache_path)
+            seconds, scores = crawl_scores(page_contexts, model_type, score_cache)
+            score_cache.close()
+            print(f"{name:>22} {seconds:>8.3f} {100 * score_cache.hit_rate():>8.0f}% "
+                  f"{max_difference(scores, reference):>11.2e}")
+
+        score_cache = ScoreCache(path=cache_path)
+        retrained = score_cache.get_many((f"{model_type}/sklearn", "retrained"), [context_key(page_contexts[0][0])])
+        score_cache.close()
+        print(f"Lookup under a new model version: {'miss' if retrained[0] is None else 'HIT (stale!)'}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1].upper() if len(sys.argv) > 1 else "MNB")
@@ -0,0 +1,81 @@
+# Benchmark: densified (.toarray()) vs sparse-native TF-IDF features on dataset.csv
+#
+# Reports peak traced memory and wall time for scoring every dataset row with
+# each saved model, and for refitting a fresh model on the same features.
+#
+# Usage (from phase2/):
+#   python benchmarks/bench_sparse_inference.py [MNB SVM GNB DT]
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PHASE2_DIR = Path(__file__).resolve().parents[1]  # .../phase2/
+sys.path.append(str(PHASE2_DIR))
+
+import pandas as pd
+from sklearn.base import clone
+from model_registry import SUPPORTED_MODEL_TYPES, get_model
+from sparse_models import fit_sparse, predict_proba_sparse, predict_sparse
+
+
+def measure(fn):
+    """Return (result, seconds, peak MiB) for one call of fn."""
+    tracemalloc.start()
+    try:
+        stime = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - stime
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def dense_score(model, vectorizer, texts):
+    X = vectorizer.transform(texts).toarray()
+    if hasattr(model, "predict_proba"):
+        return model.predict_proba(X)[:, 1]
+    return model.predict(X)
+
+
+def sparse_score(model, vectorizer, texts):
+    X = vectorizer.transform(texts)
+    if hasattr(model, "predict_proba"):
+        return predict_proba_sparse(model, X)[:, 1]
+    return predict_sparse(model, X)
+
+
+def run(model_types):
+    df = pd.read_csv(PHASE2_DIR / "dataset.csv", header=None, names=["content", "label"])
+    texts = df["content"].fillna("").astype(str).str.lower().tolist()
+    labels = df["label"].astype(str)
+
+    print(f"=== Dense vs sparse TF-IDF on dataset.csv ({len(texts)} rows) ===")
+    print(f"{'model':>6} {'stage':>6} {'dense s':>9} {'dense MiB':>10} {'sparse s':>9} {'sparse MiB':>11}")
+
+    for model_type in model_types:
+        try:
+            time_model(model_type, texts, labels)
+        except Exception as e:  # e.g. a pickle from another scikit-learn version
+            print(f"{model_type:>6} skipped: {type(e).__name__}: {e}")
+
+
+def time_model(model_type, texts, labels):
+    model, vectorizer = get_model(model_type)
+
+    _, dense_time, dense_peak = measure(lambda: dense_score(model, vectorizer, texts))
+    _, sparse_time, sparse_peak = measure(lambda: sparse_score(model, vectorizer, texts))
+    print(f"{model_type:>6} {'score':>6} {dense_time:>9.3f} {dense_peak:>10.1f} "
+          f"{sparse_time:>9.3f} {sparse_peak:>11.1f}")
+
+    X = vectorizer.transform(texts)
+    _, dense_time, dense_peak = measure(lambda: clone(model).fit(X.toarray(), labels))
+    _, sparse_time, sparse_peak = measure(lambda: fit_sparse(clone(model), X, labels))
+    print(f"{model_type:>6} {'fit':>6} {dense_time:>9.3f} {dense_peak:>10.1f} "
+          f"{sparse_time:>9.3f} {sparse_peak:>11.1f}")
+
+
+if __name__ == "__main__":
+    run([arg.upper() for arg in sys.argv[1:]] or SUPPORTED_MODEL_TYPES)
@@ -1,45 +1,37 @@
-from bs4 import BeautifulSoup
 import requests 
 
+import sys
 import time
 import http.client
 import csv
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from pathlib import Path
 
-# Create a session with retry logic
-def create_session(
+sys.path.append(str(Path(__file__).resolve().parents[2]))  # repo root, for common/
+from common.html_parser import parse_html
+from common.http_client import HttpClient
+from common.response_cache import default_cache
+
+# Create a pooled HTTP client with retry logic
+def create_client(
     total_retries=5,
     backoff_factor=1,
     status_forcelist=(500, 502, 503, 504),
 ):
-    session = requests.Session()
-
-    retry = Retry(
-        total=total_retries,
-        read=total_retries,
-        connect=total_retries,
+    return HttpClient(
+        total_retries=total_retries,
         backoff_factor=backoff_factor,  # 1 -> 1s, 2s, 4s, 8s...
         status_forcelist=status_forcelist,
         allowed_methods=frozenset(["HEAD", "GET", "OPTIONS", "POST"]),
-        raise_on_status=False,
+        headers={
+            "User-Agent": "Mozilla/5.0 (compatible; SafeCrawler/1.0)",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        },
+        cache=default_cache(),
     )
 
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-
-    # Optional: set a default header
-    session.headers.update({
-        "User-Agent": "Mozilla/5.0 (compatible; SafeCrawler/1.0)",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    })
-
-    return session
-
 
-session = create_session()
+client = create_client()
 
 
 def safe_request(
@@ -49,20 +41,22 @@ def safe_request(
     timeout: float = 10,
     max_manual_retries: int = 3,
     sleep_between_retries: float = 1,
+    min_delay: float = 0.0,
     **kwargs,
 ):
     """
     Make a 'safe' HTTP request:
       - timeout
-      - automatic retries (via session)
+      - automatic retries and keep-alive connections (via the shared client)
       - manual retries on RemoteDisconnected / ConnectionError
+      - per-host politeness (robots.txt Crawl-delay, Retry-After, 429/503 backoff)
     """
     last_exc = None
 
     for attempt in range(1, max_manual_retries + 1):
         try:
-            # Example: session.request("GET", url, timeout=10, params=..., headers=...)
-            resp = session.request(method, url, timeout=timeout, **kwargs)
+            # Example: client.request("GET", url, timeout=10, params=..., headers=...)
+            resp = client.request(method, url, timeout=timeout, min_delay=min_delay, **kwargs)
             resp.raise_for_status()  # raise HTTPError for 4xx/5xx
             return resp
 
@@ -119,9 +113,9 @@ if __name__ == "__main__":
                     print(f"Skipping {link} due to unexpected error: {e}")
                     continue
 
-                html = resp.content
-                soup = BeautifulSoup(html,'html.parser')
-                content = soup.get_text(separator=' ', strip=True)
+                html = resp.text  # charset sniffed once by the client
+                page = parse_html(html)
+                content = page.get_text(separator=' ', strip=True)
 
                 if i == 0: # ai related webpages
                 # step 3 : write the content and label it as 1 to the dataset csv file
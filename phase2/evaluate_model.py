@@ -1,13 +1,18 @@
+import sys
 import time
 import requests
+from pathlib import Path
 from ds.auto_create_dataset import safe_request
-import bs4
+from model_registry import get_model
+from sparse_models import predict_sparse
 import pandas as pd
 import string
 import nltk
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
-import joblib
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root, for common/
+from common.html_parser import parse_html
 
 # Ensure required NLTK resources are available (handles first run setups)
 def ensure_nltk_resource(resource_name, resource_path):
@@ -53,6 +58,8 @@ def clean_text(text):
 
 
 if __name__ == "__main__":
+    # Model type can be passed on the command line (defaults to SVM)
+    model_type = sys.argv[1].upper() if len(sys.argv) > 1 else 'SVM'
     # step 1 : get URL from user input
     url = input("Enter the URL to fetch: ")
     try:
@@ -61,41 +68,35 @@ if __name__ == "__main__":
         print("Response content:")
         # print(response.text)
         # step 2 : extract the content of the html page
-        soup = bs4.BeautifulSoup(response.content, 'html.parser')
-        title = soup.title.string if soup.title else 'No title found'
+        page = parse_html(response.text)
+        title = page.first_text('title') or 'No title found'
         # print(f"Page Title: {title}")
-        heading = soup.find('h1')
-        if heading:
-            print(f"Main h1 Heading: {heading.get_text()}")
-        elif soup.find('h2'):
-            heading = soup.find('h2')
-            # print(f"Main h2 Heading: {heading.get_text()}")
-        elif soup.find('h3'):
-            heading = soup.find('h3')
-            # print(f"Main h3 Heading: {heading.get_text()}")
+        heading = page.first_text('h1')
+        if heading is not None:
+            print(f"Main h1 Heading: {heading}")
         else:
-            print("No main heading found.")
-        body_text = soup.get_text(separator=' ', strip=True)
+            heading = page.first_text('h2', 'h3')
+            # print(f"Main h2/h3 Heading: {heading}")
+            if heading is None:
+                print("No main heading found.")
+        body_text = page.get_text(separator=' ', strip=True)
         # print(f"Body Text: {body_text[:500]}...")  # Print first
     except Exception as e:
         print(f"Request failed: {e}")
 
     # concat the title, heading, and body text
-    full_content = f"{title} {heading.get_text() if heading else ''} {body_text}"
+    full_content = f"{title} {heading or ''} {body_text}"
     print(f"Full Content: {full_content[:500]}...")  # Print first 500 characters
 
     # step 3 : Classify the content using the trained model
-    # Load the model and vectorizer
-    with open('svc_model.pkl', 'rb') as file_model:
-        model = joblib.load(file_model)
-    with open('tfidf_vectorizer.pkl', 'rb') as file_vectorizer:
-        vectorizer = joblib.load(file_vectorizer)
+    # Load the model and vectorizer from the shared model registry
+    model, vectorizer = get_model(model_type)
     # Preprocess the content
     cleaned_content = clean_text(full_content)
     # Vectorize the content
     vectorized_content = vectorizer.transform([cleaned_content])
-    # Make prediction
-    prediction = model.predict(vectorized_content)
+    # Make prediction (sparse input; GaussianNB gets a dense row chunk)
+    prediction = predict_sparse(model, vectorized_content)
 
     if prediction[0] == '1':
         print(f"\nPrediction: {prediction[0]}\n Meaning the content of the web page {url} is related to AI")  # Assuming binary classification: 0 or 1
@@ -0,0 +1,166 @@
+import re
+from collections import Counter
+
+import numpy as np
+
+# -------------------------
+# Compiled linear scorer
+# -------------------------
+# For MultinomialNB and linear models a link score is a dot product between
+# the TF-IDF vector of the link context and per-class weights. The export
+# step flattens a trained (model, vectorizer) pair into one small .npz file:
+#
+#   vocabulary   uint8   sorted terms, UTF-8, joined with "\n"
+#   idf          float32 idf weight per term (sorted-vocabulary order)
+#   weights      float32 (n_terms, n_classes) per-class weight per term
+#   bias         float32 (n_classes,)
+#   output       "softmax" -> score = P(class 1) | "argmax" -> score = label of argmax class
+#   classes      class labels, as strings
+#
+# The scorer tokenizes with the vectorizer's own token pattern and sums the
+# weights of the tokens it finds, without sklearn's transform/predict overhead.
+
+LINEAR_SCORER_VERSION = 1
+
+# Column of predict_proba the crawler treats as "relevant" (see AStarCrawler)
+POSITIVE_CLASS_INDEX = 1
+
+
+def _linear_parameters(model):
+    """Return (weights (n_features, n_classes), bias, output) for a supported model."""
+    if hasattr(model, "feature_log_prob_"):
+        # MultinomialNB: joint log-likelihood = X @ feature_log_prob_.T + class_log_prior_
+        return model.feature_log_prob_.T, model.class_log_prior_, "softmax"
+
+    if getattr(model, "kernel", "linear") != "linear" or not hasattr(model, "coef_"):
+        raise ValueError(
+            f"{type(model).__name__} is not a linear model; only MultinomialNB and "
+            "linear models (coef_/intercept_) can be exported."
+        )
+
+    if hasattr(model, "kernel") and (hasattr(model, "predict_proba") or len(model.classes_) > 2):
+        # SVC probabilities are Platt-scaled and its multi-class coef_ is one-vs-one
+        raise ValueError("Only binary linear SVC models without probability=True can be exported.")
+
+    coef = np.asarray(model.coef_.toarray() if hasattr(model.coef_, "toarray") else model.coef_)
+    intercept = np.asarray(model.intercept_)
+    if coef.shape[0] == 1:
+        # Binary decision function d: classes_[1] wins when d > 0, P(class 1) = sigmoid(d)
+        coef = np.vstack([np.zeros_like(coef), coef])
+        intercept = np.concatenate([[0.0], intercept])
+    output = "softmax" if hasattr(model, "predict_proba") else "argmax"
+    return coef.T, intercept, output
+
+
+def export_linear_scorer(model, vectorizer, path):
+    """Write `model` + `vectorizer` as a compact .npz weight table at `path`."""
+    weights, bias, output = _linear_parameters(model)
+
+    vocabulary = vectorizer.vocabulary_
+    terms = sorted(vocabulary)
+    order = np.array([vocabulary[term] for term in terms], dtype=np.int64)
+
+    if vectorizer.use_idf:
+        idf = np.asarray(vectorizer.idf_, dtype=np.float32)[order]
+    else:
+        idf = np.ones(len(terms), dtype=np.float32)
+
+    np.savez(
+        path,
+        version=np.array(LINEAR_SCORER_VERSION),
+        vocabulary=np.frombuffer("\n".join(terms).encode("utf-8"), dtype=np.uint8),
+        idf=idf,
+        weights=np.ascontiguousarray(np.asarray(weights, dtype=np.float32)[order]),
+        bias=np.asarray(bias, dtype=np.float32),
+        output=np.array(output),
+        classes=np.array([str(label) for label in model.classes_]),
+        token_pattern=np.array(vectorizer.token_pattern),
+        lowercase=np.array(bool(vectorizer.lowercase)),
+        sublinear_tf=np.array(bool(vectorizer.sublinear_tf)),
+        norm=np.array(vectorizer.norm or ""),
+    )
+
+
+class LinearScorer:
+    """Scores link contexts from an exported .npz weight table."""
+
+    def __init__(self, terms, idf, weights, bias, output, classes,
+                 token_pattern, lowercase=True, sublinear_tf=False, norm="l2"):
+        self.term_index = {term: i for i, term in enumerate(terms)}
+        self.idf = idf
+        self.weights = weights
+        self.bias = bias
+        self.output = output
+        self.classes = classes
+        self.token_regex = re.compile(token_pattern)
+        self.lowercase = lowercase
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["version"])
+            if version != LINEAR_SCORER_VERSION:
+                raise ValueError(f"Unsupported linear scorer version {version} in {path}")
+            vocabulary = data["vocabulary"].tobytes().decode("utf-8")
+            return cls(
+                terms=vocabulary.split("\n") if vocabulary else [],
+                idf=data["idf"],
+                weights=data["weights"],
+                bias=data["bias"],
+                output=str(data["output"]),
+                classes=[str(label) for label in data["classes"]],
+                token_pattern=str(data["token_pattern"]),
+                lowercase=bool(data["lowercase"]),
+                sublinear_tf=bool(data["sublinear_tf"]),
+                norm=str(data["norm"]),
+            )
+
+    def score_text(self, text):
+        """Relevance score in [0, 1] for one text (P(class 1), or the predicted label)."""
+        return float(self.score_texts([text])[0])
+
+    def score_texts(self, texts):
+        """
+        Relevance scores for a batch of texts.
+
+        Python work per text is one regex findall and one Counter; the
+        TF-IDF weighting, normalization and weight sums run as a handful of
+        NumPy calls over all (text, term) pairs of the batch.
+        """
+        term_index = self.term_index
+        token_regex = self.token_regex
+        indices = []
+        counts = []
+        lengths = np.zeros(len(texts), dtype=np.int64)
+
+        for row, text in enumerate(texts):
+            if self.lowercase:
+                text = text.lower()
+            term_counts = Counter(token for token in token_regex.findall(text) if token in term_index)
+            indices.extend(term_index[token] for token in term_counts)
+            counts.extend(term_counts.values())
+            lengths[row] = len(term_counts)
+
+        scores = np.tile(self.bias.astype(np.float64), (len(texts), 1))
+        rows = np.flatnonzero(lengths)
+        if len(rows):
+            indices = np.asarray(indices, dtype=np.int64)
+            values = np.asarray(counts, dtype=np.float64)
+            if self.sublinear_tf:
+                values = 1.0 + np.log(values)
+            values *= self.idf[indices]
+
+            starts = np.concatenate([[0], np.cumsum(lengths[rows])[:-1]])
+            if self.norm == "l2":
+                values /= np.repeat(np.sqrt(np.add.reduceat(values * values, starts)), lengths[rows])
+            elif self.norm == "l1":
+                values /= np.repeat(np.add.reduceat(np.abs(values), starts), lengths[rows])
+
+            scores[rows] += np.add.reduceat(values[:, None] * self.weights[indices], starts, axis=0)
+
+        if self.output == "softmax":
+            scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+            return scores[:, POSITIVE_CLASS_INDEX] / scores.sum(axis=1)
+        return np.array([float(self.classes[i]) for i in scores.argmax(axis=1)], dtype=float)
@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import GaussianNB, MultinomialNB
+
+# -------------------------
+# Versioned model bundle
+# -------------------------
+# One directory holds every trained model plus the vectorizer they share:
+#
+#   model_bundle/
+#     manifest.json                    format version, dataset hash, per-model metadata
+#     vectorizer/terms.npy             uint8  sorted vocabulary, UTF-8, "\n"-joined
+#     vectorizer/idf.npy               float64 idf per column
+#     MNB/feature_log_prob.npy ...     weight arrays (MultinomialNB / GaussianNB)
+#     SVM/model.joblib, DT/model.joblib  joblib pickles for models without a flat weight layout
+#
+# Every array is loaded with mmap_mode="r", so crawler processes on the same
+# machine share the same page-cache pages instead of each holding a copy.
+
+PHASE2_DIR = Path(__file__).resolve().parent  # .../phase2/
+DEFAULT_BUNDLE_DIR = PHASE2_DIR / "model_bundle"
+
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+# Vectorizer parameters that change how text is turned into features
+VECTORIZER_PARAMS = (
+    "lowercase", "token_pattern", "ngram_range", "analyzer", "binary",
+    "norm", "use_idf", "smooth_idf", "sublinear_tf",
+)
+
+# Model type -> (estimator class, fitted attribute -> file name) for array-stored models
+ARRAY_MODELS = {
+    "MNB": (MultinomialNB, {
+        "feature_log_prob_": "feature_log_prob.npy",
+        "class_log_prior_": "class_log_prior.npy",
+        "class_count_": "class_count.npy",
+    }),
+    "GNB": (GaussianNB, {
+        "theta_": "theta.npy",
+        "var_": "var.npy",
+        "class_prior_": "class_prior.npy",
+        "class_count_": "class_count.npy",
+    }),
+}
+
+
+def dataset_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_path(bundle_dir=DEFAULT_BUNDLE_DIR):
+    return Path(bundle_dir) / MANIFEST_NAME
+
+
+def read_manifest(bundle_dir=DEFAULT_BUNDLE_DIR):
+    """Return the bundle manifest, or None if there is no bundle."""
+    path = manifest_path(bundle_dir)
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported model bundle format {manifest.get('format_version')!r} in {path}")
+    return manifest
+
+
+def _write_manifest(bundle_dir, manifest):
+    # Write-then-rename so readers never see a half-written manifest
+    path = manifest_path(bundle_dir)
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _json_params(estimator, names=None):
+    params = estimator.get_params()
+    if names is not None:
+        params = {name: params[name] for name in names}
+    return {name: list(value) if isinstance(value, tuple) else value for name, value in params.items()}
+
+
+def _save_vectorizer(bundle_dir, vectorizer):
+    vectorizer_dir = Path(bundle_dir) / "vectorizer"
+    vectorizer_dir.mkdir(parents=True, exist_ok=True)
+
+    vocabulary = vectorizer.vocabulary_
+    terms = sorted(vocabulary, key=vocabulary.get)  # column order
+    np.save(vectorizer_dir / "terms.npy", np.frombuffer("\n".join(terms).encode("utf-8"), dtype=np.uint8))
+    np.save(vectorizer_dir / "idf.npy", np.asarray(vectorizer.idf_, dtype=np.float64))
+    return {
+        "params": _json_params(vectorizer, VECTORIZER_PARAMS),
+        "n_terms": len(terms),
+        "files": {"terms": "vectorizer/terms.npy", "idf": "vectorizer/idf.npy"},
+    }
+
+
+def load_vectorizer(bundle_dir=DEFAULT_BUNDLE_DIR, manifest=None):
+    """Rebuild the shared TfidfVectorizer; its idf array stays memory-mapped."""
+    bundle_dir = Path(bundle_dir)
+    manifest = manifest or read_manifest(bundle_dir)
+    info = manifest["vectorizer"]
+
+    terms_blob = np.load(bundle_dir / info["files"]["terms"], mmap_mode="r")
+    terms = bytes(terms_blob).decode("utf-8").split("\n") if len(terms_blob) else []
+    params = dict(info["params"])
+    params["ngram_range"] = tuple(params["ngram_range"])
+
+    vectorizer = TfidfVectorizer(vocabulary={term: i for i, term in enumerate(terms)}, **params)
+    vectorizer.idf_ = np.load(bundle_dir / info["files"]["idf"], mmap_mode="r")
+    return vectorizer
+
+
+def save_model(model_type, model, vectorizer, dataset_hash, bundle_dir=DEFAULT_BUNDLE_DIR, trained_at=None):
+    """
+    Add (or replace) `model_type` in the bundle.
+
+    The vectorizer is stored once. If the dataset hash or vocabulary size differs
+    from the bundle's, the vectorizer is rewritten and the other models are dropped,
+    because their weights refer to the old vocabulary.
+    """
+    bundle_dir = Path(bundle_dir)
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(bundle_dir)
+
+    if (manifest is None or manifest["dataset_sha256"] != dataset_hash
+            or manifest["vectorizer"]["n_terms"] != len(vectorizer.vocabulary_)):
+        if manifest is not None:
+            for stale_type in manifest["models"]:
+                shutil.rmtree(bundle_dir / stale_type, ignore_errors=True)
+        manifest = {
+            "format_version": BUNDLE_FORMAT_VERSION,
+            "dataset_sha256": dataset_hash,
+            "vectorizer": _save_vectorizer(bundle_dir, vectorizer),
+            "models": {},
+        }
+
+    model_dir = bundle_dir / model_type
+    shutil.rmtree(model_dir, ignore_errors=True)
+    model_dir.mkdir()
+
+    entry = {
+        "estimator": type(model).__name__,
+        "trained_at": trained_at or time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "classes": [str(label) for label in model.classes_],
+    }
+    if model_type in ARRAY_MODELS:
+        _, attributes = ARRAY_MODELS[model_type]
+        entry["storage"] = "arrays"
+        entry["params"] = _json_params(model)
+        entry["files"] = {}
+        for attribute, file_name in attributes.items():
+            np.save(model_dir / file_name, np.asarray(getattr(model, attribute)))
+            entry["files"][attribute] = f"{model_type}/{file_name}"
+    else:
+        entry["storage"] = "joblib"
+        joblib.dump(model, model_dir / "model.joblib")
+        entry["files"] = {"model": f"{model_type}/model.joblib"}
+
+    manifest["models"][model_type] = entry
+    _write_manifest(bundle_dir, manifest)
+    return manifest
+
+
+def load_model(model_type, bundle_dir=DEFAULT_BUNDLE_DIR, manifest=None):
+    """Load one model from the bundle with its weight arrays memory-mapped."""
+    bundle_dir = Path(bundle_dir)
+    manifest = manifest or read_manifest(bundle_dir)
+    entry = manifest["models"].get(model_type) if manifest else None
+    if entry is None:
+        raise KeyError(f"Model {model_type!r} is not in the bundle at {bundle_dir}")
+
+    if entry["storage"] == "joblib":
+        return joblib.load(bundle_dir / entry["files"]["model"], mmap_mode="r")
+
+    estimator_class, _ = ARRAY_MODELS[model_type]
+    model = estimator_class(**entry["params"])
+    for attribute, file_name in entry["files"].items():
+        setattr(model, attribute, np.load(bundle_dir / file_name, mmap_mode="r"))
+    model.classes_ = np.array(entry["classes"])
+    model.n_features_in_ = manifest["vectorizer"]["n_terms"]
+    return model
+
+
+def migrate_pickles(bundle_dir=DEFAULT_BUNDLE_DIR, dataset_path=PHASE2_DIR / "dataset.csv"):
+    """
+    Build the bundle from the per-model pickles written by older versions of
+    train_model.py ({type}_model.pkl + tfidf_{type}_vectorizer.pkl).
+    SVM/DT pickles are copied byte for byte so they keep their scikit-learn version.
+    """
+    dataset_hash = dataset_sha256(dataset_path)
+    for model_type in ("MNB", "GNB", "SVM", "DT"):
+        model_file = PHASE2_DIR / f"{model_type}_model.pkl"
+        vectorizer_file = PHASE2_DIR / f"tfidf_{model_type}_vectorizer.pkl"
+        if not (model_file.exists() and vectorizer_file.exists()):
+            continue
+        model = joblib.load(model_file)
+        vectorizer = joblib.load(vectorizer_file)
+        save_model(model_type, model, vectorizer, dataset_hash, bundle_dir, trained_at="unknown (migrated)")
+        if model_type not in ARRAY_MODELS:
+            shutil.copyfile(model_file, Path(bundle_dir) / model_type / "model.joblib")
+        print(f"{model_file.name} + {vectorizer_file.name} -> {bundle_dir}/{model_type}")
+
+
+if __name__ == "__main__":
+    migrate_pickles()
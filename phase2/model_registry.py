@@ -0,0 +1,179 @@
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+import joblib
+
+from linear_scorer import LinearScorer
+from model_bundle import DEFAULT_BUNDLE_DIR, load_vectorizer, manifest_path, read_manifest
+from model_bundle import load_model as load_bundle_model
+
+# -------------------------
+# Process-wide model registry
+# -------------------------
+PHASE2_DIR = Path(__file__).resolve().parent  # .../phase2/
+
+SUPPORTED_MODEL_TYPES = ("MNB", "SVM", "GNB", "DT")
+
+
+def model_paths(model_type):
+    """
+    Return (model_path, vectorizer_path) of the legacy per-model pickles
+    written by older versions of train_model.py.
+    """
+    if model_type not in SUPPORTED_MODEL_TYPES:
+        raise ValueError(f"Unsupported model type: {model_type!r}")
+    return (
+        PHASE2_DIR / f"{model_type}_model.pkl",
+        PHASE2_DIR / f"tfidf_{model_type}_vectorizer.pkl",
+    )
+
+
+def linear_scorer_path(model_type):
+    """Path of the compiled .npz weight table exported by train_model.py."""
+    if model_type not in SUPPORTED_MODEL_TYPES:
+        raise ValueError(f"Unsupported model type: {model_type!r}")
+    return PHASE2_DIR / f"{model_type}_linear.npz"
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class LoadedModel:
+    def __init__(self, model_type, model, vectorizer, signature):
+        self.model_type = model_type
+        self.model = model
+        self.vectorizer = vectorizer
+        self.signature = signature  # source file signatures at load time
+
+
+class ModelRegistry:
+    """
+    Keeps one (model, vectorizer) pair per model type for the life of the process.
+
+    Models come from the model bundle (model_bundle.py) when it contains the
+    requested type, memory-mapped and sharing one vectorizer; otherwise from the
+    legacy per-model pickles. Models are loaded lazily on first use. On every
+    lookup the source files are stat()-ed and the entry is reloaded if they
+    changed on disk, so a retrained model is picked up without restarting the crawler.
+    """
+
+    def __init__(self, auto_reload=True, bundle_dir=DEFAULT_BUNDLE_DIR):
+        self.auto_reload = auto_reload
+        self.bundle_dir = Path(bundle_dir)
+        self._entries = {}
+        self._linear_entries = {}  # model_type -> (signature, LinearScorer)
+        self._bundle_vectorizer = None  # (manifest signature, vectorizer shared by all bundle models)
+        self._lock = threading.Lock()
+
+    def _signature(self, model_type):
+        """Signature of the files `model_type` would be loaded from right now."""
+        bundle_manifest = manifest_path(self.bundle_dir)
+        if bundle_manifest.exists():
+            manifest = read_manifest(self.bundle_dir)
+            if model_type in manifest["models"]:
+                return ("bundle", _file_signature(bundle_manifest))
+        model_path, vectorizer_path = model_paths(model_type)
+        return ("pickle", _file_signature(model_path), _file_signature(vectorizer_path))
+
+    def _load(self, model_type):
+        signature = self._signature(model_type)
+        if signature[0] == "bundle":
+            manifest = read_manifest(self.bundle_dir)
+            if self._bundle_vectorizer is None or self._bundle_vectorizer[0] != signature:
+                self._bundle_vectorizer = (signature, load_vectorizer(self.bundle_dir, manifest))
+            model = load_bundle_model(model_type, self.bundle_dir, manifest)
+            return LoadedModel(model_type, model, self._bundle_vectorizer[1], signature)
+
+        model_path, vectorizer_path = model_paths(model_type)
+        model = joblib.load(model_path)
+        vectorizer = joblib.load(vectorizer_path)
+        return LoadedModel(model_type, model, vectorizer, signature)
+
+    def _is_stale(self, entry):
+        try:
+            current = self._signature(entry.model_type)
+        except OSError:
+            # File is being replaced; keep serving the copy we already have
+            return False
+        return current != entry.signature
+
+    def get(self, model_type):
+        """Return the LoadedModel for `model_type`, loading or reloading it if needed."""
+        with self._lock:
+            entry = self._entries.get(model_type)
+            if entry is None or (self.auto_reload and self._is_stale(entry)):
+                entry = self._load(model_type)
+                self._entries[model_type] = entry
+            return entry
+
+    def get_linear_scorer(self, model_type):
+        """Return the compiled LinearScorer for `model_type`, reloading it if the .npz changed."""
+        path = linear_scorer_path(model_type)
+        with self._lock:
+            cached = self._linear_entries.get(model_type)
+            if cached is not None and not self.auto_reload:
+                return cached[1]
+            signature = _file_signature(path)
+            if cached is None or cached[0] != signature:
+                cached = (signature, LinearScorer.load(path))
+                self._linear_entries[model_type] = cached
+            return cached[1]
+
+    def preload(self, *model_types):
+        """Load the given model types now (all supported types if none are given)."""
+        for model_type in model_types or SUPPORTED_MODEL_TYPES:
+            self.get(model_type)
+
+    def reload(self, model_type):
+        """Force a reload from disk, regardless of file signatures."""
+        with self._lock:
+            entry = self._load(model_type)
+            self._entries[model_type] = entry
+            return entry
+
+    def unload(self, *model_types):
+        """Drop the given model types from memory (everything if none are given)."""
+        with self._lock:
+            if not model_types:
+                self._entries.clear()
+                self._linear_entries.clear()
+                self._bundle_vectorizer = None
+                return
+            for model_type in model_types:
+                self._entries.pop(model_type, None)
+                self._linear_entries.pop(model_type, None)
+
+    def loaded_types(self):
+        with self._lock:
+            return list(self._entries)
+
+
+registry = ModelRegistry()
+
+
+def get_model(model_type):
+    """Return (model, vectorizer) for `model_type` from the shared registry."""
+    entry = registry.get(model_type)
+    return entry.model, entry.vectorizer
+
+
+def get_linear_scorer(model_type):
+    """Return the compiled LinearScorer for `model_type` from the shared registry."""
+    return registry.get_linear_scorer(model_type)
+
+
+def model_version(model_type, compiled_scorer=False):
+    """
+    Short id of the model files `model_type` is scored from right now (the
+    bundle manifest / pickles, or the compiled .npz). It changes whenever the
+    registry would reload them, e.g. after retraining.
+    """
+    if compiled_scorer:
+        signature = ("compiled", _file_signature(linear_scorer_path(model_type)))
+    else:
+        signature = registry._signature(model_type)
+    return hashlib.sha1(repr(signature).encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,143 @@
+import hashlib
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import urlparse
+
+# -------------------------
+# Link-context score cache
+# -------------------------
+# Navigation bars, footers and sidebars repeat on every page of a site, so the
+# crawler keeps scoring the same link contexts. ScoreCache remembers the score
+# of each context per model, keyed by (model id, hash of the whitespace-
+# normalized context). The TF-IDF vectorizer tokenizes on words, so contexts
+# that differ only in whitespace score the same.
+#
+# The model id is (model type + scorer, model_version(...)): retraining or
+# re-exporting a model changes its version and old scores are never reused.
+# With a path (ScoreCache.for_site(url)) scores are kept in SQLite across
+# crawls of the same site; rows of an older version of a model are dropped
+# when that model is first used.
+
+PHASE2_DIR = Path(__file__).resolve().parent  # .../phase2/
+DEFAULT_SCORE_CACHE_DIR = PHASE2_DIR / ".score_cache"
+DEFAULT_MAX_ENTRIES = 100_000
+
+
+def context_key(text):
+    """Hash of a link context with whitespace runs collapsed."""
+    return hashlib.blake2b(" ".join(text.split()).encode("utf-8"), digest_size=16).digest()
+
+
+class ScoreCache:
+    """
+    LRU of link-context scores, `max_entries` in memory, optionally persisted
+    to a SQLite file. Safe to share between threads.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, path=None):
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "loaded": 0}
+
+        self._entries = OrderedDict()  # (model, version, key) -> score
+        self._unsaved = {}
+        self._opened_models = set()
+        self._lock = threading.Lock()
+        self._db = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                " model TEXT, version TEXT, key BLOB, score REAL, PRIMARY KEY (model, key))"
+            )
+            self._db.commit()
+
+    @classmethod
+    def for_site(cls, url, directory=DEFAULT_SCORE_CACHE_DIR, **kwargs):
+        """A persistent cache in `directory`, one file per host of `url`."""
+        host = urlparse(url).netloc or url
+        return cls(path=Path(directory) / f"{re.sub(r'[^A-Za-z0-9.-]', '_', host)}.sqlite", **kwargs)
+
+    def get_many(self, model_id, keys):
+        """Cached score for each key (None where missing); counts hits and misses."""
+        model, version = model_id
+        with self._lock:
+            self._open_model(model, version)
+            scores = []
+            for key in keys:
+                entry_key = (model, version, key)
+                score = self._entries.get(entry_key)
+                if score is None:
+                    self.stats["misses"] += 1
+                else:
+                    self._entries.move_to_end(entry_key)
+                    self.stats["hits"] += 1
+                scores.append(score)
+            return scores
+
+    def put_many(self, model_id, keys, scores):
+        model, version = model_id
+        with self._lock:
+            for key, score in zip(keys, scores):
+                entry_key = (model, version, key)
+                self._entries[entry_key] = float(score)
+                self._entries.move_to_end(entry_key)
+                if self._db is not None:
+                    self._unsaved[entry_key] = float(score)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def hit_rate(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def save(self):
+        """Write the scores added since the last save to disk (no-op without a path)."""
+        with self._lock:
+            if self._db is None or not self._unsaved:
+                return
+            self._db.executemany(
+                "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)",
+                [(model, version, key, score) for (model, version, key), score in self._unsaved.items()],
+            )
+            self._db.commit()
+            self._unsaved.clear()
+
+    def close(self):
+        self.save()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _open_model(self, model, version):
+        # First use of a model: drop its scores from other versions, load the rest
+        if self._db is None or (model, version) in self._opened_models:
+            return
+        self._opened_models.add((model, version))
+        self._db.execute("DELETE FROM scores WHERE model = ? AND version != ?", (model, version))
+        self._db.commit()
+        rows = self._db.execute(
+            "SELECT key, score FROM scores WHERE model = ? LIMIT ?", (model, self.max_entries)
+        ).fetchall()
+        for key, score in rows:
+            self._entries[(model, version, key)] = score
+        self.stats["loaded"] += len(rows)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def print_score_cache_stats(score_cache):
+    """One-line summary of a score cache for the end of a crawl."""
+    stats = score_cache.stats
+    print(f"Score cache            : {stats['hits']} hits, {stats['misses']} misses "
+          f"({100 * score_cache.hit_rate():.0f}% hit rate), {len(score_cache)} entries, "
+          f"{stats['loaded']} loaded from disk")
@@ -0,0 +1,86 @@
+import numpy as np
+import scipy.sparse as sp
+from sklearn.naive_bayes import GaussianNB
+
+# -------------------------
+# Sparse-native fit / predict helpers
+# -------------------------
+# TF-IDF output stays in CSR form end to end. MultinomialNB, SVC and
+# DecisionTreeClassifier all accept sparse input directly; GaussianNB is the
+# only model that needs dense rows, and it only ever gets them in small
+# row chunks so a batch never becomes a rows x full-vocabulary float64 block.
+
+DENSE_CHUNK_ROWS = 32
+
+
+def needs_dense(model):
+    return isinstance(model, GaussianNB)
+
+
+def iter_dense_chunks(X, chunk_rows=DENSE_CHUNK_ROWS):
+    """Yield dense row blocks of X, at most `chunk_rows` rows at a time."""
+    for start in range(0, X.shape[0], chunk_rows):
+        block = X[start:start + chunk_rows]
+        yield block.toarray() if sp.issparse(block) else np.asarray(block)
+
+
+def _fit_gaussian_nb_sparse(model, X, y):
+    """
+    Fit GaussianNB from per-class sparse column statistics.
+
+    Gives the same parameters as GaussianNB.fit on the dense matrix (mean and
+    variance per class, var_smoothing epsilon from the overall per-feature
+    variance) without ever densifying X.
+    """
+    X = sp.csr_matrix(X, dtype=np.float64)
+    y = np.asarray(y)
+
+    def column_mean_and_variance(block):
+        mean = np.asarray(block.mean(axis=0)).ravel()
+        mean_of_squares = np.asarray(block.multiply(block).mean(axis=0)).ravel()
+        return mean, np.maximum(mean_of_squares - mean ** 2, 0.0)
+
+    classes = np.unique(y)
+    n_features = X.shape[1]
+    theta = np.zeros((len(classes), n_features))
+    var = np.zeros((len(classes), n_features))
+    class_count = np.zeros(len(classes))
+
+    for i, label in enumerate(classes):
+        X_i = X[np.flatnonzero(y == label)]
+        theta[i], var[i] = column_mean_and_variance(X_i)
+        class_count[i] = X_i.shape[0]
+
+    _, overall_var = column_mean_and_variance(X)
+    epsilon = model.var_smoothing * overall_var.max()
+
+    model.classes_ = classes
+    model.theta_ = theta
+    model.var_ = var + epsilon
+    model.epsilon_ = epsilon
+    model.class_count_ = class_count
+    model.class_prior_ = (
+        np.asarray(model.priors, dtype=float) if model.priors is not None
+        else class_count / class_count.sum()
+    )
+    model.n_features_in_ = n_features
+    return model
+
+
+def fit_sparse(model, X, y):
+    """Fit `model` on CSR features without densifying them."""
+    if needs_dense(model):
+        return _fit_gaussian_nb_sparse(model, X, y)
+    return model.fit(X, y)
+
+
+def predict_sparse(model, X, chunk_rows=DENSE_CHUNK_ROWS):
+    if not needs_dense(model):
+        return model.predict(X)
+    return np.concatenate([model.predict(block) for block in iter_dense_chunks(X, chunk_rows)])
+
+
+def predict_proba_sparse(model, X, chunk_rows=DENSE_CHUNK_ROWS):
+    if not needs_dense(model):
+        return model.predict_proba(X)
+    return np.vstack([model.predict_proba(block) for block in iter_dense_chunks(X, chunk_rows)])
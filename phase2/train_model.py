@@ -12,8 +12,10 @@ from sklearn.svm import SVC
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, confusion_matrix,classification_report,ConfusionMatrixDisplay
-import joblib
+from model_bundle import DEFAULT_BUNDLE_DIR, dataset_sha256, save_model
 import time
+from sparse_models import fit_sparse, predict_sparse
+from linear_scorer import export_linear_scorer
 import matplotlib.pyplot as plt
 
 # Ensure required NLTK resources are available (handles first run setups)
@@ -31,15 +33,16 @@ ensure_nltk_resource('punkt_tab', 'tokenizers/punkt_tab')
 # Initialize stopwords set
 stop_words = set(stopwords.words('english'))
 
-def plot_cm(classifier, X_test, y_test, class_names,model_type):
+def plot_cm(y_pred, y_test, class_names,model_type):
     titles_options = [
     (f"Confusion matrix for {model_type}", None),]
 
     for title, normalize in titles_options:
-        disp = ConfusionMatrixDisplay.from_estimator(
-            classifier,
-            X_test,
+        # from_predictions reuses the predictions we already have instead of
+        # running the classifier again on (densified) test features
+        disp = ConfusionMatrixDisplay.from_predictions(
             y_test,
+            y_pred,
             display_labels=class_names,
             cmap=plt.cm.Blues,
             normalize=normalize,
@@ -83,16 +86,12 @@ if __name__ == "__main__":
     match model_type:
         case 'GNB':
             model = GaussianNB()
-            filename_vectorizer = f'tfidf_{model_type}_vectorizer.pkl'
         case 'MNB':
             model = MultinomialNB()
-            filename_vectorizer = f'tfidf_{model_type}_vectorizer.pkl' 
         case 'SVM':
             model = SVC()
-            filename_vectorizer = f'tfidf_{model_type}_vectorizer.pkl' 
         case 'DT':
             model = DecisionTreeClassifier()
-            filename_vectorizer = f'tfidf_{model_type}_vectorizer.pkl' 
         case _:
             print("Unsupported model type.")
             exit(1)
@@ -105,27 +104,18 @@ if __name__ == "__main__":
     # vectorize the words using TF-IDF
     vectorizer = TfidfVectorizer()
     X = vectorizer.fit_transform(df['cleaned_content']) # Apply to the cleaned content column
-    joblib.dump(vectorizer, filename_vectorizer)
-    # print(f"Vectorizer saved as {filename_vectorizer}")
     # Define target variable
     y = df['label']
 
     # Split data into training and testing sets
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-    # Train a Gaussian Naive Bayes classifier (works with TF-IDF features)
-    if model_type in ['GNB', 'MNB']:
-        model.fit(X_train.toarray(), y_train)
-        y_pred = model.predict(X_test.toarray())
-        # Make predictions with the loaded model (requires dense arrays)
-        model_predictions = model.predict(X_test.toarray())
-        X_test = X_test.toarray()
-
-   
-    else:
-        model.fit(X_train, y_train)
-        y_pred = model.predict(X_test)
-        model_predictions = model.predict(X_test)
+    # Train on the CSR TF-IDF features directly. MNB/SVM/DT take sparse input;
+    # GaussianNB is fitted from sparse per-class statistics and predicts on
+    # small dense row chunks (see sparse_models.py)
+    fit_sparse(model, X_train, y_train)
+    y_pred = predict_sparse(model, X_test)
+    model_predictions = y_pred
 
     etime = time.time()
     print(f"Training time for {model_type}: {etime - stime} seconds")
@@ -136,9 +126,15 @@ if __name__ == "__main__":
     print(classification_report(y_test, model_predictions))
     print(confusion_matrix(y_test, model_predictions))
 
-    # Save the trained model
-    filename = f'{model_type}_model.pkl'
-    joblib.dump(model, filename)
-    print(f"Model saved as {filename}")
-    plot_cm(model, X_test, y_test, class_names=['Not AI', 'AI'],model_type=model_type)
+    # Save the trained model into the shared bundle (the vectorizer is stored once for all models)
+    save_model(model_type, model, vectorizer, dataset_sha256('dataset.csv'))
+    print(f"Model saved in {DEFAULT_BUNDLE_DIR.name}/{model_type}")
+
+    # Export MNB / linear models as a compact weight table for the crawler's compiled scorer
+    try:
+        export_linear_scorer(model, vectorizer, f'{model_type}_linear.npz')
+        print(f"Linear scorer exported as {model_type}_linear.npz")
+    except ValueError as e:
+        print(f"Skipping linear scorer export: {e}")
+    plot_cm(y_pred, y_test, class_names=['Not AI', 'AI'],model_type=model_type)
 